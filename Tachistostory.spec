@@ -4,6 +4,7 @@ Tachistostory - PyInstaller Spec File
 Optimized configuration for macOS and Windows builds
 """
 
+import subprocess
 import sys
 from pathlib import Path
 
@@ -28,6 +29,13 @@ elif sys.platform == 'win32':
 else:
     ICON = None
 
+# Pre-decoded asset pack (assets/tachistostory.pack, shipped with assets/)
+if subprocess.run(
+    [sys.executable, '-m', 'src.utils.asset_pack', '--root', str(ROOT_DIR)],
+    cwd=str(ROOT_DIR),
+).returncode != 0:
+    print('Asset pack not built - the app will decode loose PNGs.')
+
 # Hidden imports (modules not detected automatically)
 hiddenimports = [
     'pygame',
@@ -50,7 +58,6 @@ hiddenimports = [
     'pygame.sprite',
     'pygame.cursors',
     'pygame.mixer_music',
-    'docx2txt',
     'src',
     'src.core',
     'src.core.config',
@@ -68,6 +75,7 @@ hiddenimports = [
     'src.states.menu_start_state',
     'src.states.presentation_state',
     'src.utils',
+    'src.utils.asset_pack',
     'src.utils.images',
     'src.utils.paths',
     'src.utils.text',
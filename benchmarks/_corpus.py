@@ -0,0 +1,68 @@
+"""
+Synthetic Italian corpora for benchmarks.
+
+The text mimics the shape of graded readers and novels: paragraphs of
+sentences with elisions, accents, «dialogue», numbers and mixed punctuation.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+WORDS = (
+    "il la lo i gli le un una di a da in con su per tra fra e ma però perché "
+    "quando mentre dopo prima già ancora sempre mai più molto poco tutto "
+    "casa città bosco mare montagna strada finestra porta libro scuola maestra "
+    "bambino bambina ragazzo ragazza nonno nonna padre madre fratello sorella "
+    "gatto cane cavallo uccello albero fiore pane acqua fuoco vento pioggia "
+    "camminava guardava diceva rispose pensò corse tornò aprì chiuse trovò "
+    "bello brutto grande piccolo vecchio giovane felice triste stanco veloce "
+    "così là qui là giù su perciò infine improvvisamente lentamente "
+    "città virtù perché né più può già però lunedì caffè"
+).split()
+ELISIONS = ("l'", "dell'", "un'", "all'", "nell'", "c'", "d'", "sull'")
+OPENINGS = ("", "", "", "«", '"')
+ENDINGS = (".", ".", ".", "!", "?", "...", "?!")
+
+
+def make_sentence(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(4, 18))]
+    if rng.random() < 0.4:
+        i = rng.randrange(len(words))
+        words[i] = rng.choice(ELISIONS) + words[i]
+    if rng.random() < 0.1:
+        words.insert(rng.randrange(len(words)), str(rng.randint(1, 1900)))
+    for i in range(1, len(words) - 1):
+        if rng.random() < 0.08:
+            words[i] += rng.choice((",", ",", ";", ":"))
+    words[0] = words[0].capitalize()
+    opening = rng.choice(OPENINGS)
+    closing = {"«": "»", '"': '"'}.get(opening, "")
+    return opening + " ".join(words) + rng.choice(ENDINGS) + closing
+
+
+def make_corpus(size_bytes: int, seed: int = 0) -> str:
+    """Return Italian-like text of roughly `size_bytes` UTF-8 bytes."""
+    rng = random.Random(seed)
+    paragraphs: list[str] = []
+    total = 0
+    while total < size_bytes:
+        paragraph = " ".join(make_sentence(rng) for _ in range(rng.randint(1, 8)))
+        if rng.random() < 0.05:
+            paragraph = f"Capitolo {len(paragraphs) + 1}\n\n" + paragraph
+        paragraphs.append(paragraph)
+        total += len(paragraph.encode("utf-8")) + 2
+    return "\n\n".join(paragraphs) + "\n"
+
+
+def load_or_make_corpus(path: str | None, size_mb: float, seed: int = 0) -> str:
+    """Read a real corpus from `path`, or build a synthetic one."""
+    if path:
+        return Path(path).read_text(encoding="utf-8")
+    return make_corpus(int(size_mb * 1024 * 1024), seed=seed)
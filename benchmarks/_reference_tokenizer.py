@@ -0,0 +1,52 @@
+"""
+Multi-pass tokenizer kept as the reference for the single-pass one in
+src.utils.text: the tests check both give the same result and
+bench_tokenizer.py times them against each other.
+"""
+
+from __future__ import annotations
+
+import re
+
+from src.utils.text import PUNCTUATION_CHARS, TextParseResult, split_sentences
+
+
+def reference_build_words_and_phrase_map(full_text: str) -> TextParseResult:
+    """Multi-pass implementation the single-pass tokenizer must match."""
+    words: list[str] = []
+    mapping: list[int] = []
+    phrase_idx = 0
+    had_word_in_phrase = False
+    trailing_wrappers = '"\'”’)]}»'
+
+    for raw_line in full_text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        for raw_token in line.split():
+            cleaned = raw_token.strip(PUNCTUATION_CHARS + '1234567890')
+            if cleaned:
+                words.append(cleaned)
+                mapping.append(phrase_idx)
+                had_word_in_phrase = True
+
+            token_tail = raw_token.rstrip(trailing_wrappers)
+            if re.search(r"[.!?]+$", token_tail) and had_word_in_phrase:
+                phrase_idx += 1
+                had_word_in_phrase = False
+
+    computed_total = phrase_idx + (1 if had_word_in_phrase else 0)
+
+    phrases_list = split_sentences(full_text)
+    phrases_total = len(phrases_list) if phrases_list else computed_total
+
+    if phrases_total > 0:
+        mapping = [min(idx, phrases_total - 1) for idx in mapping]
+
+    return TextParseResult(
+        words=words,
+        phrases_list=phrases_list,
+        phrases_total=phrases_total,
+        word_to_phrase_map=mapping,
+    )
@@ -0,0 +1,73 @@
+"""
+Benchmark: memory held by a loaded text, list-based vs the compact Corpus.
+
+    python benchmarks/bench_corpus_memory.py              # 4 MB synthetic corpus
+    python benchmarks/bench_corpus_memory.py --mb 16
+    python benchmarks/bench_corpus_memory.py --file libro.txt
+
+Reports the memory retained after parsing (measured with tracemalloc, the
+source text excluded) and the cost of walking every word.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from _corpus import load_or_make_corpus
+
+from src.utils.corpus import Corpus
+from src.utils.text import build_words_and_phrase_map
+
+
+def _retained(build, text: str):
+    """Return (object, bytes retained by it, peak bytes while building)."""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = build(text)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current - baseline, peak - baseline
+
+
+def _walk(words) -> float:
+    start = time.perf_counter()
+    for index in range(len(words)):
+        words[index]
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=4.0, help="Synthetic corpus size in MB.")
+    parser.add_argument("--file", help="Use a real UTF-8 corpus instead.")
+    args = parser.parse_args()
+
+    text = load_or_make_corpus(args.file, args.mb)
+    size_mb = len(text.encode("utf-8")) / (1024 * 1024)
+
+    lists, lists_bytes, lists_peak = _retained(build_words_and_phrase_map, text)
+    # The corpus keeps the source text as its buffer: count it as well
+    corpus, corpus_bytes, corpus_peak = _retained(Corpus.from_text, text)
+    corpus_bytes += text.__sizeof__()
+    corpus_peak += text.__sizeof__()
+
+    if list(corpus.words) != lists.words or list(corpus.phrases) != lists.phrases_list:
+        print("✗ Corpus differs from build_words_and_phrase_map")
+        return 1
+
+    mb = 1024 * 1024
+    print(f"Corpus: {size_mb:.1f} MB, {corpus.word_count} words, {corpus.phrases_total} phrases")
+    print(f"  lists:   retained {lists_bytes / mb:7.1f} MB   peak {lists_peak / mb:7.1f} MB")
+    print(f"  Corpus:  retained {corpus_bytes / mb:7.1f} MB   peak {corpus_peak / mb:7.1f} MB"
+          f"  ({lists_bytes / corpus_bytes:.1f}x smaller)")
+    print(f"  walk all words: lists {_walk(lists.words) * 1000:.1f} ms, Corpus {_walk(corpus.words) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
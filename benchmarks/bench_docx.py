@@ -0,0 +1,121 @@
+"""
+Benchmark: text extraction from image-heavy Word documents.
+
+    python benchmarks/bench_docx.py                       # 4 MB text, 40 x 1 MB images
+    python benchmarks/bench_docx.py --mb 16 --images 100
+    python benchmarks/bench_docx.py --file documento.docx
+
+Compares the streaming extractor (src.loaders.docx_text) with parsing the
+whole document.xml into a tree, and with docx2txt when it is installed.
+Reports time and peak memory (tracemalloc) of each, starting from the
+file bytes already in memory as FileLoader.ingest has them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import io
+import os
+import time
+import tracemalloc
+import zipfile
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+from _corpus import load_or_make_corpus
+
+from src.loaders.docx_text import DOCUMENT_PART, extract_docx_text
+
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def make_docx(text: str, images: int, image_kb: int) -> bytes:
+    """Build a .docx with one paragraph per line and `images` random media parts."""
+    body = "".join(
+        f"<w:p><w:r><w:t xml:space=\"preserve\">{escape(line)}</w:t></w:r></w:p>"
+        for line in text.splitlines()
+    )
+    document = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{_W_NS}"><w:body>{body}</w:body></w:document>'
+    )
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr(DOCUMENT_PART, document)
+        for i in range(images):
+            # Random bytes do not compress, like real JPEG/PNG data
+            archive.writestr(f"word/media/image{i + 1}.png", os.urandom(image_kb * 1024),
+                             compress_type=zipfile.ZIP_STORED)
+    return out.getvalue()
+
+
+def _tree_extract(data: bytes) -> str:
+    """Baseline: decompress document.xml and walk the whole tree."""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        root = ElementTree.fromstring(archive.read(DOCUMENT_PART))
+    w = "{" + _W_NS + "}"
+    parts = []
+    for child in root.iter():
+        if child.tag == w + "t":
+            parts.append(child.text or "")
+        elif child.tag == w + "tab":
+            parts.append("\t")
+        elif child.tag in (w + "br", w + "cr"):
+            parts.append("\n")
+        elif child.tag == w + "p":
+            parts.append("\n\n")
+    return "".join(parts)
+
+
+def _measure(extract, data: bytes):
+    """Return (text, seconds, peak bytes)."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    text = extract(data)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return text, elapsed, peak
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=4.0, help="Synthetic text size in MB.")
+    parser.add_argument("--images", type=int, default=40, help="Embedded media parts.")
+    parser.add_argument("--image-kb", type=int, default=1024, help="Size of each media part in KB.")
+    parser.add_argument("--file", help="Benchmark a real .docx instead.")
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, "rb") as file:
+            data = file.read()
+    else:
+        data = make_docx(load_or_make_corpus(None, args.mb), args.images, args.image_kb)
+
+    candidates = [("tree", _tree_extract), ("streaming", extract_docx_text)]
+    try:
+        import docx2txt
+        candidates.insert(0, ("docx2txt", lambda d: docx2txt.process(io.BytesIO(d))))
+    except ImportError:
+        pass
+
+    mb = 1024 * 1024
+    print(f"Document: {len(data) / mb:.1f} MB")
+    reference = None
+    for name, extract in candidates:
+        text, elapsed, peak = _measure(extract, data)
+        # docx2txt strips the document and adds headers/footers (none here)
+        if reference is None:
+            reference = text.strip()
+        elif text.strip() != reference:
+            print(f"✗ {name} text differs")
+            return 1
+        print(f"  {name:10} {elapsed * 1000:8.1f} ms   peak {peak / mb:7.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
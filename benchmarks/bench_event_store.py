@@ -0,0 +1,135 @@
+"""
+Benchmark: memory held by the word events of a session, list of WordEvent
+dataclasses vs the columnar WordEventStore.
+
+    python benchmarks/bench_event_store.py                 # 100k trials
+    python benchmarks/bench_event_store.py --trials 500000
+
+Trials cycle through the words of a synthetic corpus, as a long session
+does. Reports the memory retained after logging (measured with
+tracemalloc), the logging time per trial and the time to export the
+events to CSV.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+from _corpus import load_or_make_corpus
+
+from src.core.enums import State
+from src.logging.event_store import WordEventStore
+from src.logging.session_logger import SessionData, SessionLogger, StimulusType, WordEvent, export_word_events_csv
+from src.utils.corpus import Corpus
+
+
+def _log_objects(session: SessionData, words, trials: int) -> list:
+    """The previous representation: one WordEvent (with its uuid4) per trial."""
+    events: list = []
+    for trial in range(trials):
+        shown = trial * 400
+        events.append(WordEvent(
+            session_id=session.session_id,
+            trial_index=trial,
+            stimulus_text=words[trial % len(words)],
+            stimulus_type=StimulusType.WORD,
+            stimulus_source="benchmark",
+            duration_ms=220,
+            shown_at_ms=shown,
+            hidden_at_ms=shown + 221,
+            cue_onset_latency_est_ms=5.8,
+            word_level_speed=220,
+            game_state=State.SHOW_WORD,
+        ))
+    return events
+
+
+def _log_store(session: SessionData, words, trials: int) -> WordEventStore:
+    logger = SessionLogger(session)
+    for trial in range(trials):
+        shown = trial * 400
+        logger.log_word_event(
+            stimulus_text=words[trial % len(words)],
+            shown_at_ms=shown,
+            hidden_at_ms=shown + 221,
+            stimulus_type=StimulusType.WORD,
+            stimulus_source="benchmark",
+            duration_ms=220,
+            cue_onset_latency_est_ms=5.8,
+            word_level_speed=220,
+            game_state=State.SHOW_WORD,
+        )
+    return session.word_events
+
+
+def _retained(build):
+    """Return (object, bytes retained by it)."""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, current - baseline
+
+
+def _timed(build) -> float:
+    """Seconds to build (untraced: tracemalloc slows allocations down)."""
+    gc.collect()
+    start = time.perf_counter()
+    build()
+    return time.perf_counter() - start
+
+
+def _row(event: WordEvent) -> dict:
+    """CSV row of an event, without its (random) event id."""
+    row = event.to_csv_row()
+    del row["event_id"]
+    return row
+
+
+def _export(events, session: SessionData, folder: Path) -> float:
+    start = time.perf_counter()
+    export_word_events_csv(events, session, folder / "words.csv")
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trials", type=int, default=100_000, help="Word events to log.")
+    args = parser.parse_args()
+
+    # Distinct word objects, as the presenter materializes them from the corpus
+    words = [str(word) for word in Corpus.from_text(load_or_make_corpus(None, 1.0)).words]
+    session = SessionData(session_id=uuid.uuid4())
+
+    objects, objects_bytes = _retained(lambda: _log_objects(session, words, args.trials))
+    store, store_bytes = _retained(lambda: _log_store(SessionData(session_id=session.session_id), words, args.trials))
+    objects_s = _timed(lambda: _log_objects(session, words, args.trials))
+    store_s = _timed(lambda: _log_store(SessionData(session_id=session.session_id), words, args.trials))
+
+    if list(map(_row, store[:1000])) != list(map(_row, objects[:1000])):
+        print("✗ Store views differ from the logged WordEvents")
+        return 1
+
+    mb = 1024 * 1024
+    print(f"Word events: {args.trials} trials, {len(store.texts)} distinct stimuli")
+    print(f"  WordEvent list:  retained {objects_bytes / mb:7.1f} MB   {objects_bytes / args.trials:6.0f} B/trial"
+          f"   log {objects_s / args.trials * 1e6:5.2f} µs/trial")
+    print(f"  WordEventStore:  retained {store_bytes / mb:7.1f} MB   {store_bytes / args.trials:6.0f} B/trial"
+          f"   log {store_s / args.trials * 1e6:5.2f} µs/trial  ({objects_bytes / store_bytes:.1f}x smaller)")
+    with tempfile.TemporaryDirectory() as folder:
+        print(f"  CSV export: list {_export(objects, session, Path(folder)) * 1000:.0f} ms,"
+              f" store {_export(store, session, Path(folder)) * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,64 @@
+"""
+Benchmark: single-pass tokenizer vs the previous multi-pass implementation.
+
+    python benchmarks/bench_tokenizer.py              # 4 MB synthetic corpus
+    python benchmarks/bench_tokenizer.py --mb 16
+    python benchmarks/bench_tokenizer.py --file libro.txt
+
+Outputs are checked for equality before timings are reported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from _corpus import load_or_make_corpus
+from _reference_tokenizer import reference_build_words_and_phrase_map
+
+from src.utils.corpus import Corpus
+from src.utils.text import build_words_and_phrase_map, iter_text_chunks
+
+
+def _best_of(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _first_chunk(text: str) -> None:
+    next(iter_text_chunks(text.splitlines(keepends=True)))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=4.0, help="Synthetic corpus size in MB.")
+    parser.add_argument("--file", help="Use a real UTF-8 corpus instead.")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    text = load_or_make_corpus(args.file, args.mb)
+    size_mb = len(text.encode("utf-8")) / (1024 * 1024)
+
+    result = build_words_and_phrase_map(text)
+    if result != reference_build_words_and_phrase_map(text):
+        print("✗ Outputs differ from the reference implementation")
+        return 1
+
+    print(f"Corpus: {size_mb:.1f} MB, {len(result.words)} words, {result.phrases_total} phrases")
+    reference = _best_of(reference_build_words_and_phrase_map, text, args.repeat)
+    single = _best_of(build_words_and_phrase_map, text, args.repeat)
+    spans = _best_of(Corpus.from_text, text, args.repeat)
+    first = _best_of(_first_chunk, text, args.repeat)
+    print(f"  reference (multi-pass):  {reference * 1000:8.1f} ms")
+    print(f"  single-pass:             {single * 1000:8.1f} ms  ({reference / single:.2f}x)")
+    print(f"  Corpus (spans only):     {spans * 1000:8.1f} ms  ({reference / spans:.2f}x)")
+    print(f"  streaming, first chunk:  {first * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -9,6 +9,7 @@ Usage examples
 --------------
     python build_nuitka.py                 # build for current platform
     python build_nuitka.py --clean         # remove previous build artefacts first
+    python build_nuitka.py --no-asset-pack # ship loose PNGs only
     python build_nuitka.py --help          # show this help
 
 Environment variables
@@ -65,7 +66,6 @@ WINDOWS_ICON = ASSETS_DIR / "tachistostory_icon.ico"
 # Packages to include explicitly (Nuitka may miss some dynamic imports)
 INCLUDE_PACKAGES = [
     "pygame",
-    "docx2txt",
     "src",
     "src.core",
     "src.loaders",
@@ -175,7 +175,17 @@ def _build_nuitka_command() -> list[str]:
     return cmd
 
 
-def _run_build(dry_run: bool = False) -> int:
+def _build_asset_pack(verbose: bool = True) -> None:
+    """Generate the pre-decoded asset pack shipped inside assets/."""
+    result = subprocess.run(
+        [sys.executable, "-m", "src.utils.asset_pack", "--root", str(ROOT_DIR)],
+        cwd=ROOT_DIR,
+    )
+    if result.returncode != 0 and verbose:
+        print("  ⚠ Asset pack not built — the app will decode loose PNGs.")
+
+
+def _run_build(dry_run: bool = False, asset_pack: bool = True) -> int:
     """Execute the Nuitka build."""
     cmd = _build_nuitka_command()
 
@@ -190,6 +200,10 @@ def _run_build(dry_run: bool = False) -> int:
         print("  " + " \\\n    ".join(cmd))
         return 0
 
+    if asset_pack:
+        print("Building asset pack …\n")
+        _build_asset_pack()
+
     print("Running Nuitka …\n")
     result = subprocess.run(cmd)
     return result.returncode
@@ -215,6 +229,10 @@ def _parse_args() -> argparse.Namespace:
         "--dry-run", action="store_true",
         help="Print the Nuitka command without executing it.",
     )
+    parser.add_argument(
+        "--no-asset-pack", action="store_true",
+        help="Skip generating the pre-decoded asset pack.",
+    )
     parser.add_argument(
         "--version", action="version",
         version=f"{APP_NAME} build script — app version {VERSION}",
@@ -231,7 +249,7 @@ def main() -> int:
             print("  ✓ Clean complete.")
             return 0
 
-    rc = _run_build(dry_run=args.dry_run)
+    rc = _run_build(dry_run=args.dry_run, asset_pack=not args.no_asset_pack)
 
     if rc == 0:
         print(f"\n  ✓ Build finished.  Output in: {DIST_DIR}\n")
@@ -16,17 +16,29 @@ from src.core.enums import Error, State
 from src.core.window_manager import WindowManager
 from src.core.asset_manager import AssetManager
 from src.core.layout_manager import LayoutManager
+from src.core.chunk_layout import ChunkLayout
+from src.core.mask_pool import MaskPool
+from src.core.frame_composer import FrameComposer
+from src.core.stimulus_sizing import StimulusSizing, TextMetrics
 from src.core.word_manager import WordManager
 from src.core.music_manager import MusicManager
+from src.core.cue_manager import CueManager, init_mixer
+from src.core.loading_manager import LoadJob, LoadingManager
+from src.core.library_manager import LibraryManager
+from src.core.playlist_manager import PlaylistManager
+from src.core.reload_manager import ReloadManager
 from src.core.fade_controller import FadeController
 from src.core.GameContext import GameContext
 from src.core.session_controller import SessionController
+from src.utils.compiled_corpus import COMPILED_EXTENSION
+from src.loaders.documents import DOCUMENT_EXTENSIONS
+from src.loaders.stimulus_source import StimulusSource
 
 
 # Initialize Pygame
 pygame.init()
 pygame.font.init()
-pygame.mixer.init()
+init_mixer()
 
 # Screen dimensions (captured from actual display)
 _display_info = pygame.display.Info()
@@ -42,8 +54,18 @@ class Tachistostory:
         self.window = WindowManager(SCREEN_MAX_W, SCREEN_MAX_H)
         self.assets = AssetManager()
         self.layout = LayoutManager()
+        self.text_metrics = TextMetrics(self.layout)
+        self.stimulus_sizing = StimulusSizing(self.text_metrics)
+        self.chunk_layout = ChunkLayout(self.text_metrics)
+        self.mask_pool = MaskPool(self.text_metrics)
+        self.frame_composer = FrameComposer()
         self.words = WordManager()
         self.music = MusicManager()
+        self.cues = CueManager()
+        self.loading = LoadingManager()
+        self.library = LibraryManager()
+        self.playlist = PlaylistManager()
+        self.reloader = ReloadManager()
         self.fade = FadeController()
         self.context = GameContext()
         self.context.secret_key = os.urandom(32)
@@ -357,7 +379,7 @@ class Tachistostory:
     def maschera_parola(self, parola: str) -> str:
         """Mask a word by replacing letters/digits with '#'."""
         from src.utils.text import mask_word
-        return mask_word(parola)
+        return mask_word(parola, self.words.mask_style)
 
     def go(self) -> None:
         """Advance to next word."""
@@ -376,8 +398,8 @@ class Tachistostory:
     # ========================================================================
 
     def carica_parola_da_txt(self, nome_file: str):
-        """Load words from a plain text file."""
-        return self.words.load_txt(nome_file)
+        """Load words from a plain text file (the rest streams in behind)."""
+        return self.words.load_txt_stream(nome_file)
 
     def carica_parola_da_word(self, percorso: str):
         """Load words from a Word document (.doc/.docx)."""
@@ -389,6 +411,8 @@ class Tachistostory:
 
     def reset(self) -> None:
         """Reset game to initial state."""
+        self.loading.cancel()
+        self.playlist.clear()
         self.stato_presentazione = State.FORM
         self.words.reset()
         self.in_pausa = False
@@ -409,24 +433,106 @@ class Tachistostory:
     # ========================================================================
 
     def _handle_dropfile(self, file_path: str) -> None:
-        """Handle a dropped file event."""
+        """Handle a dropped file event: start loading it on the worker.
+
+        A dropped folder becomes a playlist of the texts it contains.
+        """
+        if os.path.isdir(file_path):
+            self.playlist.clear()
+            if self.playlist.add_folder(file_path):
+                self.start_playlist()
+            else:
+                self._show_error(Error.INVALID, os.path.basename(file_path))
+            return
+        self.playlist.clear()
+        self.start_file_loading(file_path)
+
+    def start_playlist(self) -> None:
+        """Load the first playlist file; the next ones are prefetched while presenting."""
+        path = self.playlist.start()
+        if path is not None:
+            self.start_file_loading(path)
+
+    def advance_playlist(self) -> bool:
+        """Switch to the next playlist file in a new session.
+
+        The file has normally been loaded in background already, so there is
+        no loading pause. Files that failed to load are skipped. False at the
+        end of the playlist, or while the next file is still loading
+        (playlist.has_next stays True then: call again on a later frame).
+        """
+        while True:
+            job = self.playlist.take_next()
+            if job is None:
+                return False
+            if job.error is None and job.result is not None:
+                break
+            print(f"  ⚠ Playlist: {job.name} skipped ({job.error})")
+
+        self.context.next_session()
+        self._apply_loaded_file(job)
+        self.playlist.prefetch_next()
+        return True
+
+    def start_file_loading(self, file_path: str) -> None:
+        """Start loading a stimulus file (dropped or picked from the library)."""
         file_low = file_path.lower()
+        if not file_low.endswith((".txt", COMPILED_EXTENSION) + DOCUMENT_EXTENSIONS):
+            self._show_error(Error.INVALID, os.path.basename(file_low))
+            return
 
+        self.mostra_errore = False
+        self.loading.start(file_path)
+        if self.state_machine and self.state_machine.get_current_state_name() != "file_selection":
+            self.state_machine.change_state("file_selection")
+
+    def start_source(self, source: StimulusSource) -> None:
+        """Present the stimuli of a source (list, pseudowords...) pulled lazily while presenting."""
+        self.loading.cancel()
+        self.playlist.clear()
+        self.mostra_errore = False
         try:
-            if file_low.endswith((".docx", ".doc")):
-                words = self.carica_parola_da_word(file_low)
-            elif file_low.endswith(".txt"):
-                words = self.carica_parola_da_txt(file_low)
-            else:
-                self._show_error(Error.INVALID, os.path.basename(file_low))
-                return
-
-            if words:
-                self.words.file_name = os.path.splitext(os.path.basename(file_low))[0]
-                self.words.file_loaded = True
-                # Store file metadata in session
-                from pathlib import Path
-                self.controller.set_file_selected(Path(file_path))
+            self.words.load_source(source)
+        except Exception as e:
+            self._show_error(Error.EXCEPTION, str(e))
+            traceback.print_exc()
+            return
+        if not self.words.has_words:
+            self._show_error(Error.EMPTY, "")
+            return
+
+        path = getattr(source, "path", None)
+        if path is not None:
+            from pathlib import Path
+            self.controller.set_file_selected(Path(path), getattr(source, "metadata", None))
+        else:
+            self.controller.set_source_selected(source.name)
+        if self.state_machine:
+            self.state_machine.change_state("instruction")
+
+    def cancel_file_loading(self) -> None:
+        """Cancel the file being loaded (ESC on the loading screen)."""
+        self.loading.cancel()
+
+    def _poll_file_loading(self) -> None:
+        """Apply a file loaded by the worker (called every frame)."""
+        job = self.loading.poll()
+        if job is not None:
+            self._finish_file_loading(job)
+
+    def _finish_file_loading(self, job: LoadJob) -> None:
+        """Apply a completed load job on the main thread."""
+        if job.error is not None:
+            self._show_error(Error.EXCEPTION, str(job.error))
+            return
+        if job.result is None:
+            return
+
+        try:
+            self._apply_loaded_file(job)
+            if self.words.has_words:
+                if self.playlist.is_active:
+                    self.playlist.prefetch_next()
                 if self.state_machine:
                     self.state_machine.change_state("instruction")
             else:
@@ -436,6 +542,30 @@ class Tachistostory:
             self._show_error(Error.EXCEPTION, str(e))
             traceback.print_exc()
 
+    def _apply_loaded_file(self, job: LoadJob) -> None:
+        """Apply a loaded file to the words and snapshot it into the session."""
+        self.words.apply_ingested(job.result)
+        if self.words.has_words:
+            self.words.file_name = os.path.splitext(job.name)[0].lower()
+            self.words.file_loaded = True
+            # Store file metadata in session
+            from pathlib import Path
+            self.controller.set_file_selected(Path(job.path), self.words.file_metadata)
+            # Font size of every word for the current window (the rest of a stream on demand)
+            self.stimulus_sizing.prepare(self.words.corpus, self.screen_width)
+
+    def _poll_file_reload(self) -> None:
+        """Apply edits to the stimulus file saved while it is in use (config.reload)."""
+        now_ms = pygame.time.get_ticks()
+        reloaded = self.reloader.poll(now_ms, self.context.selected_file_path, self.words)
+        if reloaded is None:
+            return
+        self.words.apply_reload(reloaded.corpus, reloaded.splice, reloaded.metadata)
+        self.stimulus_sizing.prepare(self.words.corpus, self.screen_width)
+        self.controller.record_file_reload(reloaded.metadata, now_ms)
+        print(f"  ✓ Reloaded {reloaded.metadata.name} "
+              f"({reloaded.splice.retokenized_chars} characters re-tokenized)")
+
     def _show_error(self, error_type: Error, message: str) -> None:
         """Show an error message."""
         self.mostra_errore = True
@@ -518,8 +648,8 @@ class Tachistostory:
     # ========================================================================
 
     def music_exe(self):
-        """Load and execute music."""
-        self.music.play_default()
+        """Load and execute music (playlist of the current profile)."""
+        self.music.play_playlist(self.context.session.profile_name)
     
     def music_fade_out(self, fade_duration_ms: int = 1000) -> None:
         """Fade out on instruction or presentation state."""
@@ -594,6 +724,7 @@ class Tachistostory:
         self.load_assets()
         self.aggiorna_layout()
         self._build_state_machine()
+        self.cues.load()
         self.music_exe()
 
     def run(self) -> None:
@@ -617,6 +748,8 @@ class Tachistostory:
 
                 delta_time = clock.get_time() / 1000.0
                 self._update_fade(delta_time)
+                # The playlist keeps advancing behind the error overlay
+                self.music.update()
                 
                 if self._render_error_overlay(clock):
                     if self.window.screen:
@@ -626,6 +759,10 @@ class Tachistostory:
                     continue
 
                 self.music_fade_out(self.music_fade_duration)
+                self._poll_file_loading()
+                self.playlist.poll()
+                self._poll_file_reload()
+                self.words.pump_ahead()
                     
                 self.state_machine.update(delta_time)
                 self.state_machine.render()
@@ -640,5 +777,11 @@ class Tachistostory:
                 pygame.quit()
                 sys.exit()
 
+        self.loading.shutdown()
+        self.library.shutdown()
+        self.playlist.shutdown()
+        self.reloader.shutdown()
+        self.music.shutdown()
+
 
 __all__ = ["Tachistostory", "Error", "State"]
@@ -47,6 +47,9 @@ class GameContext:
     # Output directory — writable location for session logs
     output_dir: Path = field(default_factory=_default_output_dir)
 
+    # Ended sessions of the current run (playlist: one per file), oldest first
+    finished_sessions: list[SessionData] = field(default_factory=list)
+
     def __post_init__(self) -> None:
         # Always bind logger to the current session
         self.logger = SessionLogger(self.session)
@@ -59,9 +62,26 @@ class GameContext:
         self.session = SessionData()
         self.logger = SessionLogger(self.session)
         self.selected_file_path = None
+        self.finished_sessions = []
         # Reset form manager for new participant entry
         self.form_manager.reset()
 
+    def next_session(self) -> None:
+        """Keep the current session and start a new one for the same participant.
+
+        Used by playlists, where every file gets its own session ID.
+        """
+        previous = self.session
+        self.finished_sessions.append(previous)
+        self.session = SessionData(
+            participant_pseudonym=previous.participant_pseudonym,
+            participant_code_raw=previous.participant_code_raw,
+            participant_display_name=previous.participant_display_name,
+            profile_name=previous.profile_name,
+        )
+        self.logger = SessionLogger(self.session)
+        self.selected_file_path = None
+
     def get_session_and_logger(self) -> tuple[SessionData, SessionLogger]:
         """Convenience accessor for states that want both objects."""
         return self.session, self.logger
\ No newline at end of file
@@ -3,15 +3,34 @@
 from src.core.window_manager import WindowManager
 from src.core.asset_manager import AssetManager
 from src.core.layout_manager import LayoutManager
+from src.core.stimulus_sizing import StimulusSizing, TextMetrics
+from src.core.chunk_layout import ChunkLayout
+from src.core.mask_pool import MaskPool
+from src.core.frame_composer import FrameComposer
 from src.core.word_manager import WordManager
 from src.core.music_manager import MusicManager
+from src.core.cue_manager import CueManager
+from src.core.loading_manager import LoadingManager
+from src.core.library_manager import LibraryManager
+from src.core.playlist_manager import PlaylistManager
+from src.core.reload_manager import ReloadManager
 from src.core.fade_controller import FadeController
 
 __all__ = [
     "WindowManager",
     "AssetManager", 
     "LayoutManager",
+    "TextMetrics",
+    "StimulusSizing",
+    "ChunkLayout",
+    "MaskPool",
+    "FrameComposer",
     "WordManager",
     "MusicManager",
+    "CueManager",
+    "LoadingManager",
+    "LibraryManager",
+    "PlaylistManager",
+    "ReloadManager",
     "FadeController",
 ]
@@ -0,0 +1,142 @@
+"""
+Chunk Layout - Impaginazione precalcolata dei gruppi di parole.
+"""
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import pygame
+
+from src.core.config import config
+from src.core.stimulus_sizing import TextMetrics
+from src.utils.chunks import ChunkPlan
+
+# Superfici renderizzate tenute in cache (gruppo corrente, maschera, successivo...)
+SURFACE_CACHE_SIZE = 8
+
+
+class _ChunkTable:
+    """Impaginazione di tutti i gruppi per una larghezza.
+
+    Per ogni gruppo: classe di dimensione del font (indice in
+    LayoutManager.stimulus_fonts) e parole da cui iniziano le righe dopo
+    la prima (relative all'inizio del gruppo), in un unico array con gli
+    offset di ciascun gruppo.
+    """
+
+    __slots__ = ("size_class", "breaks", "break_offsets")
+
+    def __init__(self, count: int):
+        self.size_class = array("B", bytes(count))
+        self.breaks = array("I")
+        self.break_offsets = array("I", bytes(4 * (count + 1)))
+
+    def line_starts(self, chunk: int) -> List[int]:
+        return [0] + list(self.breaks[self.break_offsets[chunk]:self.break_offsets[chunk + 1]])
+
+
+class ChunkLayout:
+    """Righe e dimensione del font di ogni gruppo di parole, per larghezza della finestra.
+
+    prepare() impagina tutti i gruppi del piano: a capo greedy sulle
+    larghezze delle parole (TextMetrics: una misura per parola distinta e
+    classe di dimensione) e la dimensione più grande in cui il gruppo sta
+    in config.chunk.max_lines righe. Le tabelle restano in cache per
+    larghezza; le superfici renderizzate in una piccola cache LRU per
+    (gruppo, larghezza, maschera), così mostrare un gruppo è una lookup più
+    un blit. Tutto viene ricalcolato se cambiano i font del LayoutManager.
+    """
+
+    def __init__(self, metrics: TextMetrics):
+        self.metrics = metrics
+        self.plan: Optional[ChunkPlan] = None
+        self._fonts_version = -1
+        self._tables: Dict[int, _ChunkTable] = {}
+        self._surfaces: "OrderedDict[tuple[int, int, bool], pygame.Surface]" = OrderedDict()
+
+    def _sync(self, plan: ChunkPlan) -> None:
+        """Scarta le misure se sono cambiati i font, le tabelle se è cambiato il piano."""
+        version = self.metrics.sync()
+        if self._fonts_version != version:
+            self._fonts_version = version
+            self._tables.clear()
+            self._surfaces.clear()
+        if plan is not self.plan:
+            self.plan = plan
+            self._tables.clear()
+            self._surfaces.clear()
+
+    def _fit(self, words: List[str], max_width: int) -> tuple[int, List[int]]:
+        """Classe di dimensione più grande in cui `words` sta nelle righe ammesse, e i suoi a capo."""
+        last = self.metrics.class_count - 1
+        for size_class in range(last + 1):
+            widths = self.metrics.widths(size_class, words)
+            space = self.metrics.space_width(size_class)
+            breaks: List[int] = []
+            line = widths[0]
+            for i in range(1, len(widths)):
+                if line + space + widths[i] > max_width:
+                    breaks.append(i)
+                    line = widths[i]
+                else:
+                    line += space + widths[i]
+            if size_class == last or (len(breaks) < config.chunk.max_lines and max(widths) <= max_width):
+                return size_class, breaks
+        return last, []
+
+    def prepare(self, plan: ChunkPlan, width: int) -> _ChunkTable:
+        """Impagina tutti i gruppi di `plan` per una finestra larga `width` (se non già fatto)."""
+        self._sync(plan)
+        table = self._tables.get(width)
+        if table is not None:
+            return table
+        table = _ChunkTable(plan.count)
+        max_width = max(1, int(width * config.chunk.max_width_ratio))
+        words = plan.corpus.words
+        starts = plan.starts
+        word_count = plan.corpus.word_count
+        size_class, breaks, offsets = table.size_class, table.breaks, table.break_offsets
+        for chunk in range(plan.count):
+            start = starts[chunk]
+            end = starts[chunk + 1] if chunk + 1 < len(starts) else word_count
+            size_class[chunk], chunk_breaks = self._fit(words[start:end], max_width)
+            breaks.extend(chunk_breaks)
+            offsets[chunk + 1] = len(breaks)
+        self._tables[width] = table
+        return table
+
+    def surface(self, plan: ChunkPlan, chunk: int, width: int, masked: bool = False) -> pygame.Surface:
+        """Superficie del gruppo `chunk` (o della sua maschera), renderizzata una volta."""
+        self._sync(plan)
+        key = (chunk, width, masked)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+        surface = self._render(plan, chunk, width, masked)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > SURFACE_CACHE_SIZE:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def prerender(self, plan: ChunkPlan, chunk: int, width: int, masked: bool = False) -> None:
+        """Renderizza in anticipo (es. il gruppo successivo durante la maschera)."""
+        if 0 <= chunk < plan.count:
+            self.surface(plan, chunk, width, masked)
+
+    def _render(self, plan: ChunkPlan, chunk: int, width: int, masked: bool) -> pygame.Surface:
+        table = self.prepare(plan, width)
+        words = plan.masks(chunk) if masked else plan.words(chunk)
+        font = self.metrics.layout.stimulus_fonts[table.size_class[chunk]]
+        starts = table.line_starts(chunk) + [len(words)]
+        lines = [
+            font.render(" ".join(words[starts[i]:starts[i + 1]]), True, config.display.text_color)
+            for i in range(len(starts) - 1)
+        ]
+        line_height = font.get_linesize()
+        surface = pygame.Surface(
+            (max(line.get_width() for line in lines), line_height * len(lines)), pygame.SRCALPHA
+        )
+        for i, line in enumerate(lines):
+            surface.blit(line, ((surface.get_width() - line.get_width()) // 2, i * line_height))
+        return surface
@@ -7,7 +7,8 @@ Keeps all timing, layout, color, and asset path settings in one place.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Tuple
+from pathlib import Path
+from typing import Dict, Optional, Tuple
 import pygame
 
 import settings
@@ -42,6 +43,8 @@ class DisplayConfig:
     slider_track_color: Tuple[int, int, int] = (39, 39, 39)
 
     color_key: Tuple[int, int, int] = (0,0,0)
+    # Compose the next presentation frame offscreen while the current one is shown
+    precompose_frames: bool = True
 
 @dataclass
 class TimingConfig:
@@ -65,6 +68,11 @@ class FontConfig:
     about_size: int = 14
     instruction_size: int = 18
     pause_size: int = 38
+    # Stimulus size classes, as fractions of main_size (largest first):
+    # a stimulus is drawn at the largest one that fits the window
+    stimulus_size_steps: Tuple[float, ...] = (1.0, 0.85, 0.7, 0.55, 0.4)
+    # Share of the window width a single word may take
+    stimulus_max_width_ratio: float = 0.9
 
 
 @dataclass
@@ -98,8 +106,102 @@ class MusicConfig:
     background_music: str = "assets/sounds/fantasy_music.mp3"
     volume: float = 0.2
     loop: bool = True
+    # Crossfade between playlist tracks (0 = gapless back-to-back)
+    crossfade_ms: int = 3000
+    # Track lists per profile (SessionData.profile_name); "default" otherwise
+    playlists: Dict[str, Tuple[str, ...]] = field(
+        default_factory=lambda: {"default": ("assets/sounds/fantasy_music.mp3",)}
+    )
+
+
+@dataclass
+class AudioConfig:
+    # Mixer setup — a small buffer keeps cue latency low (buffer / frequency)
+    frequency: int = 44100
+    sample_size: int = -16
+    channels: int = 2
+    buffer_size: int = 256
+
+
+@dataclass
+class CueConfig:
+    enabled: bool = False
+    volume: float = 0.8
+    tone_hz: int = 1000
+    tone_ms: int = 30
+    mask_ms: int = 120
+    # Cue played at word onset/offset ("tone", "mask" or "" for none)
+    onset_cue: str = "tone"
+    offset_cue: str = "mask"
     
 
+@dataclass
+class MaskConfig:
+    # Mask style name (see src.utils.text.MASK_STYLES)
+    style: str = "hash"
+    # Mask shown after each stimulus (see src.utils.mask_patterns.MASK_KINDS)
+    kind: str = "text"
+    # Pattern masks pre-generated for each mask width
+    pool_variants: int = 3
+    # Pattern mask widths are rounded up to a multiple of this (pixels)
+    width_step: int = 24
+    # Checkerboard cell size (pixels)
+    checker_cell: int = 6
+    # Colours of the noise mask, from text colour to background colour
+    noise_levels: int = 4
+
+
+@dataclass
+class OrderConfig:
+    # Presentation order (see src.utils.presentation_order.ORDER_NAMES)
+    name: str = "sequential"
+    # Seed of the shuffled orders (None = new random seed every session)
+    seed: Optional[int] = None
+    # Present only a selection of words (see src.utils.word_features.WORD_FILTERS, "" = all)
+    word_filter: str = ""
+
+
+@dataclass
+class ChunkConfig:
+    # Words shown together (see src.utils.chunks.CHUNK_MODES)
+    mode: str = "word"
+    # Words per chunk in "words" mode
+    words: int = 3
+    # Lines a chunk may take, and the share of the window width they may use
+    max_lines: int = 2
+    max_width_ratio: float = 0.9
+
+
+@dataclass
+class ReloadConfig:
+    # Watch the stimulus file and apply edits while it is presented
+    enabled: bool = False
+    # How often size/mtime of the file are checked
+    poll_interval_ms: int = 1000
+
+
+@dataclass
+class LibraryConfig:
+    # Folder of stimulus texts listed on the file selection screen
+    folder: str = str(Path.home() / "Tachistostory" / "stimuli")
+    # Cheap (size, mtime) rescan while the list is shown
+    rescan_interval_ms: int = 5000
+    # Threads hashing/parsing changed files (None = default pool size)
+    scan_workers: Optional[int] = 4
+    visible_rows: int = 8
+
+
+@dataclass
+class SourceConfig:
+    # Stimulus sources (src.loaders.stimulus_source): items kept ready ahead
+    # of the current one and kept behind it for going back
+    lookahead: int = 64
+    history: int = 256
+    # Pseudoword stream (None = new random seed / unbounded)
+    pseudoword_seed: Optional[int] = None
+    pseudoword_count: Optional[int] = None
+
+
 @dataclass
 class AppConfig:
     display: DisplayConfig = field(default_factory=DisplayConfig)
@@ -109,5 +211,13 @@ class AppConfig:
     paths: PathConfig = field(default_factory=PathConfig)
     book: BookConfig = field(default_factory=BookConfig)
     music: MusicConfig = field(default_factory=MusicConfig)
+    audio: AudioConfig = field(default_factory=AudioConfig)
+    cue: CueConfig = field(default_factory=CueConfig)
+    mask: MaskConfig = field(default_factory=MaskConfig)
+    order: OrderConfig = field(default_factory=OrderConfig)
+    chunk: ChunkConfig = field(default_factory=ChunkConfig)
+    reload: ReloadConfig = field(default_factory=ReloadConfig)
+    library: LibraryConfig = field(default_factory=LibraryConfig)
+    source: SourceConfig = field(default_factory=SourceConfig)
 
 config = AppConfig()
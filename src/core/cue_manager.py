@@ -0,0 +1,133 @@
+"""
+Cue Manager - Cue audio a bassa latenza sincronizzati agli stimoli.
+"""
+from array import array
+import math
+import random
+import time
+from typing import Dict, Optional
+
+import pygame
+
+from src.core.config import config
+
+# Canale riservato ai cue (la musica usa pygame.mixer.music)
+CUE_CHANNEL = 0
+
+
+def init_mixer() -> bool:
+    """(Re)inizializza il mixer con il buffer ridotto di AudioConfig."""
+    audio = config.audio
+    try:
+        # Il mixer può essere già aperto con i valori di default da pygame.init()
+        pygame.mixer.quit()
+        pygame.mixer.init(
+            frequency=audio.frequency,
+            size=audio.sample_size,
+            channels=audio.channels,
+            buffer=audio.buffer_size,
+        )
+        return True
+    except pygame.error as e:
+        print(f"⚠ Mixer non disponibile: {e}")
+        return False
+
+
+class CueManager:
+    """Gestisce i cue audio (tono di sincronizzazione, maschera uditiva)."""
+
+    def __init__(self):
+        self.enabled = config.cue.enabled
+        self.volume = config.cue.volume
+        self.onset_cue = config.cue.onset_cue
+        self.offset_cue = config.cue.offset_cue
+
+        self._sounds: Dict[str, pygame.mixer.Sound] = {}
+        self._channel: Optional[pygame.mixer.Channel] = None
+        self._buffer_latency_ms = 0.0
+
+    @property
+    def is_ready(self) -> bool:
+        return self.enabled and self._channel is not None
+
+    @property
+    def buffer_latency_ms(self) -> float:
+        """Latenza introdotta dal buffer del mixer (un periodo)."""
+        return self._buffer_latency_ms
+
+    def load(self) -> None:
+        """Precarica i buffer dei cue. Da chiamare dopo init_mixer()."""
+        mixer_info = pygame.mixer.get_init()
+        if mixer_info is None:
+            print("  ⚠ Cue audio disabilitati: mixer non inizializzato")
+            return
+        frequency, sample_format, channels = mixer_info
+        if sample_format != -16:
+            print(f"  ⚠ Cue audio disabilitati: formato mixer {sample_format} non supportato")
+            return
+
+        cue = config.cue
+        self._sounds = {
+            "tone": self._make_sound(self._tone_samples(frequency, cue.tone_hz, cue.tone_ms), channels),
+            "mask": self._make_sound(self._noise_samples(frequency, cue.mask_ms), channels),
+        }
+        for sound in self._sounds.values():
+            sound.set_volume(self.volume)
+
+        pygame.mixer.set_reserved(CUE_CHANNEL + 1)
+        self._channel = pygame.mixer.Channel(CUE_CHANNEL)
+        self._buffer_latency_ms = config.audio.buffer_size / frequency * 1000.0
+        print(f"  ✓ Cue audio caricati (buffer {self._buffer_latency_ms:.1f} ms)")
+
+    def play(self, name: str) -> Optional[float]:
+        """Avvia un cue e ritorna la latenza stimata in ms (None se non suonato).
+
+        È una stima, non una misura: il tempo speso per accodare il buffer sul
+        canale più un periodo del buffer del mixer, cioè il ritardo minimo
+        prima che il campione raggiunga il dispositivo. Non include la latenza
+        del dispositivo di uscita, per cui i log la chiamano *_latency_est_ms.
+        """
+        if not self.is_ready or not name:
+            return None
+        sound = self._sounds.get(name)
+        if sound is None:
+            return None
+
+        requested = time.perf_counter()
+        self._channel.play(sound)
+        scheduling_ms = (time.perf_counter() - requested) * 1000.0
+        return round(scheduling_ms + self._buffer_latency_ms, 3)
+
+    def play_onset(self) -> Optional[float]:
+        """Cue all'onset della parola."""
+        return self.play(self.onset_cue)
+
+    def play_offset(self) -> Optional[float]:
+        """Cue all'offset della parola."""
+        return self.play(self.offset_cue)
+
+    def _make_sound(self, mono: array, channels: int) -> pygame.mixer.Sound:
+        """Crea un Sound dai campioni mono replicandoli sui canali del mixer."""
+        if channels > 1:
+            interleaved = array("h", bytes(len(mono) * channels * 2))
+            for ch in range(channels):
+                interleaved[ch::channels] = mono
+            mono = interleaved
+        return pygame.mixer.Sound(buffer=mono.tobytes())
+
+    def _tone_samples(self, frequency: int, tone_hz: int, duration_ms: int) -> array:
+        """Sinusoide con rampe di 2 ms per evitare click."""
+        count = int(frequency * duration_ms / 1000)
+        ramp = max(1, int(frequency * 0.002))
+        step = 2.0 * math.pi * tone_hz / frequency
+        samples = array("h", bytes(count * 2))
+        for i in range(count):
+            gain = min(1.0, i / ramp, (count - i) / ramp)
+            samples[i] = int(32767 * gain * math.sin(step * i))
+        return samples
+
+    def _noise_samples(self, frequency: int, duration_ms: int) -> array:
+        """Rumore bianco (seed fisso per cue riproducibili)."""
+        count = int(frequency * duration_ms / 1000)
+        rng = random.Random(0)
+        return array("h", (rng.randint(-32767, 32767) for _ in range(count)))
@@ -0,0 +1,77 @@
+"""
+Frame Composer - Fotogrammi completi composti fuori schermo.
+"""
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional
+
+import pygame
+
+# Fotogrammi tenuti pronti (corrente, maschera e parola successiva)
+FRAME_SLOTS = 3
+
+
+class FrameComposer:
+    """Fotogrammi completi della presentazione, composti in anticipo fuori schermo.
+
+    Un fotogramma è identificato da una chiave che contiene tutto ciò che
+    vi è disegnato (stato, stimolo, pannelli, durata, dimensioni...).
+    prepare() lo compone in una superficie grande quanto lo schermo mentre
+    il fotogramma corrente resta fermo; present() lo copia sullo schermo
+    con un solo blit, componendolo sul momento solo se non era pronto. Le
+    superfici dei fotogrammi scartati vengono riusate.
+    """
+
+    def __init__(self, slots: int = FRAME_SLOTS):
+        self.slots = max(1, slots)
+        self._frames: "OrderedDict[Hashable, pygame.Surface]" = OrderedDict()
+        self._spare: List[pygame.Surface] = []
+        # Chiave del fotogramma sullo schermo
+        self.shown: Optional[Hashable] = None
+        # Fotogrammi nuovi presentati già pronti / composti sul momento
+        self.hits = 0
+        self.misses = 0
+
+    def has(self, key: Hashable) -> bool:
+        return key in self._frames
+
+    def _surface(self, size: tuple[int, int]) -> pygame.Surface:
+        while self._spare:
+            surface = self._spare.pop()
+            if surface.get_size() == size:
+                return surface
+        surface = pygame.Surface(size)
+        # Nel formato dello schermo il blit è una copia diretta
+        return surface.convert() if pygame.display.get_surface() is not None else surface
+
+    def prepare(self, key: Hashable, size: tuple[int, int], draw: Callable[[pygame.Surface], None]) -> pygame.Surface:
+        """Compone il fotogramma `key` (se non già pronto) disegnandolo con `draw`."""
+        frame = self._frames.get(key)
+        if frame is not None and frame.get_size() == size:
+            self._frames.move_to_end(key)
+            return frame
+        frame = self._surface(size)
+        draw(frame)
+        self._frames[key] = frame
+        self._frames.move_to_end(key)
+        while len(self._frames) > self.slots:
+            self._spare.append(self._frames.popitem(last=False)[1])
+        return frame
+
+    def present(self, screen: pygame.Surface, key: Hashable, draw: Callable[[pygame.Surface], None]) -> bool:
+        """Copia il fotogramma `key` sullo schermo. Ritorna True se era già pronto."""
+        ready = self.has(key)
+        frame = self.prepare(key, screen.get_size(), draw)
+        screen.blit(frame, (0, 0))
+        if key != self.shown:
+            self.shown = key
+            if ready:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return ready
+
+    def clear(self) -> None:
+        """Scarta i fotogrammi (le superfici restano per essere riusate)."""
+        self._spare.extend(self._frames.values())
+        self._frames.clear()
+        self.shown = None
@@ -1,7 +1,7 @@
 """
 Layout Manager - Gestione fonts, slider e layout UI.
 """
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 import pygame
 
@@ -22,6 +22,10 @@ class LayoutManager:
         self.font_istruzioni: Optional[pygame.font.Font] = None
         self.font_about: Optional[pygame.font.Font] = None
         self.font_pausa: Optional[pygame.font.Font] = None
+        # Stimulus fonts, one per size class (config.font.stimulus_size_steps)
+        self.stimulus_fonts: List[pygame.font.Font] = []
+        # Incremented whenever the fonts are rebuilt (invalidates text measurements)
+        self.fonts_version: int = 0
         
         # Base font size
         self._base_font = config.font.main_size
@@ -67,6 +71,7 @@ class LayoutManager:
         self.font_pausa = pygame.font.Font(
             self.font_path, int(config.font.pause_size * scale)
         )
+        self._update_stimulus_fonts(scale)
 
     def update(self, width: int, height: int, scale: float) -> bool:
         """Aggiorna il layout per le nuove dimensioni. Ritorna True se aggiornato."""
@@ -96,6 +101,15 @@ class LayoutManager:
         self.font_pausa = pygame.font.Font(
             self.font_path, int(config.font.pause_size * scale)
         )
+        self._update_stimulus_fonts(scale)
+
+    def _update_stimulus_fonts(self, scale: float) -> None:
+        """Crea i font delle classi di dimensione degli stimoli (il primo è `font`)."""
+        fonts = [self.font]
+        for step in config.font.stimulus_size_steps[1:]:
+            fonts.append(pygame.font.Font(self.font_path, max(1, int(self._base_font * scale * step))))
+        self.stimulus_fonts = fonts
+        self.fonts_version += 1
 
     def _update_slider(self, width: int, height: int, scale: float) -> None:
         """Aggiorna il layout dello slider."""
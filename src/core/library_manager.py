@@ -0,0 +1,84 @@
+"""
+Library Manager - Libreria degli stimoli indicizzata e riscansionata in background.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+from typing import List, Optional
+
+from src.core.config import config
+from src.utils.stimulus_library import LibraryEntry, ScanResult, StimulusLibrary
+
+
+class LibraryManager:
+    """Tiene l'elenco dei testi della cartella stimoli.
+
+    L'elenco viene letto subito dall'indice SQLite; le riscansioni
+    (solo stat, poi hash e parsing dei file cambiati) girano in un worker.
+    poll() va chiamato a ogni frame mentre l'elenco è visibile.
+    """
+
+    def __init__(self, folder: Optional[str] = None):
+        self.library = StimulusLibrary(folder or config.library.folder)
+        self.entries: List[LibraryEntry] = []
+        self.last_scan: Optional[ScanResult] = None
+        self._scan: Optional[Future] = None
+        self._worker: Optional[ThreadPoolExecutor] = None
+        self._cancel = threading.Event()
+        self._next_scan_ms = 0
+
+    @property
+    def folder(self) -> str:
+        return self.library.root
+
+    @property
+    def is_scanning(self) -> bool:
+        return self._scan is not None
+
+    def refresh(self) -> None:
+        """Rilegge l'elenco dall'indice (senza toccare i file)."""
+        try:
+            self.entries = self.library.entries()
+        except Exception as e:
+            print(f"  ⚠ Libreria non leggibile: {e}")
+
+    def start_scan(self) -> None:
+        """Avvia una riscansione se non ce n'è già una in corso."""
+        if self._scan is not None:
+            return
+        if self._worker is None:
+            self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="library")
+        # Un evento per scansione: shutdown() ferma solo quella in corso
+        self._cancel = threading.Event()
+        self._scan = self._worker.submit(self.library.rescan, config.library.scan_workers, self._cancel)
+
+    def poll(self, now_ms: int) -> bool:
+        """Raccoglie la scansione conclusa e ne pianifica un'altra.
+
+        Ritorna True se l'elenco è cambiato.
+        """
+        changed = False
+        if self._scan is not None and self._scan.done():
+            try:
+                self.last_scan = self._scan.result()
+                changed = self.last_scan.changed
+                if changed:
+                    self.refresh()
+            except Exception as e:
+                print(f"  ⚠ Scansione libreria fallita: {e}")
+            self._scan = None
+            self._next_scan_ms = now_ms + config.library.rescan_interval_ms
+        elif self._scan is None and now_ms >= self._next_scan_ms:
+            self.start_scan()
+        return changed
+
+    def shutdown(self) -> None:
+        """Ferma il worker senza attenderlo.
+
+        La scansione in corso si interrompe al file successivo, così
+        l'uscita dell'interprete non aspetta l'indicizzazione di tutta la cartella.
+        """
+        self._cancel.set()
+        if self._worker is not None:
+            self._worker.shutdown(wait=False, cancel_futures=True)
+            self._worker = None
+        self._scan = None
@@ -0,0 +1,112 @@
+"""
+Loading Manager - Caricamento dei file in un worker senza bloccare il main loop.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import os
+import queue
+from typing import Optional
+
+from src.core.word_manager import STREAM_CHUNK_WORDS
+from src.loaders.file_loader import FileLoader, IngestedFile
+
+
+class LoadCancelled(Exception):
+    """Caricamento annullato dall'utente."""
+
+
+@dataclass
+class LoadJob:
+    """Un file in caricamento."""
+    path: str
+    # False: tokenizza tutto nel worker (nessuno stream da completare dopo)
+    stream: bool = True
+    progress: float = 0.0
+    cancelled: bool = False
+    result: Optional[IngestedFile] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+
+class LoadingManager:
+    """Esegue FileLoader.ingest in un worker e consegna i risultati al main thread.
+
+    Il worker mette i job conclusi in una coda; poll() va chiamato a ogni
+    frame e ritorna il job corrente quando è pronto (risultato o errore).
+    """
+
+    def __init__(self):
+        self.job: Optional[LoadJob] = None
+        self._done: "queue.Queue[LoadJob]" = queue.Queue()
+        self._worker: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def is_loading(self) -> bool:
+        return self.job is not None
+
+    def start(self, path: str, stream: bool = True) -> LoadJob:
+        """Avvia il caricamento di un file (annulla quello in corso)."""
+        self.cancel()
+        job = LoadJob(path=path, stream=stream)
+        self.job = job
+        if self._worker is None:
+            self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="file-loader")
+        self._worker.submit(self._run, job)
+        return job
+
+    def cancel(self) -> None:
+        """Annulla il caricamento corrente; il worker si ferma al prossimo step."""
+        if self.job is not None:
+            self.job.cancelled = True
+            self.job = None
+
+    def poll(self) -> Optional[LoadJob]:
+        """Ritorna il job corrente se concluso, scartando quelli annullati."""
+        return self._collect(block=False)
+
+    def wait(self) -> Optional[LoadJob]:
+        """Attende la fine del job corrente (None se non ce n'è uno)."""
+        return self._collect(block=True)
+
+    def _collect(self, block: bool) -> Optional[LoadJob]:
+        while True:
+            if block and self.job is None:
+                return None
+            try:
+                job = self._done.get(block=block)
+            except queue.Empty:
+                return None
+            if job is self.job and not job.cancelled:
+                self.job = None
+                return job
+            # Annullato: libera lo stream eventualmente aperto
+            if job.result is not None and job.result.stream is not None:
+                job.result.stream.close()
+
+    def _run(self, job: LoadJob) -> None:
+        def report(progress: float) -> None:
+            if job.cancelled:
+                raise LoadCancelled()
+            job.progress = progress
+
+        try:
+            job.result = FileLoader.ingest(
+                job.path,
+                stream_chunk_size=STREAM_CHUNK_WORDS if job.stream else None,
+                progress=report,
+            )
+        except LoadCancelled:
+            pass
+        except Exception as e:
+            job.error = e
+        self._done.put(job)
+
+    def shutdown(self) -> None:
+        """Ferma il worker (senza attendere il job in corso)."""
+        self.cancel()
+        if self._worker is not None:
+            self._worker.shutdown(wait=False)
+            self._worker = None
@@ -0,0 +1,165 @@
+"""
+Mask Pool - Maschere visive (lettere casuali, scacchiera, rumore) pregenerate.
+"""
+import random
+from typing import Dict, List, Optional
+
+import pygame
+
+try:
+    import numpy
+except ImportError:  # Senza NumPy i pixel si generano come bytes (Python puro)
+    numpy = None
+
+from src.core.config import config
+from src.core.stimulus_sizing import StimulusSizing, TextMetrics
+from src.utils.mask_patterns import (
+    MASK_KINDS,
+    checkerboard_pixels,
+    noise_pixels,
+    random_letters,
+    width_bucket,
+)
+
+
+def _palette(levels: int) -> List[tuple]:
+    """`levels` colori dal colore del testo a quello dello sfondo."""
+    text, background = config.display.text_color, config.display.bg_color
+    steps = max(1, levels - 1)
+    return [
+        tuple(t + (b - t) * level // steps for t, b in zip(text, background))
+        for level in range(levels)
+    ]
+
+
+def _pattern_surface(kind: str, size: tuple[int, int], rng: random.Random) -> pygame.Surface:
+    """Scacchiera o rumore grande `size`, senza scrivere i pixel uno a uno.
+
+    Con NumPy gli indici di colore sono un array (x, y) convertito in RGB
+    dalla palette e copiato nella superficie da pygame.surfarray; senza,
+    sono bytes caricati con pygame.image.frombytes in una superficie a
+    8 bit con palette.
+    """
+    width, height = size
+    cell = max(1, config.mask.checker_cell)
+    palette = _palette(config.mask.noise_levels if kind == "noise" else 2)
+    phase = (rng.randrange(2 * cell), rng.randrange(2 * cell))
+    if numpy is not None:
+        if kind == "noise":
+            generator = numpy.random.default_rng(rng.getrandbits(64))
+            indices = generator.integers(0, len(palette), size, dtype=numpy.uint8)
+        else:
+            columns = (numpy.arange(width) + phase[0]) // cell
+            rows = (numpy.arange(height) + phase[1]) // cell
+            indices = ((columns[:, None] + rows[None, :]) & 1).astype(numpy.uint8)
+        surface = pygame.surfarray.make_surface(numpy.array(palette, dtype=numpy.uint8)[indices])
+    else:
+        if kind == "noise":
+            pixels = noise_pixels(width, height, len(palette), rng)
+        else:
+            pixels = checkerboard_pixels(width, height, cell, phase)
+        surface = pygame.image.frombytes(pixels, size, "P")
+        surface.set_palette(palette)
+    # Nel formato dello schermo il blit è una copia diretta
+    return surface.convert() if pygame.display.get_surface() is not None else surface
+
+
+def _letters_surface(font: pygame.font.Font, size: tuple[int, int], rng: random.Random) -> pygame.Surface:
+    """Consonanti casuali su due file sfalsate di mezza lettera, grandi `size`."""
+    width, height = size
+    letter = max(1, font.size("M")[0])
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    for shift in (0, letter // 2):
+        text = font.render(random_letters(round(width / letter), rng), True, config.display.text_color)
+        surface.blit(text, ((width - text.get_width()) // 2 + shift, (height - text.get_height()) // 2))
+    return surface
+
+
+class MaskPool:
+    """Maschere visive pregenerate per classe di dimensione e larghezza degli stimoli.
+
+    prepare() genera config.mask.pool_variants maschere diverse per ogni
+    coppia (classe di dimensione, larghezza arrotondata a
+    config.mask.width_step) presente tra le forme distinte del corpus: il
+    pool segue la distribuzione delle larghezze del testo caricato. mask()
+    è una lookup (a rotazione tra le varianti); una misura mai vista
+    (parole in streaming, gruppi di parole) viene generata alla prima
+    richiesta, che PresentationState fa all'onset dello stimolo, così
+    all'onset della maschera resta solo un blit. Tutto viene rigenerato se
+    cambiano i font o il tipo di maschera.
+    """
+
+    def __init__(self, metrics: TextMetrics):
+        self.metrics = metrics
+        self.kind = "text"
+        self._fonts_version = -1
+        self._masks: Dict[tuple[int, int, int], List[pygame.Surface]] = {}
+        self._turns: Dict[tuple[int, int, int], int] = {}
+        self._rng = random.Random()
+
+    @property
+    def is_pattern(self) -> bool:
+        """True se le maschere sono visive (non il testo mascherato)."""
+        return self.kind != "text"
+
+    def _sync(self, kind: str) -> None:
+        """Scarta le maschere se sono cambiati i font o il tipo."""
+        if kind not in MASK_KINDS:
+            raise ValueError(f"Unknown mask kind: {kind!r} (expected one of {', '.join(MASK_KINDS)})")
+        version = self.metrics.sync()
+        if (version, kind) != (self._fonts_version, self.kind):
+            self._fonts_version, self.kind = version, kind
+            self._masks.clear()
+            self._turns.clear()
+
+    def prepare(self, sizing: StimulusSizing, kind: str) -> int:
+        """Genera le maschere per le larghezze delle parole misurate da `sizing`.
+
+        Ritorna il numero di maschere generate (0 per le maschere di testo).
+        Solleva ValueError per un tipo sconosciuto.
+        """
+        self._sync(kind)
+        if not self.is_pattern:
+            return 0
+        fonts = self.metrics.layout.stimulus_fonts
+        step = config.mask.width_step
+        sizes = {
+            (size_class, width_bucket(width, step), fonts[size_class].get_height())
+            for size_class, width in sizing.form_widths()
+        }
+        generated = 0
+        for key in sizes:
+            if key not in self._masks:
+                self._masks[key] = self._generate(*key)
+                generated += len(self._masks[key])
+        return generated
+
+    def mask(self, size_class: int, width: int, height: Optional[int] = None) -> Optional[pygame.Surface]:
+        """Maschera per uno stimolo largo `width` (None per le maschere di testo).
+
+        L'altezza è quella del font della classe, salvo `height` (gruppi di
+        parole su più righe). Le varianti si alternano a ogni chiamata.
+        """
+        if not self.is_pattern:
+            return None
+        self._sync(self.kind)
+        if height is None:
+            height = self.metrics.layout.stimulus_fonts[size_class].get_height()
+        key = (size_class, width_bucket(width, config.mask.width_step), height)
+        variants = self._masks.get(key)
+        if variants is None:
+            variants = self._masks[key] = self._generate(*key)
+        turn = self._turns.get(key, 0)
+        self._turns[key] = turn + 1
+        return variants[turn % len(variants)]
+
+    def _generate(self, size_class: int, width: int, height: int) -> List[pygame.Surface]:
+        size = (width, max(1, height))
+        if self.kind == "letters":
+            font = self.metrics.layout.stimulus_fonts[size_class]
+            return [_letters_surface(font, size, self._rng) for _ in range(max(1, config.mask.pool_variants))]
+        return [_pattern_surface(self.kind, size, self._rng) for _ in range(max(1, config.mask.pool_variants))]
+
+    def snapshot(self) -> dict:
+        """Impostazioni da registrare con la sessione."""
+        return {"mask_kind": self.kind, "mask_style": config.mask.style}
@@ -1,15 +1,21 @@
 """
 Music Manager - Gestione audio e musica.
 """
-from typing import Optional, TYPE_CHECKING
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Tuple, TYPE_CHECKING
 
 import pygame
 
 from src.core.config import config
+from src.core.cue_manager import CUE_CHANNEL
+from src.loaders.file_loader import LoadMusic
 
 if TYPE_CHECKING:
     from src.core.state_machine import StateMachine
 
+# Canali riservati alla playlist (dopo quello dei cue)
+PLAYLIST_CHANNELS = (CUE_CHANNEL + 1, CUE_CHANNEL + 2)
+
 
 class MusicManager:
     """Gestisce la musica di background e gli effetti audio."""
@@ -19,9 +25,24 @@ class MusicManager:
         self.volume = config.music.volume
         self.loop = config.music.loop
         self.fade_duration: int = 7000
-        
+        self.crossfade_ms = config.music.crossfade_ms
+
         self._state_machine: Optional["StateMachine"] = None
 
+        # Playlist (_playlist_pos = traccia in prefetch)
+        self._playlist: List[str] = []
+        self._playlist_pos = 0
+        self._channels: Optional[Tuple[pygame.mixer.Channel, pygame.mixer.Channel]] = None
+        self._active = 0  # indice del canale che suona la traccia corrente
+        self._current_sound: Optional[pygame.mixer.Sound] = None
+        self._current_started_ms = 0
+        self._next: Optional[Tuple[str, Future]] = None
+        self._next_sound: Optional[pygame.mixer.Sound] = None
+        self._next_queued = False
+        self._xfade_started_ms: Optional[int] = None
+        self._fading_out = False
+        self._decoder: Optional[ThreadPoolExecutor] = None
+
     def set_state_machine(self, sm: "StateMachine") -> None:
         """Imposta il riferimento alla state machine."""
         self._state_machine = sm
@@ -30,7 +51,9 @@ class MusicManager:
         """Carica e avvia la musica. Ritorna True se caricata con successo."""
         track = path or config.music.background_music
         try:
-            pygame.mixer.music.load(track)
+            self._stop_playlist()
+            resolved = LoadMusic.load_background_music(track).background_music
+            pygame.mixer.music.load(resolved)
             pygame.mixer.music.set_volume(self.volume)
             loops = -1 if self.loop else 0
             pygame.mixer.music.play(loops=loops)
@@ -41,44 +64,242 @@ class MusicManager:
             return False
 
     def play_default(self) -> bool:
-        """Avvia la musica di default."""
-        return self.load_and_play(config.music.background_music)
+        """Avvia la playlist di default."""
+        return self.play_playlist()
+
+    # ------------------------------------------------------------------
+    # Playlist
+    # ------------------------------------------------------------------
+
+    def play_playlist(self, profile_name: Optional[str] = None) -> bool:
+        """Avvia la playlist del profilo (o quella di default).
+
+        Le tracce vengono decodificate in background; la riproduzione parte
+        da update() appena la prima è pronta, senza bloccare il main loop.
+        """
+        playlists = config.music.playlists
+        tracks = playlists.get(profile_name or "default") or playlists.get("default")
+        if not tracks:
+            tracks = (config.music.background_music,)
+
+        if pygame.mixer.get_init() is None:
+            print("⚠ Errore caricamento musica: mixer non inizializzato")
+            return False
+
+        self._stop_playlist()
+        pygame.mixer.music.stop()
+        if pygame.mixer.get_num_channels() <= max(PLAYLIST_CHANNELS):
+            pygame.mixer.set_num_channels(max(PLAYLIST_CHANNELS) + 1)
+        pygame.mixer.set_reserved(max(PLAYLIST_CHANNELS) + 1)
+        self._channels = (
+            pygame.mixer.Channel(PLAYLIST_CHANNELS[0]),
+            pygame.mixer.Channel(PLAYLIST_CHANNELS[1]),
+        )
+        self._playlist = list(tracks)
+        self._playlist_pos = 0
+        self._fading_out = False
+        self._prefetch(self._playlist[0])
+        return True
+
+    def update(self) -> None:
+        """Avanza la timeline della playlist (chiamare a ogni frame)."""
+        if self._channels is None or self._fading_out:
+            return
+
+        now = pygame.time.get_ticks()
+        self._collect_next()
+
+        # Nessuna traccia in riproduzione: parte appena la prossima è pronta
+        if self._current_sound is None:
+            if self._next_sound is not None:
+                self._start_next(now, crossfade=False)
+            return
+
+        if self._xfade_started_ms is not None:
+            self._update_crossfade(now)
+            return
+
+        remaining = self._current_sound.get_length() * 1000.0 - (now - self._current_started_ms)
+        if self._next_sound is None:
+            return
+
+        if self.crossfade_ms <= 0:
+            self._queue_gapless(now)
+        elif remaining <= self.crossfade_ms:
+            self._start_next(now, crossfade=True)
+
+    def _prefetch(self, track: str) -> None:
+        """Decodifica la traccia in un worker (Sound già in PCM)."""
+        self._next_sound = None
+        self._next_queued = False
+        if track == self.current_track and self._current_sound is not None:
+            # Stessa traccia (loop): riusa il buffer già decodificato
+            future: Future = Future()
+            future.set_result(self._current_sound)
+            self._next = (track, future)
+            return
+        if self._decoder is None:
+            self._decoder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="music-decoder")
+        self._next = (track, self._decoder.submit(self._decode, track))
+
+    @staticmethod
+    def _decode(track: str) -> pygame.mixer.Sound:
+        resolved = LoadMusic.load_background_music(track).background_music
+        return pygame.mixer.Sound(resolved)
+
+    def _collect_next(self) -> None:
+        """Ritira la traccia decodificata se il worker ha finito."""
+        if self._next is None or self._next_sound is not None:
+            return
+        track, future = self._next
+        if not future.done():
+            return
+        try:
+            self._next_sound = future.result()
+        except Exception as e:
+            print(f"⚠ Errore caricamento musica: {e}")
+            # Traccia non leggibile: la toglie dalla playlist e passa oltre
+            self._next = None
+            del self._playlist[self._playlist_pos]
+            if self._playlist:
+                self._playlist_pos %= len(self._playlist)
+                self._prefetch(self._playlist[self._playlist_pos])
+
+    def _following_track(self) -> Optional[str]:
+        """Ritorna la traccia successiva nella playlist (None a fine lista)."""
+        pos = self._playlist_pos + 1
+        if pos >= len(self._playlist):
+            if not self.loop:
+                return None
+            pos = 0
+        return self._playlist[pos]
+
+    def _start_next(self, now: int, crossfade: bool) -> None:
+        """Avvia la traccia pronta, in crossfade o direttamente."""
+        assert self._channels is not None and self._next is not None
+        incoming = 1 - self._active if self._current_sound is not None else self._active
+        channel = self._channels[incoming]
+        channel.set_volume(0.0 if crossfade else self.volume)
+        channel.play(self._next_sound)
+
+        self._active = incoming
+        self._current_sound = self._next_sound
+        self.current_track = self._next[0]
+        self._current_started_ms = now
+        self._xfade_started_ms = now if crossfade else None
+        self._next = None
+        self._next_sound = None
+        self._prefetch_following()
+
+    def _queue_gapless(self, now: int) -> None:
+        """Accoda la traccia successiva sullo stesso canale (transizione senza gap)."""
+        assert self._channels is not None and self._next is not None
+        channel = self._channels[self._active]
+        if not self._next_queued:
+            channel.queue(self._next_sound)
+            self._next_queued = True
+            return
+        if channel.get_queue() is None and channel.get_sound() is self._next_sound:
+            # La traccia accodata è partita
+            self._current_sound = self._next_sound
+            self.current_track = self._next[0]
+            self._current_started_ms = now
+            self._next = None
+            self._next_sound = None
+            self._prefetch_following()
+
+    def _prefetch_following(self) -> None:
+        """Prefetcha la traccia dopo quella appena partita."""
+        track = self._following_track()
+        if track is None:
+            return
+        self._playlist_pos = (self._playlist_pos + 1) % len(self._playlist)
+        self._prefetch(track)
+
+    def _update_crossfade(self, now: int) -> None:
+        """Aggiorna i volumi durante il crossfade."""
+        assert self._channels is not None and self._xfade_started_ms is not None
+        progress = min(1.0, (now - self._xfade_started_ms) / max(1, self.crossfade_ms))
+        incoming = self._channels[self._active]
+        outgoing = self._channels[1 - self._active]
+        incoming.set_volume(self.volume * progress)
+        outgoing.set_volume(self.volume * (1.0 - progress))
+        if progress >= 1.0:
+            outgoing.stop()
+            self._xfade_started_ms = None
+
+    def _stop_playlist(self) -> None:
+        """Ferma la playlist e libera i canali."""
+        if self._channels is not None:
+            for channel in self._channels:
+                channel.stop()
+        self._channels = None
+        self._current_sound = None
+        self._next = None
+        self._next_sound = None
+        self._next_queued = False
+        self._xfade_started_ms = None
+
+    # ------------------------------------------------------------------
+    # Controlli
+    # ------------------------------------------------------------------
 
     def stop(self) -> None:
         """Ferma la musica."""
+        self._stop_playlist()
         pygame.mixer.music.stop()
 
+    def shutdown(self) -> None:
+        """Ferma il worker di decodifica (senza attendere la traccia in corso)."""
+        if self._decoder is not None:
+            self._decoder.shutdown(wait=False, cancel_futures=True)
+            self._decoder = None
+        self._next = None
+        self._next_sound = None
+
     def pause(self) -> None:
         """Mette in pausa la musica."""
         pygame.mixer.music.pause()
+        if self._channels is not None:
+            for channel in self._channels:
+                channel.pause()
 
     def unpause(self) -> None:
         """Riprende la musica."""
         pygame.mixer.music.unpause()
+        if self._channels is not None:
+            for channel in self._channels:
+                channel.unpause()
 
     def set_volume(self, volume: float) -> None:
         """Imposta il volume (0.0 - 1.0)."""
         self.volume = max(0.0, min(1.0, volume))
         pygame.mixer.music.set_volume(self.volume)
+        if self._channels is not None and self._xfade_started_ms is None:
+            self._channels[self._active].set_volume(self.volume)
 
     def fade_out(self, duration_ms: Optional[int] = None) -> None:
         """Sfuma la musica in uscita."""
-        if not self.is_playing:
+        if not self.is_playing or self._fading_out:
             return
-        
+
         fade_time = duration_ms or self.fade_duration
         pygame.mixer.music.fadeout(fade_time)
+        if self._channels is not None:
+            self._fading_out = True
+            for channel in self._channels:
+                channel.fadeout(fade_time)
 
     def fade_out_if_in_state(self, allowed_states: tuple[str, ...], duration_ms: Optional[int] = None) -> None:
         """Sfuma la musica solo se si è in uno degli stati specificati."""
         try:
             if not self._state_machine:
                 return
-            
+
             current_state = self._state_machine.get_current_state_name()
             if current_state not in allowed_states:
                 return
-            
+
             self.fade_out(duration_ms)
         except Exception as e:
             print(f"⚠ Error fade music: {e}")
@@ -86,4 +307,8 @@ class MusicManager:
     @property
     def is_playing(self) -> bool:
         """Ritorna True se la musica sta suonando."""
-        return pygame.mixer.music.get_busy()
+        if pygame.mixer.music.get_busy():
+            return True
+        if self._channels is not None:
+            return any(channel.get_busy() for channel in self._channels)
+        return False
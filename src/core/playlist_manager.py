@@ -0,0 +1,107 @@
+"""
+Playlist Manager - Più testi di fila per lo stesso partecipante, con prefetch.
+"""
+import os
+from typing import List, Optional
+
+from src.core.loading_manager import LoadingManager, LoadJob
+from src.utils.stimulus_library import LIBRARY_EXTENSIONS
+
+
+class PlaylistManager:
+    """Coda di file stimolo presentati uno dopo l'altro.
+
+    Mentre un testo è in presentazione, il successivo viene letto, hashato
+    e tokenizzato per intero in un worker (prefetch_next), così il passaggio
+    al file seguente non ha pause di caricamento. poll() va chiamato a ogni
+    frame; take_next() non attende mai il worker.
+    """
+
+    def __init__(self):
+        self.paths: List[str] = []
+        # Indice del file in presentazione (-1 = playlist non avviata)
+        self.position: int = -1
+        self._prefetch = LoadingManager()
+        self._ready: Optional[LoadJob] = None
+
+    @property
+    def is_active(self) -> bool:
+        return 0 <= self.position < len(self.paths)
+
+    @property
+    def next_path(self) -> Optional[str]:
+        index = self.position + 1
+        return self.paths[index] if self.is_active and index < len(self.paths) else None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_path is not None
+
+    @property
+    def next_ready(self) -> bool:
+        """Il file successivo è già caricato (o il suo caricamento è fallito)."""
+        path = self.next_path
+        return path is not None and self._ready is not None and self._ready.path == path
+
+    def add(self, path: str) -> None:
+        """Accoda un file (non avvia la playlist)."""
+        self.paths.append(path)
+
+    def add_folder(self, folder: str) -> int:
+        """Accoda i testi di una cartella in ordine alfabetico. Ritorna quanti."""
+        names = sorted(
+            name for name in os.listdir(folder)
+            if name.lower().endswith(LIBRARY_EXTENSIONS) and not name.startswith(".")
+        )
+        for name in names:
+            self.add(os.path.join(folder, name))
+        return len(names)
+
+    def start(self) -> Optional[str]:
+        """Avvia la playlist: ritorna il primo file (da caricare normalmente)."""
+        if not self.paths:
+            return None
+        self.position = 0
+        self._ready = None
+        return self.paths[0]
+
+    def prefetch_next(self) -> None:
+        """Carica in background il file successivo a quello corrente."""
+        path = self.next_path
+        if path is None or (self._prefetch.job is not None and self._prefetch.job.path == path):
+            return
+        self._ready = None
+        self._prefetch.start(path, stream=False)
+
+    def poll(self) -> None:
+        """Raccoglie il prefetch concluso."""
+        job = self._prefetch.poll()
+        if job is not None:
+            self._ready = job
+
+    def take_next(self) -> Optional[LoadJob]:
+        """Passa al file successivo e ne ritorna il job di caricamento.
+
+        None a fine playlist, o se il prefetch non è ancora finito: in quel
+        caso la playlist resta sul file corrente (has_next è ancora True) e
+        take_next va richiamato a un frame successivo.
+        """
+        self.poll()
+        if not self.next_ready:
+            self.prefetch_next()
+            return None
+        job = self._ready
+        self._ready = None
+        self.position += 1
+        return job
+
+    def clear(self) -> None:
+        """Svuota la playlist e annulla il prefetch."""
+        self._prefetch.cancel()
+        self.paths = []
+        self.position = -1
+        self._ready = None
+
+    def shutdown(self) -> None:
+        self.clear()
+        self._prefetch.shutdown()
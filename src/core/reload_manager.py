@@ -0,0 +1,86 @@
+"""
+Reload Manager - Ricarica il file stimolo quando viene modificato su disco.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+import os
+from typing import Optional
+
+from src.core.config import config
+from src.core.word_manager import WordManager
+from src.loaders.file_loader import FileLoader, ReloadedFile
+from src.utils.compiled_corpus import COMPILED_EXTENSION
+from src.utils.corpus import Corpus
+
+
+class ReloadManager:
+    """Controlla size/mtime del file selezionato e lo ricarica se cambia.
+
+    Lettura, hash e ritokenizzazione del solo tratto modificato
+    (Corpus.splice) girano in un worker; poll() va chiamato a ogni frame
+    e ritorna il file ricaricato da applicare sul main thread. Attivo solo
+    con config.reload.enabled. I corpus compilati non vengono osservati.
+    """
+
+    def __init__(self):
+        self._worker: Optional[ThreadPoolExecutor] = None
+        self._job: Optional[Future] = None
+        # Corpus su cui lavora il job (scartato se nel frattempo cambia file)
+        self._corpus: Optional[Corpus] = None
+        self._path: Optional[str] = None
+        self._seen: Optional[tuple[int, int]] = None
+        self._next_poll_ms = 0
+
+    @property
+    def is_reloading(self) -> bool:
+        return self._job is not None
+
+    def poll(self, now_ms: int, path, words: WordManager) -> Optional[ReloadedFile]:
+        """Avvia o raccoglie un ricaricamento di `path` (il file di `words`)."""
+        if self._job is not None:
+            if not self._job.done():
+                return None
+            job, self._job = self._job, None
+            try:
+                result = job.result()
+            except Exception as e:
+                print(f"  ⚠ Ricaricamento fallito: {e}")
+                return None
+            if result is None or self._corpus is not words.corpus:
+                return None
+            return result
+
+        if not config.reload.enabled or path is None or now_ms < self._next_poll_ms:
+            return None
+        meta = words.file_metadata
+        if not words.file_loaded or words.is_streaming or meta is None:
+            return None
+        path = str(path)
+        if path.lower().endswith(COMPILED_EXTENSION):
+            return None
+        self._next_poll_ms = now_ms + config.reload.poll_interval_ms
+
+        if path != self._path:
+            # Nuovo file: il riferimento è lo stato al caricamento
+            self._path = path
+            self._seen = (meta.size_bytes, meta.mtime_ns)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None  # in salvataggio o spostato: si riprova al prossimo giro
+        stamp = (st.st_size, st.st_mtime_ns)
+        if stamp == self._seen:
+            return None
+        self._seen = stamp
+
+        if self._worker is None:
+            self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="file-reload")
+        self._corpus = words.corpus
+        self._job = self._worker.submit(FileLoader.reload, path, words.corpus, meta.sha256)
+        return None
+
+    def shutdown(self) -> None:
+        """Ferma il worker (senza attendere il ricaricamento in corso)."""
+        if self._worker is not None:
+            self._worker.shutdown(wait=False, cancel_futures=True)
+            self._worker = None
+        self._job = None
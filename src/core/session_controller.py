@@ -2,6 +2,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 from src.core.GameContext import GameContext
+from src.loaders.file_loader import FileMetadata
+from src.logging.session_logger import SessionData, SessionLogger
 from typing import Optional
 import uuid
 
@@ -10,11 +12,24 @@ class SessionController:
     context: GameContext
 
     #=================== FILE =====================================================
-    def set_file_selected(self, file_path: Path) -> None:
-        """Set the selected stimulus/source file and snapshot its metadata into SessionData."""
+    def set_file_selected(self, file_path: Path, metadata: Optional[FileMetadata] = None) -> None:
+        """Set the selected stimulus/source file and snapshot its metadata into SessionData.
+
+        `metadata` comes from FileLoader.ingest; when given, the file is not read again.
+        """
         self.context.selected_file_path = file_path
-        self.context.session.set_input_file(file_path, assets_root=self.context.assets_root)
+        self.context.session.set_input_file(
+            file_path,
+            assets_root=self.context.assets_root,
+            file_hash=metadata.sha256 if metadata else None,
+            file_size=metadata.size_bytes if metadata else None,
+        )
     
+    def set_source_selected(self, name: str) -> None:
+        """Set a generated stimulus source (list, pseudowords) as the session input."""
+        self.context.selected_file_path = Path(name)
+        self.context.session.set_input_source(name)
+
     #=================== PARTICIPANT ================================================
     def attach_new_user(self, name: str) -> None:
         self.context.session.attach_participant(participant_code=name, 
@@ -39,19 +54,52 @@ class SessionController:
         self.context.logger.start_session(session_id=sid, started_at_ms=now_ms)
         return sid
     
+    def record_file_reload(self, metadata: FileMetadata, now_ms: int) -> None:
+        """Record that the stimulus file was edited during the session and take its new hash.
+
+        Events logged before the reload refer to the previous content; the
+        reloads (with the trial they happened at) are kept in the settings snapshot.
+        """
+        session = self.context.session
+        reloads = list((session.setting_snapshot or {}).get("file_reloads", []))
+        reloads.append({
+            "at_ms": now_ms,
+            "trial_index": self.context.logger.trial_index(),
+            "previous_sha256": session.input_file_hash,
+            "sha256": metadata.sha256,
+        })
+        self.record_settings({"file_reloads": reloads})
+        session.input_file_hash = metadata.sha256
+        session.input_file_size_bytes = metadata.size_bytes
+
+    def record_settings(self, settings: dict) -> None:
+        """Merge presentation settings (e.g. order and seed) into the session snapshot."""
+        snapshot = dict(self.context.session.setting_snapshot or {})
+        snapshot.update(settings)
+        self.context.session.setting_snapshot = snapshot
+
     def end_session(self, now_ms:int) -> None:
         self.context.logger.end_session(ended_at_ms=now_ms)
     
     # ==================== EXPORT ======================================
     def export_all(self) -> dict[str, Path]:
+        """Export the current session and, in a playlist, the ones of the previous files."""
         out_dir = self.context.output_dir.expanduser()
         out_dir.mkdir(parents=True, exist_ok=True)
 
-        csv_words, csv_pauses, csv_summary = self.context.logger.export_csv(
+        results: dict[str, Path] = {}
+        for n, session in enumerate(self.context.finished_sessions, start=1):
+            paths = self._export_session(session, SessionLogger(session), out_dir)
+            results.update({f"file_{n}_{key}": path for key, path in paths.items()})
+        results.update(self._export_session(self.context.session, self.context.logger, out_dir))
+        return results
+
+    def _export_session(self, session: SessionData, logger: SessionLogger, out_dir: Path) -> dict[str, Path]:
+        csv_words, csv_pauses, csv_summary = logger.export_csv(
             out_dir, include_display_name=self.context.include_display_name
         )
-        json_path = out_dir / f"{self.context.session.date_local}_session-{self.context.session.session_id}.json"
-        self.context.logger.export_json(json_path)
+        json_path = out_dir / f"{session.date_local}_session-{session.session_id}.json"
+        logger.export_json(json_path)
 
         return {
             "word_events_csv": csv_words,
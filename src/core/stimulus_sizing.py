@@ -0,0 +1,168 @@
+"""
+Stimulus Sizing - Misura delle parole e dimensione del font di ogni stimolo.
+"""
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional
+
+from src.core.config import config
+from src.core.layout_manager import LayoutManager
+from src.utils.corpus import Corpus
+
+# Forme delle sorgenti di stimoli ricordate (le sorgenti possono non finire mai)
+SOURCE_FORM_CACHE = 1024
+
+
+class TextMetrics:
+    """Larghezze in pixel delle parole per classe di dimensione degli stimoli.
+
+    Ogni parola distinta viene misurata (Font.size) una volta per classe,
+    e solo nelle classi che servono. Le misure valgono finché il
+    LayoutManager non ricrea i font (fonts_version). Con memo=False la
+    parola viene misurata senza essere ricordata (stimoli da sorgenti).
+    """
+
+    def __init__(self, layout: LayoutManager):
+        self.layout = layout
+        self.version = -1
+        self._widths: List[Dict[str, int]] = []
+        self._spaces: List[int] = []
+
+    @property
+    def class_count(self) -> int:
+        return len(self.layout.stimulus_fonts)
+
+    def sync(self) -> int:
+        """Scarta le misure se i font sono cambiati. Ritorna la versione dei font."""
+        if self.version != self.layout.fonts_version:
+            self.version = self.layout.fonts_version
+            self._widths = [{} for _ in self.layout.stimulus_fonts]
+            self._spaces = [font.size(" ")[0] for font in self.layout.stimulus_fonts]
+        return self.version
+
+    def width(self, size_class: int, word: str, memo: bool = True) -> int:
+        widths = self._widths[size_class]
+        width = widths.get(word)
+        if width is None:
+            width = self.layout.stimulus_fonts[size_class].size(word)[0]
+            if memo:
+                widths[word] = width
+        return width
+
+    def widths(self, size_class: int, words: List[str]) -> List[int]:
+        return [self.width(size_class, word) for word in words]
+
+    def space_width(self, size_class: int) -> int:
+        return self._spaces[size_class]
+
+    def fit_class(self, word: str, max_width: int, memo: bool = True) -> int:
+        """Classe più grande in cui `word` è larga al massimo `max_width` (l'ultima se nessuna)."""
+        last = self.class_count - 1
+        for size_class in range(last):
+            if self.width(size_class, word, memo) <= max_width:
+                return size_class
+        return max(0, last)
+
+
+class StimulusSizing:
+    """Classe di dimensione del font di ogni parola del corpus (la più grande che entra).
+
+    prepare() la calcola al caricamento per tutte le parole: le forme
+    distinte vengono misurate una volta sola e l'array per parola
+    (un byte ciascuna) è riempito da un dizionario forma -> classe. Durante
+    lo streaming l'array si estende alle parole nuove; se cambiano i font
+    o la larghezza della finestra si rimisurano solo le forme distinte.
+    A ogni frame resta solo una lettura dell'array.
+
+    Le parole delle sorgenti di stimoli (form_class) non fanno parte di un
+    corpus e il loro flusso può non finire: ne restano in memoria solo le
+    ultime SOURCE_FORM_CACHE, in una cache LRU, e non vengono memorizzate
+    in TextMetrics.
+    """
+
+    def __init__(self, metrics: TextMetrics):
+        self.metrics = metrics
+        self.corpus: Optional[Corpus] = None
+        self.size_classes = array("B")
+        self._form_classes: Dict[str, int] = {}
+        # Forma -> (classe, larghezza) delle parole delle sorgenti, dalla meno recente
+        self._source_forms: "OrderedDict[str, tuple[int, int]]" = OrderedDict()
+        self._key: tuple[int, int] = (-1, -1)
+
+    @staticmethod
+    def max_width(width: int) -> int:
+        return max(1, int(width * config.font.stimulus_max_width_ratio))
+
+    def _sync(self, width: int) -> int:
+        max_width = self.max_width(width)
+        key = (self.metrics.sync(), max_width)
+        if key != self._key:
+            self._key = key
+            self._form_classes = {}
+            self._source_forms.clear()
+            self.size_classes = array("B")
+        return max_width
+
+    def form_class(self, word: str, width: int) -> int:
+        """Classe di una parola qualsiasi (es. da una sorgente di stimoli)."""
+        return self._source_form(word, width)[0]
+
+    def form_width(self, word: str, width: int) -> int:
+        """Larghezza in pixel di una parola qualsiasi, nella sua classe."""
+        return self._source_form(word, width)[1]
+
+    def _source_form(self, word: str, width: int) -> tuple[int, int]:
+        max_width = self._sync(width)
+        size_class = self._form_classes.get(word)
+        if size_class is not None:
+            return size_class, self.metrics.width(size_class, word)
+        forms = self._source_forms
+        form = forms.get(word)
+        if form is not None:
+            forms.move_to_end(word)
+            return form
+        size_class = self.metrics.fit_class(word, max_width, memo=False)
+        form = forms[word] = (size_class, self.metrics.width(size_class, word, memo=False))
+        if len(forms) > SOURCE_FORM_CACHE:
+            forms.popitem(last=False)
+        return form
+
+    def prepare(self, corpus: Corpus, width: int) -> array:
+        """Classi delle parole di `corpus` per una finestra larga `width` (solo quelle mancanti)."""
+        max_width = self._sync(width)
+        if corpus is not self.corpus:
+            self.corpus = corpus
+            self.size_classes = array("B")
+        done, total = len(self.size_classes), corpus.word_count
+        if done < total:
+            forms, fit = self._form_classes, self.metrics.fit_class
+
+            def form_class(word: str) -> int:
+                size_class = forms.get(word)
+                if size_class is None:
+                    size_class = forms[word] = fit(word, max_width)
+                return size_class
+
+            words = corpus.words[done:total] if done else corpus.iter_words()
+            self.size_classes.extend(map(form_class, words))
+        return self.size_classes
+
+    def form_widths(self) -> Iterator[tuple[int, int]]:
+        """(classe, larghezza in pixel) di ogni forma distinta del corpus e di quelle delle sorgenti ricordate."""
+        width = self.metrics.width
+        for form, size_class in self._form_classes.items():
+            yield size_class, width(size_class, form)
+        yield from self._source_forms.values()
+
+    def size_class(self, words, width: int) -> int:
+        """Classe della parola corrente di un WordManager."""
+        if not words.word_count:
+            return 0
+        if words.stimuli is not None:
+            return self.form_class(words.current_word, width)
+        classes = self.size_classes
+        index = words.current_index
+        if (words.corpus is not self.corpus or index >= len(classes)
+                or self._key != (self.metrics.sync(), self.max_width(width))):
+            classes = self.prepare(words.corpus, width)
+        return classes[index] if index < len(classes) else 0
@@ -1,10 +1,25 @@
 """
 Word Manager - Gestione parole, frasi e file di testo.
 """
-from typing import List, Optional
+from array import array
+from contextlib import contextmanager
+from typing import Iterator, Optional, Sequence
 
-from src.loaders.file_loader import FileLoader, LoadedText
-from src.utils.text import mask_word
+from src.core.config import config
+from src.loaders.file_loader import FileLoader, FileMetadata, IngestedFile, LoadedText, TextStream
+from src.loaders.stimulus_source import StimulusBuffer, StimulusSource
+from src.utils.chunks import ChunkPlan, make_chunk_plan
+from src.utils.corpus import Corpus, CorpusSplice
+from src.utils.presentation_order import FilteredOrder, PresentationOrder, make_order
+from src.utils.text import MaskStyle, TextChunk, get_mask_style
+from src.utils.word_features import WordFeatures, get_word_filter
+
+# Parole per blocco durante il caricamento in streaming
+STREAM_CHUNK_WORDS = 2048
+# Stream lazy (libri): parole da tenere pronte oltre quella corrente
+LAZY_LOOKAHEAD_WORDS = 2 * STREAM_CHUNK_WORDS
+# Sorgenti di stimoli: stimoli letti al massimo per frame
+SOURCE_PULL_PER_FRAME = 16
 
 
 class WordManager:
@@ -14,19 +29,100 @@ class WordManager:
         # File state
         self.file_loaded = False
         self.file_name: Optional[str] = None
+        self.file_metadata: Optional[FileMetadata] = None  # dal caricamento (hash incluso)
         
-        # Word data
-        self.words: List[str] = []
-        self.word_count: int = 0
+        # Word/phrase data (spans su un unico buffer di testo)
+        self.corpus = Corpus()
         self.current_index: int = 0
-        self.current_word: str = ""
-        self.masked_word: str = ""
-        
-        # Phrase data
-        self.phrases: List[str] = []
         self.phrase_index: int = 0
-        self.phrase_count: int = 0
-        self.word_to_phrase_map: List[int] = []
+        # Frase da cui parte la sessione (0 = inizio del testo)
+        self.start_phrase: int = 0
+        # Ordine di presentazione (permutazione sugli indici del corpus)
+        self.order: PresentationOrder = PresentationOrder()
+        self.order_position: int = 0
+        # Presentazione a gruppi di parole (None = una parola alla volta)
+        self.chunks: Optional[ChunkPlan] = None
+        self.mask_style: MaskStyle = get_mask_style(config.mask.style)
+        # Tabella delle caratteristiche delle parole (calcolata al primo uso)
+        self._features: Optional[WordFeatures] = None
+        self._masked_cache: tuple[int, str] = (-1, "")
+
+        # Streaming (blocchi ancora da tokenizzare)
+        self._stream: Optional[Iterator[TextChunk]] = None
+        # Sorgente di stimoli (load_source): finestra limitata al posto del corpus
+        self.stimuli: Optional[StimulusBuffer] = None
+
+    @property
+    def words(self) -> Sequence[str]:
+        if self.stimuli is not None:
+            return self.stimuli
+        return self.corpus.words
+
+    @property
+    def word_count(self) -> int:
+        if self.stimuli is not None:
+            return len(self.stimuli)
+        return self.corpus.word_count
+
+    @property
+    def phrases(self) -> Sequence[str]:
+        return self.corpus.phrases
+
+    @property
+    def phrase_count(self) -> int:
+        if self.stimuli is not None:
+            return self.stimuli.phrase_total
+        return self.corpus.phrases_total
+
+    @property
+    def word_to_phrase_map(self) -> array:
+        return self.corpus.word_to_phrase_map
+
+    @property
+    def current_word(self) -> str:
+        """Parola (o gruppo di parole) corrente, materializzata dal buffer solo quando serve."""
+        if not self.word_count:
+            return ""
+        if self.chunks is not None:
+            return self.chunks.text(self.current_chunk)
+        return self.words[self.current_index]
+
+    @property
+    def current_chunk(self) -> int:
+        """Gruppo di parole corrente (-1 se si presenta una parola alla volta)."""
+        if self.chunks is None:
+            return -1
+        return self.chunks.chunk_of(self.current_index)
+
+    @property
+    def current_stimulus_type(self) -> str:
+        """Tipo dello stimolo corrente (valore di StimulusType)."""
+        if self.chunks is not None:
+            return self.chunks.stimulus_type
+        if self.stimuli is not None and self.word_count:
+            return self.stimuli.item(self.current_index).stimulus_type
+        return "word"
+
+    @property
+    def masked_word(self) -> str:
+        """Maschera della parola corrente (precalcolata dal corpus al caricamento)."""
+        if not self.word_count:
+            return ""
+        index, masked = self._masked_cache
+        if index != self.current_index:
+            if self.chunks is not None:
+                masked = " ".join(self.chunks.masks(self.current_chunk))
+            elif self.stimuli is not None:
+                masked = self.mask_style.apply(self.current_word)
+            else:
+                masked = self.corpus.mask(self.current_index)
+            self._masked_cache = (self.current_index, masked)
+        return masked
+
+    @property
+    def file_hash(self) -> Optional[str]:
+        """SHA-256 del file caricato."""
+        return self.file_metadata.sha256 if self.file_metadata else None
 
     @property
     def has_words(self) -> bool:
@@ -34,65 +130,400 @@ class WordManager:
 
     @property
     def is_at_start(self) -> bool:
-        return self.current_index == 0
+        return self.order_position == 0
+
+    @property
+    def order_size(self) -> int:
+        """Parole da presentare (tutte, o solo quelle selezionate da un filtro)."""
+        return self.order.size(len(self.words))
 
     @property
     def is_at_end(self) -> bool:
-        return self.current_index >= len(self.words) - 1
+        return self.order_position + self._step() >= self.order_size and not self.is_streaming
+
+    @property
+    def next_chunk(self) -> int:
+        """Gruppo che verrà mostrato dopo quello corrente (-1 se non ce n'è)."""
+        if self.chunks is None:
+            return -1
+        position = self.order_position + self._step()
+        if position >= self.order_size:
+            return -1
+        return self.chunks.chunk_of(self.order.index_at(position))
+
+    def _step(self) -> int:
+        """Posizioni occupate dallo stimolo corrente (le parole del gruppo, o 1)."""
+        if self.chunks is None:
+            return 1
+        return self.chunks.word_range(self.current_chunk)[1] - self.current_index
+
+    @property
+    def features(self) -> WordFeatures:
+        """Lunghezza, sillabe, rango di frequenza e posizione nella frase di ogni parola.
+
+        Calcolata una volta per corpus (completa lo stream ancora aperto).
+        Non disponibile per le sorgenti di stimoli (ValueError).
+        """
+        if self.stimuli is not None:
+            raise ValueError("Caratteristiche delle parole non disponibili per una sorgente di stimoli")
+        while self.pump(8):
+            pass
+        if self._features is None or self._features.corpus is not self.corpus:
+            self._features = WordFeatures(self.corpus)
+        return self._features
+
+    @property
+    def is_streaming(self) -> bool:
+        """True finché il file è ancora in fase di tokenizzazione (o la sorgente ha altri stimoli)."""
+        if self.stimuli is not None:
+            return not self.stimuli.exhausted
+        return self._stream is not None
 
-    def load_txt(self, file_path: str) -> List[str]:
+    def load_source(self, source: StimulusSource) -> Sequence[str]:
+        """Presenta gli stimoli di una sorgente (vedi src.loaders.stimulus_source).
+
+        Gli stimoli vengono letti man mano, con una finestra limitata
+        (config.source: lookahead e storia), quindi anche una sorgente
+        illimitata occupa memoria costante. Ordini e filtri non sono
+        disponibili: la presentazione segue la sorgente.
+        """
+        self.reset()
+        self.stimuli = StimulusBuffer(source, config.source.lookahead, config.source.history)
+        self.file_name = source.name
+        if self.stimuli.ensure(0):
+            self.file_loaded = True
+            self.set_index(0)
+        return self.words
+
+    def load_txt(self, file_path: str) -> Sequence[str]:
         """Carica parole da un file di testo."""
-        loaded = FileLoader.load_txt(file_path)
-        self._apply_loaded_text(loaded)
+        self.apply_ingested(FileLoader.ingest(file_path))
         return self.words
 
-    def load_docx(self, file_path: str) -> List[str]:
+    def load_txt_stream(self, file_path: str, chunk_size: int = STREAM_CHUNK_WORDS) -> Sequence[str]:
+        """Carica il primo blocco di parole; il resto arriva in background con pump().
+
+        Se il file è nella parse cache viene caricato subito per intero.
+        """
+        self.apply_ingested(FileLoader.ingest(file_path, stream_chunk_size=chunk_size))
+        if not self.words:
+            raise ValueError("Il file è vuoto")
+        return self.words
+
+    def load_docx(self, file_path: str) -> Sequence[str]:
         """Carica parole da un documento Word."""
-        loaded = FileLoader.load_docx(file_path)
-        self._apply_loaded_text(loaded)
+        self.apply_ingested(FileLoader.ingest(file_path))
         return self.words
 
+    def load_compiled(self, file_path: str) -> Sequence[str]:
+        """Carica un corpus compilato (.tscorpus) mappandolo in memoria."""
+        self.apply_ingested(FileLoader.ingest(file_path))
+        return self.words
+
+    def apply_ingested(self, ingested: IngestedFile) -> None:
+        """Applica un file letto da FileLoader.ingest (completo o in streaming)."""
+        if ingested.stream is not None:
+            self._begin_stream(ingested.stream)
+        else:
+            self._apply_loaded_text(ingested.loaded)
+        self.file_metadata = ingested.metadata
+
+    def apply_reload(self, corpus: Corpus, splice: CorpusSplice, metadata: FileMetadata) -> None:
+        """Sostituisce il corpus con quello del file modificato, restando sulla stessa parola.
+
+        `splice` (da Corpus.splice) riporta l'indice corrente nel nuovo corpus;
+        l'ordine di presentazione (con l'eventuale filtro) viene ricostruito con lo
+        stesso seed, i gruppi di parole sul nuovo testo.
+        """
+        index = splice.remap(self.current_index)
+        order, chunks = self.order, self.chunks
+        self.chunks = None
+        self.corpus = corpus
+        self.file_metadata = metadata
+        self._masked_cache = (-1, "")
+        self.order = PresentationOrder()
+        if self.words:
+            self.set_index(index)
+            try:
+                self.set_order(order.name, order.seed, getattr(order, "filter_name", ""))
+            except ValueError:
+                # Il filtro non seleziona più nessuna parola: si presentano tutte
+                self.set_order(order.name, order.seed)
+            if chunks is not None:
+                self.set_chunking(chunks.mode, chunks.size)
+        else:
+            self._clear_current()
+
+    def set_mask_style(self, style: MaskStyle) -> None:
+        """Cambia lo stile delle maschere (ricalcolate una volta per tutto il testo)."""
+        self.mask_style = style
+        self.corpus.set_mask_style(style)
+        self._masked_cache = (-1, "")
+
     def _apply_loaded_text(self, loaded: LoadedText) -> None:
         """Applica i dati caricati allo stato."""
-        self.words = loaded.words
-        self.word_to_phrase_map = loaded.word_to_phrase_map
-        self.phrases = loaded.phrases_list
-        self.phrase_count = loaded.phrases_total
-        self.word_count = len(self.words)
+        self._close_stream()
+        self.corpus = loaded.corpus
+        self.corpus.set_mask_style(self.mask_style)
+        self._masked_cache = (-1, "")
+        self.start_phrase = 0
+        self.order = PresentationOrder()
+        self.chunks = None
+
+        if self.words:
+            self.set_index(0)
+        else:
+            self._clear_current()
+
+    def _begin_stream(self, chunks: Iterator[TextChunk]) -> None:
+        """Avvia lo streaming applicando subito il primo blocco."""
+        self._close_stream()
+        self.corpus = Corpus(self.mask_style)
+        self._masked_cache = (-1, "")
+        self.start_phrase = 0
+        self.order = PresentationOrder()
+        self.chunks = None
+        self._stream = chunks
+        self._append_chunk(next(chunks))
 
         if self.words:
             self.set_index(0)
         else:
             self._clear_current()
 
+    def pump(self, max_chunks: int = 1) -> bool:
+        """Tokenizza fino a `max_chunks` blocchi. Ritorna True se lo stream continua."""
+        if self.stimuli is not None:
+            # Mai oltre il lookahead: la finestra deve tenere la parola corrente
+            return self.stimuli.fill(self.current_index, max_chunks * STREAM_CHUNK_WORDS)
+        for _ in range(max_chunks):
+            if self._stream is None:
+                break
+            try:
+                chunk = next(self._stream)
+            except StopIteration:
+                self._stream = None
+                break
+            except Exception as e:
+                # Errore a metà file: si tengono le parole già caricate
+                print(f"  ⚠ Caricamento interrotto: {e}")
+                self._close_stream()
+                break
+            self._append_chunk(chunk)
+        return self._stream is not None
+
+    def pump_ahead(self) -> bool:
+        """Avanzamento in background (a ogni frame).
+
+        Gli stream lazy (EPUB) si tokenizzano solo quando la parola
+        corrente si avvicina alla fine di quanto già caricato.
+        """
+        if self.stimuli is not None:
+            # Sorgente: solo il lookahead, a piccoli passi
+            return self.stimuli.fill(self.current_index, SOURCE_PULL_PER_FRAME)
+        lazy = getattr(self._stream, "lazy", False)
+        if lazy and self.current_index + LAZY_LOOKAHEAD_WORDS < len(self.words):
+            return True
+        return self.pump()
+
+    def ensure_index(self, index: int) -> bool:
+        """Tokenizza finché `index` è disponibile. Ritorna True se esiste."""
+        if self.stimuli is not None:
+            return self.stimuli.ensure(index)
+        while index >= len(self.words) and self.pump():
+            pass
+        return 0 <= index < len(self.words)
+
+    def _append_chunk(self, chunk: TextChunk) -> None:
+        """Accoda un blocco tokenizzato allo stato."""
+        self.corpus.append_chunk(chunk)
+
+        if chunk.is_last:
+            # Il corpus applica il clamp finale della mappa frasi
+            if isinstance(self._stream, TextStream):
+                FileLoader.cache_stream(self._stream, self.corpus)
+            self._close_stream()
+            self._sync_phrase_index()
+
+    def _close_stream(self) -> None:
+        """Chiude lo stream corrente e la sorgente di stimoli (se presenti)."""
+        if self.stimuli is not None:
+            self.stimuli.close()
+            self.stimuli = None
+        stream = self._stream
+        self._stream = None
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+
     def set_index(self, index: int) -> None:
         """Imposta l'indice corrente (con clamp)."""
         if not self.words:
             return
 
+        if self.stimuli is not None:
+            self.stimuli.ensure(index)
         index = max(0, min(index, len(self.words) - 1))
-        self.current_index = index
-        self.current_word = self.words[index]
-        self.masked_word = mask_word(self.current_word)
+        if self.chunks is not None:
+            # A gruppi si parte sempre dalla prima parola del gruppo
+            index = self.chunks.word_range(self.chunks.chunk_of(index))[0]
+        self.order_position = self.order.position_of(index)
+        # Con un filtro la parola può non essere selezionata: si va alla successiva che lo è
+        self.current_index = self.order.index_at(self.order_position)
+        self._sync_phrase_index()
+
+    def _set_position(self, position: int) -> None:
+        """Va alla parola mostrata in `position` nell'ordine di presentazione."""
+        self.order_position = position
+        self.current_index = self.order.index_at(position)
         self._sync_phrase_index()
 
     def go_next(self) -> bool:
-        """Avanza alla parola successiva. Ritorna True se avanzato."""
-        if self.is_at_end:
+        """Avanza alla parola successiva (nell'ordine di presentazione). Ritorna True se avanzato."""
+        # Le posizioni vanno da 0 a order_size - 1 (word_count senza filtro);
+        # a gruppi si salta alla prima parola del gruppo successivo
+        position = self.order_position + self._step()
+        if not self.ensure_index(position) or (not self.is_streaming and position >= self.order_size):
             return False
-        self.set_index(self.current_index + 1)
+        self._set_position(position)
         return True
 
+    @contextmanager
+    def peek_next(self) -> Iterator[bool]:
+        """Passa temporaneamente allo stimolo successivo (es. per comporne il fotogramma in anticipo).
+
+        Restituisce True se lo stimolo successivo è già disponibile: a
+        differenza di go_next non tokenizza lo stream e non legge dalla
+        sorgente. All'uscita si torna alla parola corrente.
+        """
+        saved = (self.current_index, self.order_position, self.phrase_index)
+        position = self.order_position + self._step()
+        # Durante lo streaming l'ordine è sequenziale (posizione = indice)
+        available = position < (len(self.words) if self.is_streaming else self.order_size)
+        try:
+            if available:
+                self._set_position(position)
+            yield available
+        finally:
+            self.current_index, self.order_position, self.phrase_index = saved
+
     def go_previous(self) -> bool:
         """Torna alla parola precedente. Ritorna True se tornato."""
         if self.is_at_start:
             return False
-        self.set_index(self.current_index - 1)
+        if self.chunks is not None:
+            # Ultima parola del gruppo precedente: set_index va all'inizio del gruppo
+            self.set_index(self.order.index_at(self.order_position - 1))
+            return True
+        self._set_position(self.order_position - 1)
+        return True
+
+    def set_order(self, name: str, seed: Optional[int] = None, word_filter: str = "") -> PresentationOrder:
+        """Imposta l'ordine di presentazione (vedi src.utils.presentation_order).
+
+        Gli ordini diversi da quello sequenziale e i filtri (`word_filter`,
+        vedi src.utils.word_features.WORD_FILTERS) richiedono il testo intero:
+        lo stream ancora aperto viene completato. Parole, maschere e mappa
+        delle frasi non vengono copiate. Solleva ValueError se il nome o il
+        filtro non sono validi, se il filtro non seleziona nessuna parola o
+        se gli stimoli vengono da una sorgente (solo ordine sequenziale).
+        """
+        selection = get_word_filter(word_filter)
+        if self.stimuli is not None and (name != "sequential" or selection is not None):
+            raise ValueError("Una sorgente di stimoli si presenta solo in ordine sequenziale")
+        if name != "sequential" or selection is not None:
+            while self.pump(8):
+                pass
+        order = make_order(name, self.corpus, seed)
+        if selection is not None:
+            indices = selection.apply(self.features)
+            if not indices:
+                raise ValueError(f"Nessuna parola selezionata dal filtro {word_filter!r}")
+            order = FilteredOrder(order, indices, word_filter)
+        self.order = order
+        if self.words:
+            self.set_index(self.current_index)
+        return order
+
+    def set_chunking(self, mode: str, size: int = 3) -> Optional[ChunkPlan]:
+        """Presenta gruppi di parole invece di parole singole (vedi src.utils.chunks).
+
+        `mode` "word" torna alle parole singole. I gruppi non attraversano
+        le frasi: servono il testo intero (lo stream ancora aperto viene
+        completato) e un ordine che tenga unite le frasi. Solleva ValueError
+        se la modalità non è valida o non è applicabile.
+        """
+        self._masked_cache = (-1, "")
+        if mode == "word":
+            self.chunks = None
+            return None
+        if self.stimuli is not None:
+            raise ValueError("Una sorgente di stimoli si presenta una parola alla volta")
+        if not self.order.keeps_phrases:
+            raise ValueError(f"L'ordine {self.order.name!r} non tiene unite le parole delle frasi")
+        while self.pump(8):
+            pass
+        plan = make_chunk_plan(self.corpus, mode, size)
+        self.chunks = plan
+        if self.words:
+            self.set_index(self.current_index)
+        return plan
+
+    # ------------------------------------------------------------------
+    # Navigazione per frasi
+    # ------------------------------------------------------------------
+
+    def phrase_start(self, phrase: int) -> int:
+        """Indice della prima parola di una frase (word_count se non esiste).
+
+        In streaming tokenizza solo fino a quella frase.
+        """
+        if self.stimuli is not None:
+            return self.stimuli.phrase_first_word(phrase)
+        mapping = self.corpus.word_to_phrase_map
+        while self.is_streaming and (not mapping or mapping[-1] < phrase):
+            self.pump()
+            mapping = self.corpus.word_to_phrase_map
+        return self.corpus.phrase_first_word(phrase)
+
+    def phrase_range(self, phrase: int) -> tuple[int, int]:
+        """Parole [inizio, fine) di una frase."""
+        return self.phrase_start(phrase), self.phrase_start(phrase + 1)
+
+    def go_to_phrase(self, phrase: int) -> bool:
+        """Va alla prima parola della frase `phrase`. Ritorna True se esiste."""
+        index = self.phrase_start(max(0, phrase))
+        if index >= self.word_count:
+            return False
+        self.set_index(index)
         return True
 
+    def go_next_phrase(self) -> bool:
+        """Va all'inizio della frase successiva."""
+        return self.go_to_phrase(self.phrase_index + 1)
+
+    def go_previous_phrase(self) -> bool:
+        """Va all'inizio della frase precedente."""
+        if self.phrase_index == 0:
+            return False
+        return self.go_to_phrase(self.phrase_index - 1)
+
+    @property
+    def start_index(self) -> int:
+        """Prima parola della sessione.
+
+        Inizio di `start_phrase` (con clamp) se impostata, altrimenti la prima
+        parola dell'ordine di presentazione.
+        """
+        if not self.start_phrase and self.word_count:
+            return self.order.index_at(0)
+        return min(self.phrase_start(self.start_phrase), max(0, self.word_count - 1))
+
     def _sync_phrase_index(self) -> None:
         """Sincronizza l'indice della frase con la parola corrente."""
-        if self.word_to_phrase_map and 0 <= self.current_index < len(self.word_to_phrase_map):
+        if self.stimuli is not None:
+            self.phrase_index = self.stimuli.item(self.current_index).phrase_index if self.word_count else 0
+        elif self.word_to_phrase_map and 0 <= self.current_index < len(self.word_to_phrase_map):
             self.phrase_index = self.word_to_phrase_map[self.current_index]
         else:
             self.phrase_index = 0
@@ -100,18 +531,19 @@ class WordManager:
     def _clear_current(self) -> None:
         """Pulisce lo stato corrente."""
         self.current_index = 0
-        self.current_word = ""
-        self.masked_word = ""
+        self.order_position = 0
         self.phrase_index = 0
+        self._masked_cache = (-1, "")
 
     def reset(self) -> None:
         """Resetta completamente lo stato."""
+        self._close_stream()
         self.file_loaded = False
         self.file_name = None
-        self.words = []
-        self.word_count = 0
-        self.phrases = []
-        self.phrase_index = 0
-        self.phrase_count = 0
-        self.word_to_phrase_map = []
+        self.file_metadata = None
+        self.corpus = Corpus(self.mask_style)
+        self._features = None
+        self.start_phrase = 0
+        self.order = PresentationOrder()
+        self.chunks = None
         self._clear_current()
@@ -0,0 +1,52 @@
+"""
+Text extraction for zipped document formats (.docx, .odt, .epub).
+
+Every extractor streams its container and returns an iterator of text
+lines (line endings kept), ready for `iter_text_chunks`. Plain text files
+are not handled here: they are decoded directly by the caller.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterator, Optional
+
+from src.loaders.docx_text import docx_lines
+from src.loaders.epub_text import epub_lines
+from src.loaders.odt_text import odt_lines
+
+DOCUMENT_EXTRACTORS: Dict[str, Callable[..., Iterator[str]]] = {
+    ".docx": docx_lines,
+    ".doc": docx_lines,
+    ".odt": odt_lines,
+    ".epub": epub_lines,
+}
+DOCUMENT_EXTENSIONS = tuple(DOCUMENT_EXTRACTORS)
+
+# Books are parsed chapter by chapter as the reader gets there, instead of
+# being streamed in the background right after opening
+LAZY_EXTENSIONS = (".epub",)
+
+
+def is_document(path: str) -> bool:
+    return path.lower().endswith(DOCUMENT_EXTENSIONS)
+
+
+def document_lines(path: str, source) -> Optional[Iterator[str]]:
+    """Open the text lines of a document (None if `path` is plain text).
+
+    `source` is the file content (bytes or mmap). Raises ValueError if the
+    content does not match the format of the extension.
+    """
+    lower = path.lower()
+    for extension, extractor in DOCUMENT_EXTRACTORS.items():
+        if lower.endswith(extension):
+            return extractor(source)
+    return None
+
+
+def extract_document_text(path: str, source) -> str:
+    """Return the whole text of a document."""
+    lines = document_lines(path, source)
+    if lines is None:
+        raise ValueError(f"Not a document: {path}")
+    return "".join(lines)
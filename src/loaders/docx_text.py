@@ -0,0 +1,103 @@
+"""
+Streaming text extraction for Word (.docx) documents.
+
+A .docx file is a zip archive; the body text lives in ``word/document.xml``
+while images and other embedded media sit in their own parts. Only the
+document part is opened and it is decompressed and parsed incrementally,
+so media is never read and the XML tree is dropped paragraph by paragraph.
+
+The text follows the rules of docx2txt for the document part: ``<w:t>``
+runs are concatenated, ``<w:tab/>`` becomes a tab, ``<w:br/>`` /
+``<w:cr/>`` a newline and every paragraph starts with a blank line.
+Headers and footers are not extracted.
+"""
+
+from __future__ import annotations
+
+from typing import BinaryIO, Iterator, List, Union
+from xml.etree.ElementTree import XMLPullParser
+import io
+import mmap
+import zipfile
+
+DOCUMENT_PART = "word/document.xml"
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_PARAGRAPH = _W + "p"
+_TEXT = _W + "t"
+_TAB = _W + "tab"
+_BREAKS = (_W + "br", _W + "cr")
+_BODY = _W + "body"
+
+# Compressed bytes fed to the XML parser at a time
+_READ_BLOCK = 64 * 1024
+
+DocxSource = Union[bytes, mmap.mmap, BinaryIO]
+
+
+def docx_lines(source: DocxSource) -> Iterator[str]:
+    """Return an iterator over the text lines of a .docx (line endings kept).
+
+    `source` is the file content (bytes or mmap) or a seekable binary file.
+    The archive is opened right away, so a file that is not a Word
+    document raises ValueError here rather than on the first line.
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    try:
+        archive = zipfile.ZipFile(source)
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Not a Word document: {e}") from None
+    try:
+        part = archive.open(DOCUMENT_PART)
+    except KeyError:
+        archive.close()
+        raise ValueError("Not a Word document: word/document.xml missing") from None
+    return _iter_lines(archive, part)
+
+
+def extract_docx_text(source: DocxSource) -> str:
+    """Return the whole text of a .docx."""
+    return "".join(docx_lines(source))
+
+
+def _iter_lines(archive: zipfile.ZipFile, part: BinaryIO) -> Iterator[str]:
+    parser = XMLPullParser(events=("start", "end"))
+    pieces: List[str] = []
+    body = None
+    try:
+        while True:
+            data = part.read(_READ_BLOCK)
+            if data:
+                parser.feed(data)
+            else:
+                parser.close()
+            for event, elem in parser.read_events():
+                tag = elem.tag
+                if event == "start":
+                    if tag == _PARAGRAPH:
+                        # Everything up to here ends with the new blank line
+                        pieces.append("\n\n")
+                        yield from "".join(pieces).splitlines(keepends=True)
+                        pieces = []
+                    elif tag == _TAB:
+                        pieces.append("\t")
+                    elif tag in _BREAKS:
+                        pieces.append("\n")
+                    elif tag == _BODY:
+                        body = elem
+                elif tag == _TEXT:
+                    if elem.text:
+                        pieces.append(elem.text)
+                elif tag == _PARAGRAPH:
+                    # Its text is out: drop the subtree (and finished body
+                    # elements, keeping the one being parsed)
+                    elem.clear()
+                    if body is not None and len(body) > 1:
+                        del body[:-1]
+            if not data:
+                break
+        yield from "".join(pieces).splitlines(keepends=True)
+    finally:
+        part.close()
+        archive.close()
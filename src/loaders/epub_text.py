@@ -0,0 +1,182 @@
+"""
+Streaming text extraction for EPUB books.
+
+An EPUB is a zip: ``META-INF/container.xml`` points to the package (OPF)
+document, whose manifest lists the chapter files and whose spine gives
+their reading order. Opening a book reads just these two small files;
+chapters are decompressed and parsed one at a time, only when the reader
+of the returned iterator gets to them. Images, fonts and stylesheets are
+never read.
+
+Chapters are XHTML: block elements (paragraphs, headings, list items...)
+end a line, whitespace inside a block collapses to a single space and the
+contents of ``<head>``, scripts and styles are skipped.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import BinaryIO, Iterator, List, Union
+from urllib.parse import unquote
+from xml.etree import ElementTree
+import io
+import mmap
+import posixpath
+import re
+import zipfile
+
+CONTAINER_PART = "META-INF/container.xml"
+
+_CONTAINER_NS = "{urn:oasis:names:tc:opendocument:xmlns:container}"
+_OPF_NS = "{http://www.idpf.org/2007/opf}"
+_CHAPTER_TYPES = ("application/xhtml+xml", "text/html")
+
+# Characters of markup fed to the HTML parser at a time
+_FEED_BLOCK = 64 * 1024
+
+_BLOCK_TAGS = frozenset((
+    "p", "div", "br", "hr", "li", "ul", "ol", "dl", "dt", "dd", "tr", "table",
+    "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "section",
+    "article", "aside", "header", "footer", "figure", "figcaption", "body",
+))
+_SKIPPED_TAGS = frozenset(("head", "script", "style", "title"))
+_SPACES_RE = re.compile(r"\s+")
+_XML_ENCODING_RE = re.compile(rb"""^<\?xml[^>]*encoding=["']([A-Za-z0-9._-]+)["']""")
+
+EpubSource = Union[bytes, mmap.mmap, BinaryIO]
+
+
+@dataclass
+class EpubChapter:
+    """A spine entry: the chapter path inside the zip."""
+    path: str
+    media_type: str
+
+
+class _ChapterParser(HTMLParser):
+    """Collects the text of an XHTML chapter as lines."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines: List[str] = []
+        self._parts: List[str] = []
+        self._skip_depth = 0
+
+    def _end_line(self) -> None:
+        text = "".join(self._parts).strip()
+        self._parts = []
+        if text:
+            self.lines.append(text + "\n")
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self._end_line()
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in _BLOCK_TAGS:
+            self._end_line()
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in _BLOCK_TAGS:
+            self._end_line()
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._parts.append(_SPACES_RE.sub(" ", data))
+
+    def close(self):
+        super().close()
+        self._end_line()
+
+
+def _decode_markup(data: bytes) -> str:
+    """Decode a chapter using its BOM or XML declaration (UTF-8 by default)."""
+    if data.startswith(b"\xef\xbb\xbf"):
+        return data[3:].decode("utf-8", errors="replace")
+    if data.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return data.decode("utf-16", errors="replace")
+    match = _XML_ENCODING_RE.match(data[:200])
+    encoding = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return data.decode(encoding, errors="replace")
+    except LookupError:
+        return data.decode("utf-8", errors="replace")
+
+
+def read_spine(archive: zipfile.ZipFile) -> List[EpubChapter]:
+    """Return the chapters of an opened EPUB in reading order."""
+    try:
+        container = ElementTree.fromstring(archive.read(CONTAINER_PART))
+        rootfile = container.find(f".//{_CONTAINER_NS}rootfile")
+        opf_path = rootfile.get("full-path") if rootfile is not None else None
+        if not opf_path:
+            raise ValueError("no package document")
+        package = ElementTree.fromstring(archive.read(opf_path))
+    except (KeyError, ElementTree.ParseError) as e:
+        raise ValueError(f"Not an EPUB book: {e}") from None
+
+    base = posixpath.dirname(opf_path)
+    manifest = {
+        item.get("id"): item
+        for item in package.iterfind(f"{_OPF_NS}manifest/{_OPF_NS}item")
+    }
+    chapters: List[EpubChapter] = []
+    for itemref in package.iterfind(f"{_OPF_NS}spine/{_OPF_NS}itemref"):
+        item = manifest.get(itemref.get("idref"))
+        if item is None or itemref.get("linear") == "no":
+            continue
+        media_type = item.get("media-type", "")
+        if media_type not in _CHAPTER_TYPES:
+            continue
+        path = posixpath.normpath(posixpath.join(base, unquote(item.get("href", ""))))
+        chapters.append(EpubChapter(path=path, media_type=media_type))
+    return chapters
+
+
+def epub_lines(source: EpubSource) -> Iterator[str]:
+    """Return an iterator over the text lines of an EPUB, chapter by chapter.
+
+    The container and package documents are read right away (a file that
+    is not an EPUB raises ValueError here); each chapter is only read and
+    parsed when iteration reaches it.
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    try:
+        archive = zipfile.ZipFile(source)
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Not an EPUB book: {e}") from None
+    try:
+        chapters = read_spine(archive)
+    except ValueError:
+        archive.close()
+        raise
+    return _iter_lines(archive, chapters)
+
+
+def extract_epub_text(source: EpubSource) -> str:
+    """Return the whole text of an EPUB."""
+    return "".join(epub_lines(source))
+
+
+def _iter_lines(archive: zipfile.ZipFile, chapters: List[EpubChapter]) -> Iterator[str]:
+    try:
+        for chapter in chapters:
+            try:
+                markup = _decode_markup(archive.read(chapter.path))
+            except KeyError:
+                continue  # listed in the spine but missing from the zip
+            parser = _ChapterParser()
+            for pos in range(0, len(markup), _FEED_BLOCK):
+                parser.feed(markup[pos:pos + _FEED_BLOCK])
+                yield from parser.lines
+                parser.lines = []
+            parser.close()
+            yield from parser.lines
+    finally:
+        archive.close()
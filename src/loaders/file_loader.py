@@ -1,67 +1,281 @@
 """
-File loading utilities for text and Word documents.
+File loading utilities for text files and documents (Word, OpenDocument, EPUB).
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List
+from typing import Callable, Iterator, Optional, Union
 from src.core.config import MusicConfig
+import hashlib
+import mmap
 import os
 
-import docx2txt
-
-from src.utils.text import TextParseResult, build_words_and_phrase_map
+from src.utils.compiled_corpus import COMPILED_EXTENSION, CompiledCorpus
+from src.utils.corpus import Corpus, CorpusPhrases, CorpusSplice, CorpusWords
+from src.loaders.documents import LAZY_EXTENSIONS, document_lines, extract_document_text, is_document
+from src.utils.parse_cache import get_parse_cache
+from src.utils.paths import resource_path
+from src.utils.text import TextChunk, decode_text, iter_text_chunks
 
 
 @dataclass
 class LoadedText:
-    words: List[str]
-    phrases_list: List[str]
-    phrases_total: int
-    word_to_phrase_map: List[int]
+    corpus: Corpus
+    sha256: Optional[str] = None
+
+    @property
+    def words(self) -> CorpusWords:
+        return self.corpus.words
+
+    @property
+    def phrases_list(self) -> CorpusPhrases:
+        return self.corpus.phrases
+
+    @property
+    def phrases_total(self) -> int:
+        return self.corpus.phrases_total
+
+    @property
+    def word_to_phrase_map(self):
+        return self.corpus.word_to_phrase_map
+
+@dataclass
+class FileMetadata:
+    """Identity of a loaded source file, captured during ingest."""
+    path: str
+    name: str
+    size_bytes: int
+    mtime_ns: int
+    sha256: str
+
+
+@dataclass
+class IngestedFile:
+    """Result of `FileLoader.ingest`: a complete parse or a stream, plus metadata."""
+    metadata: FileMetadata
+    loaded: Optional[LoadedText] = None
+    stream: Optional["TextStream"] = None
+
+
+@dataclass
+class ReloadedFile:
+    """Result of `FileLoader.reload`: an edited file spliced into the previous corpus."""
+    metadata: FileMetadata
+    corpus: Corpus
+    splice: CorpusSplice
+
+
+# Files from this size on are memory-mapped instead of read
+MMAP_THRESHOLD = 1024 * 1024
+# Bytes decoded at a time while streaming (cut at the next newline)
+_DECODE_BLOCK = 64 * 1024
+
+SourceBuffer = Union[bytes, mmap.mmap]
+
+
+def _read_source(path: str, size: int) -> SourceBuffer:
+    """Read a file in one go (memory-mapped when large)."""
+    with open(path, "rb") as file:
+        if size < MMAP_THRESHOLD:
+            return file.read()
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _release(buffer: SourceBuffer) -> None:
+    if isinstance(buffer, mmap.mmap):
+        buffer.close()
+
+
+class TextStream:
+    """Chunks of a text file or document tokenized lazily from its ingested buffer.
+
+    The buffer (hashed already) is decoded in line-aligned blocks, or for a
+    document its text part(s) are parsed paragraph by paragraph, and
+    released once the last chunk has been produced or the stream is closed.
+
+    `lazy` streams (books) should only be advanced as the reader needs
+    them rather than in the background.
+    """
+
+    def __init__(self, metadata: FileMetadata, buffer: SourceBuffer, chunk_size: int):
+        self.metadata = metadata
+        self.lazy = metadata.path.lower().endswith(LAZY_EXTENSIONS)
+        self._buffer = buffer
+        # Opening the archive validates a document up front
+        source = document_lines(metadata.path, buffer) or self._iter_decoded()
+        self._lines = self._iter_lines(source)
+        self._chunks = iter_text_chunks(self._lines, chunk_size)
+
+    def _iter_decoded(self) -> Iterator[str]:
+        buffer = self._buffer
+        size = len(buffer)
+        pos = 0
+        while pos < size:
+            end = buffer.find(b"\n", min(pos + _DECODE_BLOCK, size))
+            end = size if end < 0 else end + 1
+            yield from decode_text(buffer[pos:end]).splitlines(keepends=True)
+            pos = end
+
+    def _iter_lines(self, source: Iterator[str]) -> Iterator[str]:
+        try:
+            yield from source
+        finally:
+            source.close()
+            _release(self._buffer)
+
+    def __iter__(self) -> "TextStream":
+        return self
+
+    def __next__(self) -> TextChunk:
+        return next(self._chunks)
+
+    def close(self) -> None:
+        self._chunks.close()
+        self._lines.close()
+
+
+_HASH_STEP = 4 * 1024 * 1024
+
+
+def _hash_buffer(buffer: SourceBuffer, progress: Optional[Callable[[float], None]], share: float) -> str:
+    """SHA-256 of the buffer, reporting progress up to `share`."""
+    if progress is None or len(buffer) <= _HASH_STEP:
+        return hashlib.sha256(buffer).hexdigest()
+    h = hashlib.sha256()
+    with memoryview(buffer) as view:
+        for pos in range(0, len(view), _HASH_STEP):
+            h.update(view[pos:pos + _HASH_STEP])
+            progress(share * min(1.0, (pos + _HASH_STEP) / len(view)))
+    return h.hexdigest()
+
 
 class FileLoader:
     """Load and parse text files into word/phrase structures."""
 
     @staticmethod
     def load_txt(path: str) -> LoadedText:
-        if not os.path.exists(path):
-            raise FileNotFoundError(f"File not found: {path}")
-
-        with open(path, "r", encoding="utf-8") as file:
-            text = file.read()
+        return FileLoader.ingest(path).loaded
 
-        parse_result = build_words_and_phrase_map(text)
-        if not parse_result.words:
-            raise ValueError("Il file è vuoto")
+    @staticmethod
+    def load_docx(path: str) -> LoadedText:
+        return FileLoader.ingest(path).loaded
 
-        return FileLoader._to_loaded_text(parse_result)
+    @staticmethod
+    def load_compiled(path: str) -> LoadedText:
+        return FileLoader.ingest(path).loaded
 
     @staticmethod
-    def load_docx(path: str) -> LoadedText:
+    def ingest(path: str, stream_chunk_size: Optional[int] = None,
+               progress: Optional[Callable[[float], None]] = None) -> IngestedFile:
+        """Read a text file or document once and derive its hash and parse from the same bytes.
+
+        Compiled corpora (.tscorpus) are memory-mapped without parsing.
+
+        Unchanged files already in the parse cache are not read at all. With
+        `stream_chunk_size`, files that miss the cache are returned as a
+        TextStream instead of being tokenized up front. `progress`, if given,
+        is called with the fraction done (0.0-1.0); it may raise to abort.
+        """
         if not os.path.exists(path):
             raise FileNotFoundError(f"File not found: {path}")
 
-        text = docx2txt.process(path)
-        parse_result = build_words_and_phrase_map(text)
-        if not parse_result.words:
-            raise ValueError("Word document appears to be empty after conversion.")
+        is_doc = is_document(path)
+        cache = get_parse_cache()
+        st = os.stat(path)
 
-        return FileLoader._to_loaded_text(parse_result)
+        def make_metadata(sha256: str, size_bytes: int = st.st_size) -> FileMetadata:
+            return FileMetadata(
+                path=path,
+                name=os.path.basename(path),
+                size_bytes=size_bytes,
+                mtime_ns=st.st_mtime_ns,
+                sha256=sha256,
+            )
+
+        if path.lower().endswith(COMPILED_EXTENSION):
+            # Memory-mapped as is: the header carries the source identity
+            compiled = CompiledCorpus(path)
+            if not compiled.word_count:
+                raise ValueError("Il file è vuoto")
+            metadata = make_metadata(compiled.source_sha256, compiled.source_size)
+            return IngestedFile(metadata=metadata, loaded=LoadedText(corpus=compiled, sha256=metadata.sha256))
+
+        sha256 = cache.known_hash(path, st)
+        corpus = cache.load(sha256) if sha256 else None
+        if corpus is None:
+            buffer = _read_source(path, st.st_size)
+            try:
+                streaming = bool(stream_chunk_size)
+                # Hashing is most of the work when the parse is streamed
+                hash_share = 1.0 if streaming else 0.3
+                sha256 = _hash_buffer(buffer, progress, hash_share)
+                # Same content under another path is still a hit
+                corpus = cache.load(sha256)
+                if corpus is not None:
+                    cache.remember(path, sha256, st.st_size, st.st_mtime_ns)
+                elif streaming:
+                    stream = TextStream(make_metadata(sha256), buffer, stream_chunk_size)
+                    buffer = b""  # now owned by the stream
+                    return IngestedFile(metadata=stream.metadata, stream=stream)
+                else:
+                    text = extract_document_text(path, buffer) if is_doc else decode_text(buffer[:])
+                    parse_progress = None
+                    if progress is not None:
+                        def parse_progress(done: float) -> None:
+                            progress(hash_share + (1.0 - hash_share) * done)
+                    corpus = Corpus.from_text(text, progress=parse_progress)
+                    cache.store(path, sha256, st.st_size, st.st_mtime_ns, corpus)
+            finally:
+                _release(buffer)
+
+        if not corpus.word_count:
+            if is_doc:
+                raise ValueError("Document appears to be empty after conversion.")
+            raise ValueError("Il file è vuoto")
+        if progress is not None:
+            progress(1.0)
+        return IngestedFile(metadata=make_metadata(sha256), loaded=LoadedText(corpus=corpus, sha256=sha256))
 
     @staticmethod
-    def _to_loaded_text(parse_result: TextParseResult) -> LoadedText:
-        return LoadedText(
-            words=parse_result.words,
-            phrases_list=parse_result.phrases_list,
-            phrases_total=parse_result.phrases_total,
-            word_to_phrase_map=parse_result.word_to_phrase_map,
+    def reload(path: str, previous: Corpus, previous_sha256: str) -> Optional[ReloadedFile]:
+        """Re-read a file changed on disk, re-tokenizing only the edited part of `previous`.
+
+        `previous` must be the complete corpus of the earlier version.
+        Returns None if the content did not change (the file was only
+        touched). The new corpus is stored in the parse cache.
+        """
+        st = os.stat(path)
+        buffer = _read_source(path, st.st_size)
+        try:
+            sha256 = _hash_buffer(buffer, None, 1.0)
+            if sha256 == previous_sha256:
+                return None
+            text = extract_document_text(path, buffer) if is_document(path) else decode_text(buffer[:])
+        finally:
+            _release(buffer)
+
+        corpus, splice = previous.splice(text)
+        metadata = FileMetadata(
+            path=path,
+            name=os.path.basename(path),
+            size_bytes=st.st_size,
+            mtime_ns=st.st_mtime_ns,
+            sha256=sha256,
         )
+        get_parse_cache().store(path, sha256, st.st_size, st.st_mtime_ns, corpus)
+        return ReloadedFile(metadata=metadata, corpus=corpus, splice=splice)
+
+    @staticmethod
+    def cache_stream(stream: TextStream, corpus: Corpus) -> None:
+        """Cache the corpus built from a fully consumed TextStream."""
+        meta = stream.metadata
+        get_parse_cache().store(meta.path, meta.sha256, meta.size_bytes, meta.mtime_ns, corpus)
 
 class LoadMusic:
     @staticmethod
     def load_background_music(path: str) -> MusicConfig:
-        if not os.path.exists(path):
+        resolved = resource_path(path)
+        if not os.path.exists(resolved):
             raise FileNotFoundError(f'File not found: {path}')
-        return MusicConfig(background_music=path)
\ No newline at end of file
+        return MusicConfig(background_music=resolved)
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""
+Streaming text extraction for OpenDocument text (.odt) files.
+
+The body of an .odt lives in ``content.xml``; pictures and other media are
+separate parts of the zip and are never read. ``content.xml`` is
+decompressed and parsed incrementally and every paragraph (``<text:p>``,
+``<text:h>``) is yielded as a line as soon as it is complete, then dropped
+from the tree.
+
+Inside a paragraph ``<text:s text:c="n"/>`` becomes n spaces,
+``<text:tab/>`` a tab and ``<text:line-break/>`` a newline. Footnotes and
+comments are skipped, so they do not break the sentence they sit in.
+"""
+
+from __future__ import annotations
+
+from typing import BinaryIO, Iterator, List, Union
+from xml.etree.ElementTree import Element, XMLPullParser
+import io
+import mmap
+import zipfile
+
+CONTENT_PART = "content.xml"
+
+_TEXT = "{urn:oasis:names:tc:opendocument:xmlns:text:1.0}"
+_OFFICE = "{urn:oasis:names:tc:opendocument:xmlns:office:1.0}"
+_PARAGRAPHS = (_TEXT + "p", _TEXT + "h")
+_SPACE = _TEXT + "s"
+_SPACE_COUNT = _TEXT + "c"
+_TAB = _TEXT + "tab"
+_LINE_BREAK = _TEXT + "line-break"
+_SKIPPED = (_TEXT + "note", _OFFICE + "annotation", _OFFICE + "annotation-end")
+
+# Compressed bytes fed to the XML parser at a time
+_READ_BLOCK = 64 * 1024
+
+OdtSource = Union[bytes, mmap.mmap, BinaryIO]
+
+
+def odt_lines(source: OdtSource) -> Iterator[str]:
+    """Return an iterator over the paragraphs of an .odt, one line each.
+
+    The archive is opened right away, so a file that is not an
+    OpenDocument text raises ValueError here rather than on the first line.
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    try:
+        archive = zipfile.ZipFile(source)
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Not an OpenDocument file: {e}") from None
+    try:
+        part = archive.open(CONTENT_PART)
+    except KeyError:
+        archive.close()
+        raise ValueError("Not an OpenDocument file: content.xml missing") from None
+    return _iter_lines(archive, part)
+
+
+def extract_odt_text(source: OdtSource) -> str:
+    """Return the whole text of an .odt."""
+    return "".join(odt_lines(source))
+
+
+def _paragraph_text(elem: Element, parts: List[str]) -> None:
+    """Append the text of a paragraph subtree (nested paragraphs on their own lines)."""
+    if elem.text:
+        parts.append(elem.text)
+    for child in elem:
+        tag = child.tag
+        if tag == _SPACE:
+            parts.append(" " * int(child.get(_SPACE_COUNT, "1")))
+        elif tag == _TAB:
+            parts.append("\t")
+        elif tag == _LINE_BREAK:
+            parts.append("\n")
+        elif tag in _PARAGRAPHS:
+            # Text boxes and frames nest whole paragraphs
+            parts.append("\n")
+            _paragraph_text(child, parts)
+            parts.append("\n")
+        elif tag not in _SKIPPED:
+            _paragraph_text(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+
+
+def _iter_lines(archive: zipfile.ZipFile, part: BinaryIO) -> Iterator[str]:
+    parser = XMLPullParser(events=("start", "end"))
+    stack: List[Element] = []
+    open_paragraphs = 0
+    try:
+        while True:
+            data = part.read(_READ_BLOCK)
+            if data:
+                parser.feed(data)
+            else:
+                parser.close()
+            for event, elem in parser.read_events():
+                if event == "start":
+                    stack.append(elem)
+                    if elem.tag in _PARAGRAPHS:
+                        open_paragraphs += 1
+                    continue
+                stack.pop()
+                if elem.tag not in _PARAGRAPHS:
+                    continue
+                open_paragraphs -= 1
+                if open_paragraphs:
+                    continue  # emitted with its outer paragraph
+                parts: List[str] = []
+                _paragraph_text(elem, parts)
+                parts.append("\n")
+                yield from "".join(parts).splitlines(keepends=True)
+                # Drop the paragraph (its tail is whitespace between blocks)
+                if stack:
+                    stack[-1].remove(elem)
+            if not data:
+                break
+    finally:
+        part.close()
+        archive.close()
@@ -0,0 +1,271 @@
+"""
+Stimulus sources: anything that yields the stimuli of a presentation lazily.
+
+A source is an iterable of `StimulusItem` (text, sentence number, stimulus
+type). Iterating it again starts over from the first item, so a session can
+be restarted or replayed. Built-in sources:
+
+- ``FileSource``: the words of a text file or document, tokenized in chunks.
+- ``ListSource``: an in-memory list of words or sentences.
+- ``PseudowordSource``: procedurally generated pseudowords (seeded, unbounded
+  unless a count is given).
+
+`StimulusBuffer` is what the presenter reads from: a bounded window over a
+source, with a few items ready ahead of the current one and some kept behind
+it for going back. Memory stays constant however long the source is; going
+back past the window restarts the source and skips forward.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Iterable, Iterator, NamedTuple, Optional, Protocol, Union, runtime_checkable
+import os
+import random
+import secrets
+
+if TYPE_CHECKING:
+    from src.loaders.file_loader import FileMetadata
+
+# Words per chunk when a FileSource tokenizes its file
+FILE_CHUNK_WORDS = 2048
+
+
+class StimulusItem(NamedTuple):
+    """One stimulus: its text, the sentence it belongs to and its type.
+
+    `stimulus_type` is a value of src.logging.session_logger.StimulusType.
+    """
+    text: str
+    phrase_index: int = 0
+    stimulus_type: str = "word"
+
+
+@runtime_checkable
+class StimulusSource(Protocol):
+    """Yields the stimuli of a presentation, lazily and in order."""
+
+    # Shown on screen and recorded with the session
+    name: str
+
+    def __iter__(self) -> Iterator[StimulusItem]:
+        """Iterate from the first item (every call starts over)."""
+        ...
+
+    def snapshot(self) -> dict:
+        """Settings to record with the session (enough to recreate the source)."""
+        ...
+
+
+class FileSource:
+    """Words of a text file or document, read and tokenized chunk by chunk."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.splitext(os.path.basename(path))[0].lower()
+        # Known after the first iteration has started (hash of the bytes read)
+        self.metadata: Optional[FileMetadata] = None
+
+    def __iter__(self) -> Iterator[StimulusItem]:
+        # Imported here: file_loader pulls in src.core, which imports this module
+        from src.loaders.file_loader import FileLoader
+
+        ingested = FileLoader.ingest(self.path, stream_chunk_size=FILE_CHUNK_WORDS)
+        self.metadata = ingested.metadata
+        if ingested.stream is None:
+            corpus = ingested.loaded.corpus
+            for text, phrase in zip(corpus.iter_words(), corpus.word_to_phrase_map):
+                yield StimulusItem(text, phrase)
+            return
+        stream = ingested.stream
+        try:
+            for chunk in stream:
+                for text, phrase in zip(chunk.words, chunk.word_to_phrase_map):
+                    yield StimulusItem(text, phrase)
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+
+    def snapshot(self) -> dict:
+        return {
+            "stimulus_source": "file",
+            "source_name": self.name,
+            "source_sha256": self.metadata.sha256 if self.metadata else None,
+        }
+
+
+class ListSource:
+    """An in-memory list of stimuli.
+
+    Items are strings (each one its own sentence) or (text, phrase_index)
+    pairs. `stimulus_type` applies to all of them.
+    """
+
+    def __init__(self, items: Iterable[Union[str, tuple[str, int]]], name: str = "list",
+                 stimulus_type: str = "word"):
+        self.items = list(items)
+        self.name = name
+        self.stimulus_type = stimulus_type
+
+    def __iter__(self) -> Iterator[StimulusItem]:
+        for i, item in enumerate(self.items):
+            text, phrase = (item, i) if isinstance(item, str) else item
+            yield StimulusItem(text, phrase, self.stimulus_type)
+
+    def snapshot(self) -> dict:
+        return {"stimulus_source": "list", "source_name": self.name, "source_items": len(self.items)}
+
+
+# Italian-like syllables: onset + vowel
+_ONSETS = (
+    "b", "c", "d", "f", "g", "l", "m", "n", "p", "r", "s", "t", "v", "z",
+    "br", "cr", "dr", "fr", "gr", "pr", "tr", "bl", "fl", "pl", "sc", "sp", "st",
+)
+_VOWELS = "aeiou"
+
+
+class PseudowordSource:
+    """Pronounceable pseudowords (onset + vowel syllables) from a seeded generator.
+
+    Unbounded when `count` is None. The same seed always gives the same
+    sequence; a random seed is drawn (and recorded) when none is given.
+    """
+
+    def __init__(self, seed: Optional[int] = None, count: Optional[int] = None,
+                 min_syllables: int = 2, max_syllables: int = 3, words_per_phrase: int = 6,
+                 name: str = "pseudowords"):
+        self.seed = secrets.randbits(32) if seed is None else seed
+        self.count = count
+        self.min_syllables = max(1, min_syllables)
+        self.max_syllables = max(self.min_syllables, max_syllables)
+        self.words_per_phrase = max(1, words_per_phrase)
+        self.name = name
+
+    def __iter__(self) -> Iterator[StimulusItem]:
+        rng = random.Random(self.seed)
+        choice, randint = rng.choice, rng.randint
+        index = 0
+        while self.count is None or index < self.count:
+            syllables = randint(self.min_syllables, self.max_syllables)
+            text = "".join(choice(_ONSETS) + choice(_VOWELS) for _ in range(syllables))
+            yield StimulusItem(text, index // self.words_per_phrase)
+            index += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "stimulus_source": "pseudowords",
+            "source_seed": self.seed,
+            "source_count": self.count,
+            "source_syllables": [self.min_syllables, self.max_syllables],
+        }
+
+
+class StimulusBuffer(Sequence):
+    """Bounded window over the items of a source, pulled on demand.
+
+    As a sequence it holds the item texts: len() is the number of items
+    pulled so far and indices are positions in the source. The window keeps
+    up to `history` items behind the current one and `lookahead` ahead of
+    it; older items are dropped and re-read, restarting the source, only if
+    they are asked for again.
+    """
+
+    def __init__(self, source: StimulusSource, lookahead: int = 64, history: int = 256):
+        self.source = source
+        self.lookahead = max(1, lookahead)
+        self._window: deque[StimulusItem] = deque(maxlen=max(0, history) + self.lookahead + 1)
+        self._items: Optional[Iterator[StimulusItem]] = iter(source)
+        self._pulled = 0
+        # Sentences met so far (all of them once the source is exhausted)
+        self.phrase_total = 0
+
+    @property
+    def first(self) -> int:
+        """Index of the oldest item still in the window."""
+        return self._pulled - len(self._window)
+
+    @property
+    def exhausted(self) -> bool:
+        return self._items is None
+
+    def __len__(self) -> int:
+        return self._pulled
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self.item(index).text
+
+    def item(self, index: int) -> StimulusItem:
+        """Item at `index` (pulled or re-read if needed); IndexError past the end."""
+        if not self.ensure(index):
+            raise IndexError(index)
+        return self._window[index - self.first]
+
+    def pull(self, count: int) -> int:
+        """Pull up to `count` more items. Returns how many were pulled."""
+        items = self._items
+        if items is None:
+            return 0
+        pulled = 0
+        window = self._window
+        for _ in range(count):
+            try:
+                item = next(items)
+            except StopIteration:
+                self.close()
+                break
+            window.append(item)
+            pulled += 1
+            if item.phrase_index >= self.phrase_total:
+                self.phrase_total = item.phrase_index + 1
+        self._pulled += pulled
+        return pulled
+
+    def ensure(self, index: int) -> bool:
+        """Make `index` available in the window. Returns True if it exists."""
+        if index < 0:
+            return False
+        if index < self.first:
+            self._restart()
+        while index >= self._pulled and self.pull(index - self._pulled + 1):
+            pass
+        return self.first <= index < self._pulled
+
+    def fill(self, index: int, max_items: int) -> bool:
+        """Keep `lookahead` items ready after `index`, pulling at most `max_items`.
+
+        Returns True while the source has more items.
+        """
+        missing = index + self.lookahead + 1 - self._pulled
+        if missing > 0:
+            self.pull(min(missing, max_items))
+        return not self.exhausted
+
+    def phrase_first_word(self, phrase: int) -> int:
+        """Index of the first item of sentence `phrase` or later (len() if none)."""
+        if self.first > 0 and (not self._window or self._window[0].phrase_index >= phrase):
+            self._restart()  # the sentence may start before the window
+        index = self.first
+        while self.ensure(index):
+            if self._window[index - self.first].phrase_index >= phrase:
+                return index
+            index += 1
+        return self._pulled
+
+    def _restart(self) -> None:
+        self.close()
+        self._window.clear()
+        self._pulled = 0
+        self._items = iter(self.source)
+
+    def close(self) -> None:
+        """Stop pulling (closes the source iterator)."""
+        items, self._items = self._items, None
+        close = getattr(items, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,239 @@
+"""
+Columnar store of the word events of a session.
+
+Kept as dataclass instances, the WordEvents of a long session each hold
+their own UUID, enum references and copies of the same few strings.
+WordEventStore keeps one typed array per field instead, one slot per
+trial:
+
+- numbers in ``array`` columns (``None`` stored as a sentinel value);
+- stimulus texts, sources, enums and session ids as indexes into a table
+  of their distinct values, so each one is stored once however many
+  trials repeat it;
+- event ids derived from the slot when asked for (``uuid5`` in a
+  namespace drawn for the store): none is generated or kept while the
+  session runs, and the same slot always gives the same id.
+
+Reading ``store[i]`` (or iterating) materializes a WordEvent view of a
+slot for the existing callers (exports, metrics). Changing a view does
+not change the store.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+import math
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Union
+import uuid
+
+from src.logging.session_logger import ErrorType, ResponseStatus, StimulusType, WordEvent
+
+# Stored in the integer columns in place of None
+_NULL = -(2 ** 63)
+# is_correct column: None / False / True
+_BOOL_CODES = {None: -1, False: 0, True: 1}
+
+
+class ValueTable:
+    """Distinct values of a column, each stored once and referred to by its index.
+
+    Values are told apart by type as well: ResponseStatus.NULL and
+    ErrorType.NULL (both equal to "null") get different indexes.
+    """
+
+    __slots__ = ("values", "_ids")
+
+    def __init__(self):
+        self.values: List[Hashable] = []
+        self._ids: Dict[tuple, int] = {}
+
+    def id_of(self, value: Hashable) -> int:
+        key = (value.__class__, value)
+        index = self._ids.get(key)
+        if index is None:
+            index = self._ids[key] = len(self.values)
+            self.values.append(value)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+def _nullable(value: Optional[int]) -> int:
+    return _NULL if value is None else value
+
+
+def _from_nullable(value: int) -> Optional[int]:
+    return None if value == _NULL else value
+
+
+def _float(value: Optional[float]) -> float:
+    return math.nan if value is None else value
+
+
+def _from_float(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+class WordEventStore(Sequence):
+    """Word events of a session, one slot per trial in typed columns."""
+
+    def __init__(self):
+        # Event ids are uuid5(namespace, slot) unless given with append()
+        self.namespace = uuid.uuid4()
+        self._event_ids: Dict[int, uuid.UUID] = {}
+
+        self.trial_index = array("I")
+        self.duration_ms = array("q")
+        self.shown_at_ms = array("q")
+        self.hidden_at_ms = array("q")
+        self.cue_onset_latency_est_ms = array("d")
+        self.cue_offset_latency_est_ms = array("d")
+        self.word_level_speed = array("q")
+        self.response_time_ms = array("q")
+        self.is_correct = array("b")
+
+        self.texts = ValueTable()
+        self.stimulus_text = array("I")
+        self.sources = ValueTable()
+        self.stimulus_source = array("H")
+        self.sessions = ValueTable()
+        self.session_id = array("H")
+        # Enum members and game states share one table
+        self.categories = ValueTable()
+        self.stimulus_type = array("B")
+        self.game_state = array("B")
+        self.response_status = array("B")
+        self.error_type = array("B")
+
+    def __len__(self) -> int:
+        return len(self.trial_index)
+
+    def log(
+        self,
+        session_id: Optional[uuid.UUID],
+        trial_index: int,
+        stimulus_text: str,
+        shown_at_ms: int,
+        hidden_at_ms: int,
+        *,
+        stimulus_type: StimulusType = StimulusType.WORD,
+        stimulus_source: str = "",
+        duration_ms: int = 0,
+        cue_onset_latency_est_ms: Optional[float] = None,
+        cue_offset_latency_est_ms: Optional[float] = None,
+        word_level_speed: Optional[int] = None,
+        game_state: Any = None,
+        response_status: ResponseStatus = ResponseStatus.NULL,
+        response_time_ms: Optional[int] = None,
+        is_correct: Optional[bool] = None,
+        error_type: ErrorType = ErrorType.NULL,
+    ) -> int:
+        """Append a trial (fields as in WordEvent). Returns its slot."""
+        slot = len(self.trial_index)
+        self.trial_index.append(trial_index)
+        self.duration_ms.append(duration_ms)
+        self.shown_at_ms.append(shown_at_ms)
+        self.hidden_at_ms.append(hidden_at_ms)
+        self.cue_onset_latency_est_ms.append(_float(cue_onset_latency_est_ms))
+        self.cue_offset_latency_est_ms.append(_float(cue_offset_latency_est_ms))
+        self.word_level_speed.append(_nullable(word_level_speed))
+        self.response_time_ms.append(_nullable(response_time_ms))
+        self.is_correct.append(_BOOL_CODES[is_correct])
+        self.stimulus_text.append(self.texts.id_of(stimulus_text))
+        self.stimulus_source.append(self.sources.id_of(stimulus_source))
+        self.session_id.append(self.sessions.id_of(session_id))
+        categories = self.categories
+        self.stimulus_type.append(categories.id_of(stimulus_type))
+        self.game_state.append(categories.id_of(game_state))
+        self.response_status.append(categories.id_of(response_status))
+        self.error_type.append(categories.id_of(error_type))
+        return slot
+
+    def append(self, event: WordEvent) -> None:
+        """Append a WordEvent (keeping its event id)."""
+        slot = self.log(
+            event.session_id,
+            event.trial_index,
+            event.stimulus_text,
+            event.shown_at_ms,
+            event.hidden_at_ms,
+            stimulus_type=event.stimulus_type,
+            stimulus_source=event.stimulus_source,
+            duration_ms=event.duration_ms,
+            cue_onset_latency_est_ms=event.cue_onset_latency_est_ms,
+            cue_offset_latency_est_ms=event.cue_offset_latency_est_ms,
+            word_level_speed=event.word_level_speed,
+            game_state=event.game_state,
+            response_status=event.response_status,
+            response_time_ms=event.response_time_ms,
+            is_correct=event.is_correct,
+            error_type=event.error_type,
+        )
+        self._event_ids[slot] = event.event_id
+
+    def event_id(self, slot: int) -> uuid.UUID:
+        event_id = self._event_ids.get(slot)
+        return event_id if event_id is not None else uuid.uuid5(self.namespace, str(slot))
+
+    def view(self, slot: int) -> WordEvent:
+        """WordEvent with the fields of `slot`."""
+        categories = self.categories.values
+        return WordEvent(
+            session_id=self.sessions.values[self.session_id[slot]],
+            event_id=self.event_id(slot),
+            trial_index=self.trial_index[slot],
+            stimulus_text=self.texts.values[self.stimulus_text[slot]],
+            stimulus_type=categories[self.stimulus_type[slot]],
+            stimulus_source=self.sources.values[self.stimulus_source[slot]],
+            duration_ms=self.duration_ms[slot],
+            shown_at_ms=self.shown_at_ms[slot],
+            hidden_at_ms=self.hidden_at_ms[slot],
+            cue_onset_latency_est_ms=_from_float(self.cue_onset_latency_est_ms[slot]),
+            cue_offset_latency_est_ms=_from_float(self.cue_offset_latency_est_ms[slot]),
+            word_level_speed=_from_nullable(self.word_level_speed[slot]),
+            game_state=categories[self.game_state[slot]],
+            response_status=categories[self.response_status[slot]],
+            response_time_ms=_from_nullable(self.response_time_ms[slot]),
+            is_correct=None if self.is_correct[slot] < 0 else bool(self.is_correct[slot]),
+            error_type=categories[self.error_type[slot]],
+        )
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[WordEvent, List[WordEvent]]:
+        if isinstance(index, slice):
+            return [self.view(slot) for slot in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("word event index out of range")
+        return self.view(index)
+
+    def __iter__(self) -> Iterator[WordEvent]:
+        for slot in range(len(self)):
+            yield self.view(slot)
+
+    # Metrics read straight from the columns (no views)
+
+    def actual_durations(self) -> List[int]:
+        """Exposure time of every trial that has one (see WordEvent.actual_duration_ms)."""
+        return [
+            hidden - shown for shown, hidden in zip(self.shown_at_ms, self.hidden_at_ms) if hidden > shown
+        ]
+
+    def response_times(self) -> List[int]:
+        return [value for value in self.response_time_ms if value != _NULL]
+
+    def count_correct(self, value: Optional[bool]) -> int:
+        """Number of trials whose is_correct is `value`."""
+        return self.is_correct.count(_BOOL_CODES[value])
+
+
+def as_event_store(events: Sequence[WordEvent]) -> WordEventStore:
+    """`events` as a WordEventStore (a list of WordEvents is copied into a new one)."""
+    if isinstance(events, WordEventStore):
+        return events
+    store = WordEventStore()
+    for event in events:
+        store.append(event)
+    return store
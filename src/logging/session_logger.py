@@ -17,6 +17,7 @@ import uuid
 
 if TYPE_CHECKING:
     from game import State
+    from src.logging.event_store import WordEventStore
 
 
 # Classes for WordEvent
@@ -52,6 +53,12 @@ class WordEvent:
     shown_at_ms: int = 0
     hidden_at_ms: int = 0
 
+    #audio cues, None if no cue was played. Estimates, not measurements: the time
+    #spent queueing the sound plus one mixer buffer period (buffer_size / frequency),
+    #so they are nearly constant and do not include output device latency
+    cue_onset_latency_est_ms: Optional[float] = None
+    cue_offset_latency_est_ms: Optional[float] = None
+
     #context
     word_level_speed: Optional[int] = None
     game_state: Optional["State"] = None
@@ -83,6 +90,8 @@ class WordEvent:
             "shown_at_ms": self.shown_at_ms,
             "hidden_at_ms": self.hidden_at_ms,
             "actual_duration_ms": self.actual_duration_ms if self.actual_duration_ms is not None else "",
+            "cue_onset_latency_est_ms": self.cue_onset_latency_est_ms if self.cue_onset_latency_est_ms is not None else "",
+            "cue_offset_latency_est_ms": self.cue_offset_latency_est_ms if self.cue_offset_latency_est_ms is not None else "",
             "word_level_speed": self.word_level_speed if self.word_level_speed is not None else "",
             "game_state": str(self.game_state) if self.game_state is not None else "",
             "response_status": self.response_status.value,
@@ -228,6 +237,11 @@ class DisplayNameRegistry:
         self.save(mapping)
         return True
 
+def _new_word_event_store() -> "WordEventStore":
+    from src.logging.event_store import WordEventStore
+    return WordEventStore()
+
+
 @dataclass
 class SessionData:
     # ID
@@ -261,7 +275,8 @@ class SessionData:
     setting_snapshot: Optional[dict[str, Any]] = None
 
     #Events
-    word_events: list[WordEvent] = field(default_factory=list)
+    # Columnar store (src.logging.event_store): reading it gives WordEvent views
+    word_events: "WordEventStore" = field(default_factory=_new_word_event_store)
     pause_events: list[PauseEvent] = field(default_factory=list)
     notes: Optional[str] = None
 
@@ -271,15 +286,23 @@ class SessionData:
     total_active_ms: int = 0
     accuracy: str = ''
     
-    def set_input_file(self, file_path: Path, assets_root: Path | None = None) -> None:
+    def set_input_file(self, file_path: Path, assets_root: Path | None = None,
+                       file_hash: Optional[str] = None, file_size: Optional[int] = None) -> None:
+        """Snapshot name, size, SHA-256 and origin of the stimulus file.
+
+        Pass `file_hash`/`file_size` when they are already known (the loader
+        computes them from the bytes it parsed) to avoid reading the file again.
+        """
         self.input_file_name = file_path.name
-        self.input_file_size_bytes = file_path.stat().st_size
+        self.input_file_size_bytes = file_size if file_size is not None else file_path.stat().st_size
 
-        h = hashlib.sha256()
-        with file_path.open("rb") as f:
-            for chunk in iter(lambda: f.read(1024 * 1024), b""):
-                h.update(chunk)
-        self.input_file_hash = h.hexdigest()
+        if file_hash is None:
+            h = hashlib.sha256()
+            with file_path.open("rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    h.update(chunk)
+            file_hash = h.hexdigest()
+        self.input_file_hash = file_hash
 
         if assets_root is not None:
             try:
@@ -292,12 +315,20 @@ class SessionData:
         self.input_file_relpath = ""
         self.input_file_origin = "external_drop"
 
+    def set_input_source(self, name: str) -> None:
+        """Snapshot a generated stimulus source (no file: no size or hash)."""
+        self.input_file_name = name
+        self.input_file_size_bytes = 0
+        self.input_file_hash = None
+        self.input_file_relpath = ""
+        self.input_file_origin = "generated"
+
     def avg_actual_duration_ms(self) -> float:
         """Calcola la durata media effettiva degli eventi word nella sessione."""
         if not self.word_events:
             return 0.0
         
-        durations = [e.actual_duration_ms for e in self.word_events if e.actual_duration_ms is not None]
+        durations = self.word_events.actual_durations()
         if not durations:
             return 0.0
         
@@ -313,9 +344,7 @@ class SessionData:
         (e.g. when the user presses the back arrow).
         Each error corresponds to a trial marked as wrong.
         """
-        commission_errors = sum(
-            1 for e in self.word_events if e.is_correct is False
-        )
+        commission_errors = self.word_events.count_correct(False)
         trials = len(self.word_events) - commission_errors
 
         if trials <= 0:
@@ -384,6 +413,7 @@ def export_word_events_csv(
 
     Exports ONLY pseudonym-based identifiers (participant_pseudonym).
     Raw participant_code is never written.
+    The cue_*_latency_est_ms columns are estimated lower bounds, see WordEvent.
     """
     path = Path(csv_path)
     _ensure_parent_dir(path)
@@ -454,23 +484,26 @@ def export_session_summary_csv(
     path = Path(csv_path)
     _ensure_parent_dir(path)
 
-    word_events = word_events or []
+    from src.logging.event_store import as_event_store
+
+    # Metrics are read from the event columns, without a view per trial
+    word_events = as_event_store(word_events or [])
     pause_events = pause_events or []
 
     total_trials = len(word_events)
     total_pause_ms = sum((p.duration_ms() or 0) for p in pause_events)
 
     # Compute mean actual duration (the real exposure time per word)
-    actual_durations = [e.actual_duration_ms for e in word_events if e.actual_duration_ms is not None]
+    actual_durations = word_events.actual_durations()
     mean_actual_duration_ms = (
         round(sum(actual_durations) / len(actual_durations), 2)
         if actual_durations else 0.0
     )
 
     # Response-based metrics (only meaningful if is_correct was set)
-    total_correct = sum(1 for e in word_events if e.is_correct is True)
-    total_wrong = sum(1 for e in word_events if e.is_correct is False)
-    rt_values = [e.response_time_ms for e in word_events if e.response_time_ms is not None]
+    total_correct = word_events.count_correct(True)
+    total_wrong = word_events.count_correct(False)
+    rt_values = word_events.response_times()
     mean_rt = round(sum(rt_values) / len(rt_values), 2) if rt_values else ""
 
     row = {
@@ -555,27 +588,35 @@ class SessionLogger:
         stimulus_type: StimulusType = StimulusType.WORD,
         stimulus_source: str = "",
         duration_ms: int = 0,
+        cue_onset_latency_est_ms: Optional[float] = None,
+        cue_offset_latency_est_ms: Optional[float] = None,
         word_level_speed: Optional[int] = None,
         game_state: Optional["State"] = None,
         response_status: ResponseStatus = ResponseStatus.NULL,
         response_time_ms: Optional[int] = None,
         is_correct: Optional[bool] = None,
         error_type: ErrorType = ErrorType.NULL,
-    ) -> WordEvent:
-        """Create and append a WordEvent to the current session.
+    ) -> int:
+        """Append a word event to the current session and return its trial index.
 
         - session_id is taken from the active SessionData
         - trial_index is derived from the number of word_events already logged
+
+        The event goes straight into the columns of session.word_events (no
+        WordEvent object, no UUID): session.word_events[index] gives a
+        WordEvent view of it.
         """
-        we = WordEvent(
-            session_id=self.session.session_id,
-            trial_index=self.trial_index(),
-            stimulus_text=stimulus_text,
+        return self.session.word_events.log(
+            self.session.session_id,
+            self.trial_index(),
+            stimulus_text,
+            shown_at_ms,
+            hidden_at_ms,
             stimulus_type=stimulus_type,
             stimulus_source=stimulus_source,
             duration_ms=duration_ms,
-            shown_at_ms=shown_at_ms,
-            hidden_at_ms=hidden_at_ms,
+            cue_onset_latency_est_ms=cue_onset_latency_est_ms,
+            cue_offset_latency_est_ms=cue_offset_latency_est_ms,
             word_level_speed=word_level_speed,
             game_state=game_state,
             response_status=response_status,
@@ -583,8 +624,6 @@ class SessionLogger:
             is_correct=is_correct,
             error_type=error_type,
         )
-        self.session.word_events.append(we)
-        return we
     
     def log_pause(
         self,
@@ -738,6 +777,8 @@ class SessionLogger:
                 "shown_at_ms": e.shown_at_ms,
                 "hidden_at_ms": e.hidden_at_ms,
                 "actual_duration_ms": e.actual_duration_ms,
+                "cue_onset_latency_est_ms": e.cue_onset_latency_est_ms,
+                "cue_offset_latency_est_ms": e.cue_offset_latency_est_ms,
                 "word_level_speed": e.word_level_speed,
                 "game_state": str(e.game_state) if e.game_state is not None else None,
                 "response_status": e.response_status.value,
@@ -186,9 +186,12 @@ class CsvState(BaseState):
         title_rect = title.get_rect(centerx=win_w // 2, centery=int(win_h * 0.25))
         screen.blit(title, title_rect)
 
-        # List exported files
+        # List exported files (playlist: earlier files summarized in one line)
         y = int(win_h * 0.35)
+        earlier = len(self.app.context.finished_sessions)
         for key, path in self.exported_paths.items():
+            if key.startswith("file_"):
+                continue
             label = key.replace("_", " ").title()
             file_name = str(path).split("/")[-1] if "/" in str(path) else str(path)
             text = f"✓ {label}: {file_name}"
@@ -198,6 +201,15 @@ class CsvState(BaseState):
             screen.blit(surf, rect)
             y = rect.bottom + 6
 
+        if earlier:
+            surf = self.app.font_about.render(
+                f"✓ Sessions of the {earlier} previous playlist files", True, config.display.text_color
+            )
+            surf.set_colorkey(self.app.color_key)
+            rect = surf.get_rect(centerx=win_w // 2, top=y)
+            screen.blit(surf, rect)
+            y = rect.bottom + 6
+
         # Output directory
         out_dir = str(self.app.context.output_dir)
         dir_surf = self.app.font_about.render(
@@ -1,18 +1,23 @@
 """
-File selection (drag & drop) state.
+File selection state: drag & drop or pick a text from the stimulus library.
 """
 
 from __future__ import annotations
 
 import pygame
+from src.core.config import config
+from src.loaders.stimulus_source import PseudowordSource
 from src.states.base_state import BaseState
 
 
 class FileSelectionState(BaseState):
-    """Shows the drag & drop file selection screen."""
+    """Shows the drag & drop screen and the list of library texts."""
 
     def __init__(self, state_machine, name: str = "file_selection"):
         super().__init__(state_machine, name)
+        # Library list: selected entry and clickable rows of the last frame
+        self.selected: int = 0
+        self.row_rects: list[tuple[pygame.Rect, int]] = []
 
     @property
     def app(self):
@@ -20,13 +25,63 @@ class FileSelectionState(BaseState):
 
     def on_enter(self) -> None:
         self.app.tempo_inizio_stato = pygame.time.get_ticks()
+        # The index answers at once; the rescan catches up in background
+        self.app.library.refresh()
+        self.app.library.start_scan()
+        self._clamp_selection()
+
+    @property
+    def entries(self):
+        return self.app.library.entries
+
+    def _clamp_selection(self) -> None:
+        self.selected = max(0, min(self.selected, len(self.entries) - 1))
+
+    def _open(self, index: int) -> None:
+        if 0 <= index < len(self.entries):
+            self.selected = index
+            self.app.start_file_loading(self.entries[index].path)
+
+    @property
+    def is_loading(self) -> bool:
+        """Loading sub-state: a dropped file is being read on the worker."""
+        return self.app.loading.is_loading
 
     def handle_events(self, events: list[pygame.event.Event]) -> None:
         # File drop is handled globally in app.handle_global_events
-        pass
+        for event in events:
+            if self.is_loading:
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    self.app.cancel_file_loading()
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_DOWN:
+                    self.selected = min(self.selected + 1, len(self.entries) - 1)
+                elif event.key == pygame.K_UP:
+                    self.selected = max(self.selected - 1, 0)
+                elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+                    if self.app.playlist.paths:
+                        self.app.start_playlist()
+                    else:
+                        self._open(self.selected)
+                elif event.key == pygame.K_a and self.entries:
+                    # Queue the selected text in the playlist
+                    self.app.playlist.add(self.entries[self.selected].path)
+                elif event.key == pygame.K_c:
+                    self.app.playlist.clear()
+                elif event.key == pygame.K_p:
+                    # Generated pseudoword stream instead of a text
+                    self.app.start_source(PseudowordSource(
+                        seed=config.source.pseudoword_seed, count=config.source.pseudoword_count
+                    ))
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                for rect, index in self.row_rects:
+                    if rect.collidepoint(event.pos):
+                        self._open(index)
+                        break
 
     def update(self, delta_time: float) -> None:
-        pass
+        if self.app.library.poll(pygame.time.get_ticks()):
+            self._clamp_selection()
 
     def render(self, screen: pygame.Surface) -> None:
         """Render file selection/drop screen."""
@@ -37,15 +92,85 @@ class FileSelectionState(BaseState):
             screen.fill(self.app.menu_bg_color)
         
         win_w, win_h = screen.get_size()
-        
+
+        if self.is_loading:
+            self._render_loading(screen)
+            return
+
+        # With a library the prompt moves up to leave room for the list
+        prompt_y = win_h // 2 if not self.entries else int(win_h * 0.3)
+
          # Blinking "Press ENTER" text after fade complete
         cycle = pygame.time.get_ticks() % 1000
         if cycle < 500:
             prompt = self.app.font_attes.render(
-                "Drag a .txt or .doc/.docx file here to start",
+                "Drag a .txt, .docx, .odt or .epub file here to start (P: pseudowords)",
                 True,
                 self.app.text_color
             )
             prompt.set_colorkey((0, 0, 0))
-            prompt_rect = prompt.get_rect(center=(win_w // 2, win_h // 2))
+            prompt_rect = prompt.get_rect(center=(win_w // 2, prompt_y))
             screen.blit(prompt, prompt_rect)
+
+        self._render_library(screen, prompt_y + int(win_h * 0.06))
+
+    def _render_library(self, screen: pygame.Surface, top: int) -> None:
+        """Render the library texts around the selected one (UP/DOWN + ENTER or click)."""
+        win_w, win_h = screen.get_size()
+        self.row_rects = []
+        entries = self.entries
+        if not entries:
+            hint = self.app.font_ms.render(
+                f"Or put texts in {self.app.library.folder} to list them here", True, self.app.text_color
+            )
+            hint.set_colorkey(self.app.color_key)
+            screen.blit(hint, hint.get_rect(centerx=win_w // 2, top=win_h // 2 + 40))
+            return
+
+        queued = len(self.app.playlist.paths)
+        if queued:
+            title_text = f"Playlist: {queued} texts queued (A: add, C: clear, ENTER: start)"
+        else:
+            title_text = "Or choose a text (UP/DOWN, ENTER, A: add to a playlist):"
+        title = self.app.font_istruzioni.render(title_text, True, self.app.text_color)
+        title.set_colorkey(self.app.color_key)
+        title_rect = title.get_rect(centerx=win_w // 2, top=top)
+        screen.blit(title, title_rect)
+
+        rows = config.library.visible_rows
+        first = max(0, min(self.selected - rows // 2, len(entries) - rows))
+        y = title_rect.bottom + int(win_h * 0.02)
+        for index in range(first, min(first + rows, len(entries))):
+            entry = entries[index]
+            text = f"{entry.name}  -  {entry.word_count} words, {entry.phrase_count} sentences"
+            surf = self.app.font_istruzioni.render(text, True, self.app.text_color)
+            surf.set_colorkey(self.app.color_key)
+            rect = surf.get_rect(centerx=win_w // 2, top=y)
+            if index == self.selected:
+                pygame.draw.rect(screen, config.display.slider_knob_color, rect.inflate(16, 6), 2)
+            screen.blit(surf, rect)
+            self.row_rects.append((rect, index))
+            y = rect.bottom + int(win_h * 0.01)
+
+    def _render_loading(self, screen: pygame.Surface) -> None:
+        """Render the loading sub-state: file name, progress bar and cancel hint."""
+        win_w, win_h = screen.get_size()
+        job = self.app.loading.job
+
+        title = self.app.font_attes.render(f"Loading {job.name}...", True, self.app.text_color)
+        title.set_colorkey(self.app.color_key)
+        screen.blit(title, title.get_rect(centerx=win_w // 2, bottom=win_h // 2 - 20))
+
+        # Progress bar
+        bar_w = int(win_w * 0.4)
+        bar_h = 12
+        bar_x = (win_w - bar_w) // 2
+        bar_y = win_h // 2
+        pygame.draw.rect(screen, config.display.slider_track_color, (bar_x, bar_y, bar_w, bar_h), 2)
+        fill_w = int((bar_w - 4) * max(0.0, min(1.0, job.progress)))
+        if fill_w > 0:
+            pygame.draw.rect(screen, config.display.slider_knob_color, (bar_x + 2, bar_y + 2, fill_w, bar_h - 4))
+
+        hint = self.app.font_ms.render("Press ESC to cancel", True, self.app.text_color)
+        hint.set_colorkey(self.app.color_key)
+        screen.blit(hint, hint.get_rect(centerx=win_w // 2, top=bar_y + bar_h + 20))
@@ -7,6 +7,10 @@ from __future__ import annotations
 import pygame
 from src.states.base_state import BaseState
 from src.core.config import config, DisplayConfig
+from src.utils.chunks import CHUNK_MODES
+from src.utils.mask_patterns import MASK_KINDS
+from src.utils.presentation_order import ORDER_NAMES
+from src.utils.word_features import WORD_FILTERS
 
 
 class InstructionState(BaseState):
@@ -16,7 +20,13 @@ class InstructionState(BaseState):
         "- Press ENTER to start",
         "- SPACE: advance to next word (after mask)",
         "- P: pause / resume presentation",
-        "- R: restart from first word",
+        "- R: restart from the starting sentence",
+        "- UP / DOWN: previous / next sentence",
+        "- number + G: go to sentence N",
+        "- O (here): change the presentation order",
+        "- F (here): present only a selection of words",
+        "- K (here): show single words, word groups or whole sentences",
+        "- M (here): mask with text, random letters, a checkerboard or noise",
         "- I: minimize window (iconify)",
         "- E: reset the game",
         '- "-->": go back to the previous word',
@@ -25,19 +35,44 @@ class InstructionState(BaseState):
 
     def __init__(self, state_machine, name: str = "instruction"):
         super().__init__(state_machine, name)
+        # Starting sentence typed by the user (1-based, empty = first)
+        self.start_input: str = ""
 
     @property
     def app(self):
         return self.state_machine.app
 
     def on_enter(self) -> None:
-        pass
+        start_phrase = self.app.words.start_phrase
+        self.start_input = str(start_phrase + 1) if start_phrase else ""
 
     def handle_events(self, events: list[pygame.event.Event]) -> None:
         for event in events:
             if event.type == pygame.KEYDOWN:
                 if event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+                    self.app.words.start_phrase = max(0, int(self.start_input or "1") - 1)
                     self.state_machine.change_state("presentation")
+                elif event.key == pygame.K_o:
+                    current = config.order.name
+                    index = ORDER_NAMES.index(current) if current in ORDER_NAMES else -1
+                    config.order.name = ORDER_NAMES[(index + 1) % len(ORDER_NAMES)]
+                elif event.key == pygame.K_k:
+                    current = config.chunk.mode
+                    index = CHUNK_MODES.index(current) if current in CHUNK_MODES else -1
+                    config.chunk.mode = CHUNK_MODES[(index + 1) % len(CHUNK_MODES)]
+                elif event.key == pygame.K_m:
+                    current = config.mask.kind
+                    index = MASK_KINDS.index(current) if current in MASK_KINDS else -1
+                    config.mask.kind = MASK_KINDS[(index + 1) % len(MASK_KINDS)]
+                elif event.key == pygame.K_f:
+                    filters = ("",) + tuple(WORD_FILTERS)
+                    current = config.order.word_filter
+                    index = filters.index(current) if current in filters else 0
+                    config.order.word_filter = filters[(index + 1) % len(filters)]
+                elif event.key == pygame.K_BACKSPACE:
+                    self.start_input = self.start_input[:-1]
+                elif getattr(event, "unicode", "").isdigit() and len(self.start_input) < 6:
+                    self.start_input += event.unicode
 
     def update(self, delta_time: float) -> None:
         pass
@@ -67,6 +102,9 @@ class InstructionState(BaseState):
             nome_text = f'Loaded file: "{self.app.nome_file}"' if self.app.nome_file else "Loaded file: -"
         else:
             nome_text = f'Loaded file: "{self.app.nome_file[:25]}..."' if self.app.nome_file else "Loaded file: -"
+        playlist = self.app.playlist
+        if playlist.is_active and len(playlist.paths) > 1:
+            nome_text += f" ({playlist.position + 1}/{len(playlist.paths)})"
         nome_surf = self.app.font_attes.render(nome_text, True, self.app.text_color)
         nome_surf.set_colorkey(self.app.color_key)
         nome_rect = nome_surf.get_rect(centerx=win_w // 2, top=title_rect.bottom + int(win_h * 0.03))
@@ -74,15 +112,34 @@ class InstructionState(BaseState):
 
         # Word count
         num_text = f"Number of words: {self.app.num_parole}" if self.app.num_parole else "Number of words: -"
+        if self.app.words.stimuli is not None and self.app.words.is_streaming:
+            num_text = "Number of words: read while presenting"
         num_surf = self.app.font_attes.render(num_text, True, self.app.text_color)
         num_surf.set_colorkey(self.app.color_key)
         num_rect = num_surf.get_rect(centerx=win_w // 2, top=nome_rect.bottom + int(win_h * 0.01))
         screen.blit(num_surf, num_rect)
 
+        # Starting sentence (type a number to change it)
+        order_name = config.order.name.replace("_", " ")
+        start_text = f"Start from sentence: {self.start_input or 1} (type a number)   Order: {order_name}"
+        if config.chunk.mode == "words":
+            start_text += f"   Chunks: {config.chunk.words} words"
+        elif config.chunk.mode == "phrase":
+            start_text += "   Chunks: sentences"
+        if config.mask.kind != "text":
+            start_text += f"   Mask: {config.mask.kind}"
+        word_filter = WORD_FILTERS.get(config.order.word_filter)
+        if word_filter is not None:
+            start_text += f"   Only: {word_filter.label}"
+        start_surf = self.app.font_istruzioni.render(start_text, True, self.app.text_color)
+        start_surf.set_colorkey(self.app.color_key)
+        start_rect = start_surf.get_rect(centerx=win_w // 2, top=num_rect.bottom + int(win_h * 0.01))
+        screen.blit(start_surf, start_rect)
+
         # Commands title
         legend_surf = self.app.font_istruzioni.render("Main Commands", True, self.app.text_color)
         legend_surf.set_colorkey(self.app.color_key)
-        legend_rect = legend_surf.get_rect(centerx=win_w // 2, top=num_rect.bottom + int(win_h * 0.04))
+        legend_rect = legend_surf.get_rect(centerx=win_w // 2, top=start_rect.bottom + int(win_h * 0.03))
         screen.blit(legend_surf, legend_rect)
 
         # Command lines - use percentage of height for line spacing
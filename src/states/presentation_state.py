@@ -4,6 +4,8 @@ Presentation state (word/mask/end + pause overlay + slider).
 
 from __future__ import annotations
 
+from typing import Optional
+
 import pygame
 
 from src.core.config import config
@@ -26,17 +28,22 @@ class PresentationState(BaseState):
         self.session_started: bool = False
         self.word_shown_at_ms: int = 0
         self.current_logged_word: str = ""
+        self.onset_cue_latency_est_ms: Optional[float] = None
         self.end_start_time: int = 0
         self.end_transition_requested: bool = False
+        # Playlist: on the end frame until the next file has loaded
+        self.playlist_pending: bool = False
+        # Digits typed before G (go to sentence N)
+        self.phrase_input: str = ""
+        # Pattern mask of the current stimulus, picked at its onset (word index, surface)
+        self.mask_surface: Optional[pygame.Surface] = None
+        self.mask_index: int = -1
 
     @property
     def app(self):
         return self.state_machine.app
 
     def on_enter(self) -> None:
-        # Reset to first word when entering presentation state
-        if self.app.lista_parole:
-            self.app.set_word_index(-1)
         self.app.stato_presentazione = State.SHOW_WORD
         self.state_start_time = pygame.time.get_ticks()
         self.app.in_pausa = False
@@ -44,19 +51,79 @@ class PresentationState(BaseState):
         self.slider_dragging = False
         self.word_shown_at_ms = 0
         self.current_logged_word = ""
+        self.onset_cue_latency_est_ms = None
         self.end_start_time = 0
         self.end_transition_requested = False
+        self.playlist_pending = False
+        self.phrase_input = ""
+        self.mask_surface = None
+        self.mask_index = -1
+        self._start_session()
+
+    def _start_session(self) -> None:
+        """Apply the presentation order, go to the first word and start a new logging session."""
+        order = self._apply_order()
+        chunks = self._apply_chunking()
+        masks = self._apply_masks()
+        self.app.frame_composer.clear()
+        if self.app.lista_parole:
+            self.app.set_word_index(self.app.words.start_index)
 
-        # Start a new logging session
         self.session_started = False
         try:
             now_ms = pygame.time.get_ticks()
             self.app.controller.start_session(now_ms)
+            self.app.controller.record_settings(order.snapshot())
+            self.app.controller.record_settings(
+                chunks.snapshot() if chunks is not None else {"chunk_mode": "word", "chunk_words": None}
+            )
+            self.app.controller.record_settings(masks.snapshot())
+            if self.app.words.stimuli is not None:
+                self.app.controller.record_settings(self.app.words.stimuli.source.snapshot())
             self.session_started = True
             print(f"  ✓ Session started: {self.app.context.session.session_id}")
         except RuntimeError as e:
             print(f"  ⚠ Session not started: {e}")
 
+    def _apply_chunking(self):
+        """Apply the configured chunk mode and lay out every chunk for the current window width."""
+        words = self.app.words
+        try:
+            plan = words.set_chunking(config.chunk.mode, config.chunk.words)
+        except ValueError as e:
+            print(f"  ⚠ Chunks not applied: {e}")
+            plan = words.set_chunking("word")
+        if plan is not None:
+            self.app.chunk_layout.prepare(plan, self.app.screen_width)
+        return plan
+
+    def _apply_masks(self):
+        """Pre-generate the pattern masks for the word widths of the loaded text."""
+        pool = self.app.mask_pool
+        try:
+            generated = pool.prepare(self.app.stimulus_sizing, config.mask.kind)
+        except ValueError as e:
+            print(f"  ⚠ Masks not applied: {e}")
+            pool.prepare(self.app.stimulus_sizing, "text")
+            generated = 0
+        if generated:
+            print(f"  ✓ {generated} {pool.kind} masks generated")
+        return pool
+
+    def _apply_order(self):
+        """Apply the configured order and word filter, dropping what the stimuli do not allow."""
+        words = self.app.words
+        attempts = dict.fromkeys((
+            (config.order.name, config.order.seed, config.order.word_filter),
+            (config.order.name, config.order.seed, ""),
+        ))
+        for name, seed, word_filter in attempts:
+            try:
+                return words.set_order(name, seed, word_filter)
+            except ValueError as e:
+                print(f"  ⚠ Order not applied: {e}")
+        return words.set_order("sequential")
+
     def handle_events(self, events: list[pygame.event.Event]) -> None:
         for event in events:
             # Slider mouse handling (only when not paused)
@@ -93,9 +160,22 @@ class PresentationState(BaseState):
                 elif event.key == pygame.K_SPACE:
                     self.app.avanti = True
                 elif event.key == pygame.K_r:
-                    self.app.set_word_index(-1)
+                    self.app.set_word_index(self.app.words.start_index)
                     self.app.stato_presentazione = State.SHOW_WORD
                     self.state_start_time = pygame.time.get_ticks()
+                elif event.key in (pygame.K_DOWN, pygame.K_UP):
+                    if event.key == pygame.K_DOWN:
+                        moved = self.app.words.go_next_phrase()
+                    else:
+                        moved = self.app.words.go_previous_phrase()
+                    self._show_after_jump(moved)
+                elif getattr(event, "unicode", "").isdigit() and len(self.phrase_input) < 6:
+                    self.phrase_input += event.unicode
+                elif event.key == pygame.K_g and self.phrase_input:
+                    # Sentences are numbered from 1 on screen
+                    moved = self.app.words.go_to_phrase(int(self.phrase_input) - 1)
+                    self.phrase_input = ""
+                    self._show_after_jump(moved)
                 elif event.key == pygame.K_RIGHT:
                     self.app.go()
                     self.state_start_time = pygame.time.get_ticks()
@@ -108,9 +188,10 @@ class PresentationState(BaseState):
                             stimulus_text=current_word,
                             shown_at_ms=self.word_shown_at_ms if self.word_shown_at_ms > 0 else now_ms,
                             hidden_at_ms=now_ms,
-                            stimulus_type=StimulusType.WORD,
+                            stimulus_type=StimulusType(self.app.words.current_stimulus_type),
                             stimulus_source=self.app.nome_file or "",
                             duration_ms=self.app.durata_parola_ms,
+                            cue_onset_latency_est_ms=self.onset_cue_latency_est_ms,
                             word_level_speed=self.app.durata_parola_ms,
                             game_state=self.app.stato_presentazione,
                             is_correct=False,
@@ -120,6 +201,13 @@ class PresentationState(BaseState):
                     self.app.back()
                     self.state_start_time = pygame.time.get_ticks()
 
+    def _show_after_jump(self, moved: bool) -> None:
+        """Show the word reached by a sentence jump; it is a new stimulus (onset, cue, mask) if the jump moved."""
+        self.app.stato_presentazione = State.SHOW_WORD
+        self.state_start_time = pygame.time.get_ticks()
+        if moved:
+            self._on_word_onset(self.state_start_time)
+
     def _window_to_surface_coords(self, pos: tuple) -> tuple:
         """Convert mouse coordinates from window space to surface space."""
         window_x, window_y = pos
@@ -193,14 +281,13 @@ class PresentationState(BaseState):
                 self.state_start_time = pygame.time.get_ticks()
                 self.app.avanti = False
                 # Track word shown time
-                self.word_shown_at_ms = pygame.time.get_ticks()
-                self.current_logged_word = self.app.parola_corrente or ""
+                self._on_word_onset(pygame.time.get_ticks())
             # Track word shown time when word first appears
             elif self.app.indice_parola >= 0 and self.word_shown_at_ms == 0:
-                self.word_shown_at_ms = self.state_start_time
-                self.current_logged_word = self.app.parola_corrente or ""
+                self._on_word_onset(self.state_start_time)
             # Normal case: auto-advance after duration
             elif self.app.indice_parola >= 0 and elapsed >= self.app.durata_parola_ms:
+                offset_cue_latency_est_ms = self.app.cues.play_offset()
                 # Log the word event when it gets hidden
                 if self.session_started and self.word_shown_at_ms > 0:
                     now_ms = pygame.time.get_ticks()
@@ -208,33 +295,93 @@ class PresentationState(BaseState):
                         stimulus_text=self.current_logged_word,
                         shown_at_ms=self.word_shown_at_ms,
                         hidden_at_ms=now_ms,
-                        stimulus_type=StimulusType.WORD,
+                        stimulus_type=StimulusType(self.app.words.current_stimulus_type),
                         stimulus_source=self.app.nome_file or "",
                         duration_ms=self.app.durata_parola_ms,
+                        cue_onset_latency_est_ms=self.onset_cue_latency_est_ms,
+                        cue_offset_latency_est_ms=offset_cue_latency_est_ms,
                         word_level_speed=self.app.durata_parola_ms,
                         game_state=self.app.stato_presentazione,
                     )
                 self.app.stato_presentazione = State.SHOW_MASK
                 self.state_start_time = pygame.time.get_ticks()
                 self.word_shown_at_ms = 0
+                words = self.app.words
+                if words.chunks is not None:
+                    # The next chunk is rendered while the mask is shown
+                    self.app.chunk_layout.prerender(words.chunks, words.next_chunk, self.app.screen_width)
 
         elif self.app.stato_presentazione == State.SHOW_MASK:
             if elapsed >= self.app.durata_maschera_ms and self.app.avanti:
-                next_index = self.app.indice_parola + 1
-                if next_index < len(self.app.lista_parole):
-                    self.app.set_word_index(next_index)
+                # Next word in presentation order (loads more text if needed)
+                if self.app.words.go_next():
                     self.app.stato_presentazione = State.SHOW_WORD
                     self.state_start_time = pygame.time.get_ticks()
                     # Track new word shown time
-                    self.word_shown_at_ms = pygame.time.get_ticks()
-                    self.current_logged_word = self.app.parola_corrente or ""
+                    self._on_word_onset(pygame.time.get_ticks())
                 else:
-                    self.app.stato_presentazione = State.END
-                    self.end_start_time = pygame.time.get_ticks()
                     # End session (export will be handled by CsvState)
                     self._end_session()
+                    if not self._advance_playlist():
+                        self.app.stato_presentazione = State.END
+                        self.end_start_time = pygame.time.get_ticks()
+                        # Playlist: stay on the end frame until the next file has loaded
+                        self.playlist_pending = self.app.playlist.has_next
                 self.app.avanti = False
 
+        elif self.app.stato_presentazione == State.END and self.playlist_pending:
+            if self._advance_playlist():
+                self.playlist_pending = False
+            elif not self.app.playlist.has_next:
+                # The remaining files failed to load
+                self.playlist_pending = False
+                self.end_start_time = pygame.time.get_ticks()
+
+    def _advance_playlist(self) -> bool:
+        """Go on with the next playlist file in a new session, if it has loaded."""
+        if not self.app.advance_playlist():
+            return False
+        self._start_session()
+        self.app.stato_presentazione = State.SHOW_WORD
+        self.state_start_time = pygame.time.get_ticks()
+        self._on_word_onset(self.state_start_time)
+        return True
+
+    def _on_word_onset(self, shown_at_ms: int) -> None:
+        """Track the word shown time and fire the onset audio cue."""
+        self.word_shown_at_ms = shown_at_ms
+        self.current_logged_word = self.app.parola_corrente or ""
+        self.onset_cue_latency_est_ms = self.app.cues.play_onset()
+        self._pick_mask()
+        words = self.app.words
+        if words.chunks is not None and self.mask_surface is None:
+            self.app.chunk_layout.prerender(words.chunks, words.current_chunk, self.app.screen_width, masked=True)
+
+    def _pick_mask(self) -> None:
+        """Take the pattern mask of the current stimulus from the pool (at onset, not at mask onset)."""
+        pool = self.app.mask_pool
+        words = self.app.words
+        self.mask_index = words.current_index
+        self.mask_surface = None
+        if not pool.is_pattern or self.app.indice_parola < 0:
+            return
+        width = self.app.screen_width
+        if words.chunks is not None:
+            layout = self.app.chunk_layout
+            size_class = layout.prepare(words.chunks, width).size_class[words.current_chunk]
+            stimulus = layout.surface(words.chunks, words.current_chunk, width)
+            self.mask_surface = pool.mask(size_class, *stimulus.get_size())
+        else:
+            sizing = self.app.stimulus_sizing
+            size_class = sizing.size_class(words, width)
+            word = self.app.parola_corrente or ""
+            if words.stimuli is not None:
+                # Source stimuli are not memoized in TextMetrics
+                text_width = sizing.form_width(word, width)
+            else:
+                text_width = self.app.text_metrics.width(size_class, word)
+            self.mask_surface = pool.mask(size_class, text_width)
+
     def _end_session(self) -> None:
         """End the logging session (without exporting - CsvState handles that)."""
         if not self.session_started:
@@ -253,44 +400,107 @@ class PresentationState(BaseState):
             self._render_pause(screen)
             return
 
-        # Background
+        # Don't render text during fade transition
+        if self._is_fade_active():
+            self._render_background(screen)
+            return
+
+        state = self.app.stato_presentazione
+        if (state == State.SHOW_MASK and self.app.mask_pool.is_pattern
+                and self.mask_index != self.app.words.current_index):
+            # Moved to another word while it was shown
+            self._pick_mask()
+
+        if state == State.END or not config.display.precompose_frames:
+            self._draw_frame(screen, state)
+        else:
+            # The frame was composed offscreen while the previous one was shown:
+            # a transition is one full-surface blit
+            composer = self.app.frame_composer
+            size = screen.get_size()
+            key = self._frame_key(size, state)
+            already_shown = key == composer.shown
+            composer.present(screen, key, lambda frame: self._draw_frame(frame, state))
+            if already_shown:
+                # Nothing changes on this frame: idle time to compose the next one
+                self._precompose_next(size)
+
+        if state == State.END:
+            # Auto-transition to csv_export after a short delay
+            if not self.end_transition_requested and self.end_start_time > 0 and not self.playlist_pending:
+                elapsed_end = pygame.time.get_ticks() - self.end_start_time
+                if elapsed_end > 2000:
+                    self.end_transition_requested = True
+                    self.app.request_state_change("csv_export")
+
+    def _render_background(self, screen: pygame.Surface) -> None:
         if self.app.bg_istructions:
             screen.blit(self.app.bg_istructions, (0, 0))
         else:
             screen.fill(self.app.bg_color)
 
-        # Don't render text during fade transition
-        if self._is_fade_active():
-            return
-
-        # Slider
+    def _draw_frame(self, screen: pygame.Surface, state: State) -> None:
+        """Draw a whole presentation frame for `state` (the current stimulus) on `screen`."""
+        self._render_background(screen)
         self._render_slider(screen)
 
         # Word display
-        if self.app.stato_presentazione == State.SHOW_WORD:
+        if state == State.SHOW_WORD:
             # Show word only if index is valid (>= 0)
-            if self.app.indice_parola >= 0:
-                self._render_centered_text(screen, self.app.parola_corrente)
+            if self.app.words.chunks is not None:
+                self._render_chunk(screen, masked=False)
+            elif self.app.indice_parola >= 0:
+                self._render_centered_text(screen, self.app.parola_corrente, self._stimulus_font(screen))
             else:
                 self._render_centered_text(screen, "Press SPACE to start")
-        elif self.app.stato_presentazione == State.SHOW_MASK:
-            if self.app.indice_parola >= 0:
-                self._render_centered_text(screen, self.app.parola_mascherata)
-        elif self.app.stato_presentazione == State.END:
+        elif state == State.SHOW_MASK:
+            if self.app.mask_pool.is_pattern and self.app.indice_parola >= 0:
+                self._render_mask(screen)
+            elif self.app.words.chunks is not None:
+                self._render_chunk(screen, masked=True)
+            elif self.app.indice_parola >= 0:
+                # The mask takes the size of its word
+                self._render_centered_text(screen, self.app.parola_mascherata, self._stimulus_font(screen))
+        elif state == State.END:
             self._render_centered_text(screen, "End of list")
 
         # Panels
-        if self.app.stato_presentazione != State.END:
+        if state != State.END:
             self._render_word_panel(screen)
             self._render_phrases_panel(screen)
         else:
             self._render_end_panel(screen)
-            # Auto-transition to csv_export after a short delay
-            if not self.end_transition_requested and self.end_start_time > 0:
-                elapsed_end = pygame.time.get_ticks() - self.end_start_time
-                if elapsed_end > 2000:
-                    self.end_transition_requested = True
-                    self.app.request_state_change("csv_export")
+
+    def _frame_key(self, size: tuple[int, int], state: State) -> tuple:
+        """Everything a presentation frame shows: frames with the same key are identical."""
+        words = self.app.words
+        if state == State.SHOW_MASK:
+            stimulus = self.mask_surface if self.app.mask_pool.is_pattern else self.app.parola_mascherata
+        else:
+            stimulus = self.app.parola_corrente
+        return (
+            state, size, self.app.layout.fonts_version,
+            self.app.indice_parola, stimulus, words.chunks is not None,
+            words.order_position, words.order_size, words.phrase_index, words.phrase_count,
+            self.app.durata_parola_ms, self.phrase_input,
+        )
+
+    def _precompose_next(self, size: tuple[int, int]) -> None:
+        """Compose offscreen the frame that follows the one on screen (mask, or next stimulus)."""
+        if self.app.indice_parola < 0:
+            return
+        composer = self.app.frame_composer
+        state = self.app.stato_presentazione
+        if state == State.SHOW_WORD:
+            next_state = State.SHOW_MASK
+            composer.prepare(self._frame_key(size, next_state), size,
+                             lambda frame: self._draw_frame(frame, next_state))
+        elif state == State.SHOW_MASK:
+            next_state = State.SHOW_WORD
+            with self.app.words.peek_next() as has_next:
+                if has_next:
+                    composer.prepare(self._frame_key(size, next_state), size,
+                                     lambda frame: self._draw_frame(frame, next_state))
 
     def _render_pause(self, screen: pygame.Surface) -> None:
         """Render pause overlay with instruction background."""
@@ -307,16 +517,36 @@ class PresentationState(BaseState):
         pause_rect = pause_surf.get_rect(center=(win_w // 2, win_h // 2))
         screen.blit(pause_surf, pause_rect)
 
-    def _render_centered_text(self, screen: pygame.Surface, text: str) -> None:
-        """Render text centered on screen."""
+    def _stimulus_font(self, screen: pygame.Surface) -> pygame.font.Font:
+        """Largest stimulus font the current word fits in (size classes computed at load)."""
+        size_class = self.app.stimulus_sizing.size_class(self.app.words, screen.get_width())
+        return self.app.layout.stimulus_fonts[size_class]
+
+    def _render_centered_text(self, screen: pygame.Surface, text: str,
+                              font: Optional[pygame.font.Font] = None) -> None:
+        """Render text centered on screen (in the main font unless `font` is given)."""
         win_w, win_h = screen.get_size()
-        text_surf = self.app.font.render(text, True, config.display.text_color)
+        text_surf = (font or self.app.font).render(text, True, config.display.text_color)
         text_surf.set_colorkey((self.app.color_key))
         text_rect = text_surf.get_rect(
             center=(win_w // 2, win_h // 2)
         )
         screen.blit(text_surf, text_rect)
 
+    def _render_chunk(self, screen: pygame.Surface, masked: bool) -> None:
+        """Blit the current chunk (or its mask), laid out and rendered ahead of time."""
+        win_w, win_h = screen.get_size()
+        words = self.app.words
+        surface = self.app.chunk_layout.surface(words.chunks, words.current_chunk, win_w, masked)
+        screen.blit(surface, surface.get_rect(center=(win_w // 2, win_h // 2)))
+
+    def _render_mask(self, screen: pygame.Surface) -> None:
+        """Blit the pattern mask picked at the onset of the stimulus."""
+        if self.mask_surface is None:
+            return
+        win_w, win_h = screen.get_size()
+        screen.blit(self.mask_surface, self.mask_surface.get_rect(center=(win_w // 2, win_h // 2)))
+
     def _render_slider(self, screen: pygame.Surface) -> None:
         """Render duration slider with ticks and labels."""
         win_w, win_h = screen.get_size()
@@ -378,8 +608,9 @@ class PresentationState(BaseState):
         """Render word count panel."""
         win_w, win_h = screen.get_size()
         # Display as 1-based with total+1 (e.g., 1/11, 2/11, ..., 10/11 for 10 words)
-        human_index = max(0, self.app.indice_parola) + 1
-        total = len(self.app.lista_parole) + 1
+        # Progress follows the presentation order (same as the word index when sequential)
+        human_index = self.app.words.order_position + 1
+        total = self.app.words.order_size + 1
         text_surf = self.app.font.render(f"Word: {human_index}/{total}", True, config.display.text_color)
         text_surf.set_colorkey(self.app.color_key)
         text_surf.set_alpha(230)
@@ -397,7 +628,10 @@ class PresentationState(BaseState):
         win_w, win_h = screen.get_size()
         total = self.app.phrases_total
         phrases = (self.app.phrases_index + 1) if total > 0 else 0
-        text_surf = self.app.font.render(f"Phrases: {phrases}/{total}", True, config.display.text_color)
+        label = f"Phrases: {phrases}/{total}"
+        if self.phrase_input:
+            label += f"  (G: go to {self.phrase_input})"
+        text_surf = self.app.font.render(label, True, config.display.text_color)
         text_surf.set_colorkey(self.app.color_key)
         text_surf.set_alpha(230)
         # Use relative positioning
@@ -412,7 +646,8 @@ class PresentationState(BaseState):
     def _render_end_panel(self, screen: pygame.Surface) -> None:
         """Render end of words message."""
         win_w, win_h = screen.get_size()
-        text_surf = self.app.font.render("The words are ended", True, config.display.text_color)
+        message = "Loading the next text..." if self.playlist_pending else "The words are ended"
+        text_surf = self.app.font.render(message, True, config.display.text_color)
         text_surf.set_colorkey(self.app.color_key)
         text_surf.set_alpha(230)
         offset_y = int(win_h * 0.05)
@@ -0,0 +1,225 @@
+"""
+Pre-decoded asset pack.
+
+Bundles every image listed in ``PathConfig`` into a single file holding raw
+pixel data plus a JSON index, so frozen builds can skip PNG inflation at
+startup. The pack is memory-mapped and entries are turned into surfaces with
+``pygame.image.frombuffer``.
+
+Layout::
+
+    b"TSPK" | version (u32) | index length (u32) | index (UTF-8 JSON) | pixel data
+
+Each index entry maps an asset's relative path to its offset/length in the
+pixel data, its size, pixel format and the size/mtime of the source file it
+was built from. Entries whose source changed are treated as stale and the
+caller falls back to the loose file.
+
+Generate the pack with::
+
+    python -m src.utils.asset_pack
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from dataclasses import fields
+from typing import Any, Dict, Optional
+
+import pygame
+
+from src.utils.paths import resource_path
+
+PACK_MAGIC = b"TSPK"
+PACK_VERSION = 1
+PACK_FILE = "assets/tachistostory.pack"
+
+_HEADER = struct.Struct("<4sII")
+_ALIGN = 16
+
+
+def _is_bundled() -> bool:
+    return bool(getattr(sys, "frozen", False) or getattr(sys, "__compiled__", False))
+
+
+def _pack_asset_paths() -> list[str]:
+    """Return every image path declared in PathConfig."""
+    from src.core.config import PathConfig
+
+    defaults = PathConfig()
+    return [getattr(defaults, f.name) for f in fields(PathConfig)]
+
+
+class AssetPack:
+    """Read-only view over a memory-mapped asset pack."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self._view = memoryview(self._mm)
+        try:
+            self._read_index()
+        except (ValueError, KeyError, TypeError, struct.error) as e:
+            self.close()
+            raise ValueError(f"Unreadable asset pack: {path} ({e})") from e
+
+    def _read_index(self) -> None:
+        """Parse the header and index, checking that every entry lies inside the file."""
+        size = len(self._mm)
+        magic, version, index_len = _HEADER.unpack_from(self._mm, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError("unsupported format")
+
+        index_start = _HEADER.size
+        if index_start + index_len > size:
+            raise ValueError("truncated index")
+        self._index: Dict[str, Dict[str, Any]] = json.loads(
+            bytes(self._view[index_start:index_start + index_len]).decode("utf-8")
+        )
+        self._data_start = _align(index_start + index_len)
+        for entry in self._index.values():
+            if self._data_start + entry["offset"] + entry["length"] > size:
+                raise ValueError("truncated pixel data")
+
+    def __contains__(self, relative_path: str) -> bool:
+        return relative_path in self._index
+
+    def is_fresh(self, relative_path: str) -> bool:
+        """Return True if the entry still matches its loose source file.
+
+        A missing source is fine (the pack may be shipped alone). In
+        development the mtime is checked as well; bundlers do not always
+        preserve it, so frozen builds rely on the size only.
+        """
+        entry = self._index.get(relative_path)
+        if entry is None:
+            return False
+        try:
+            st = os.stat(resource_path(relative_path))
+        except OSError:
+            return True
+        if st.st_size != entry["source_size"]:
+            return False
+        if not _is_bundled() and int(st.st_mtime) != entry["source_mtime"]:
+            return False
+        return True
+
+    def load_surface(self, relative_path: str) -> pygame.Surface:
+        """Wrap the pre-decoded pixels of an entry in a Surface (no copy)."""
+        entry = self._index[relative_path]
+        start = self._data_start + entry["offset"]
+        buffer = self._view[start:start + entry["length"]]
+        return pygame.image.frombuffer(buffer, (entry["width"], entry["height"]), entry["format"])
+
+    def close(self) -> None:
+        self._view.release()
+        self._mm.close()
+        self._file.close()
+
+
+def _align(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+_pack: Optional[AssetPack] = None
+_pack_checked = False
+
+
+def get_asset_pack() -> Optional[AssetPack]:
+    """Return the shared asset pack, or None if it is missing or unreadable."""
+    global _pack, _pack_checked
+    if _pack_checked:
+        return _pack
+    _pack_checked = True
+
+    path = resource_path(PACK_FILE)
+    if not os.path.exists(path):
+        return None
+    try:
+        _pack = AssetPack(path)
+    except Exception as e:
+        print(f"  ⚠ Asset pack ignored: {e}")
+        _pack = None
+    return _pack
+
+
+def load_packed_surface(relative_path: str) -> Optional[pygame.Surface]:
+    """Return a surface from the asset pack, or None to use the loose file."""
+    pack = get_asset_pack()
+    if pack is None or relative_path not in pack or not pack.is_fresh(relative_path):
+        return None
+    return pack.load_surface(relative_path)
+
+
+# ----------------------------------------------------------------------------
+# Generator
+# ----------------------------------------------------------------------------
+
+def build_asset_pack(output_path: Optional[str] = None, root: str = ".") -> str:
+    """Decode every PathConfig image and write them into a single pack file."""
+    output_path = output_path or os.path.join(root, PACK_FILE)
+
+    index: Dict[str, Dict[str, Any]] = {}
+    blobs: list[bytes] = []
+    offset = 0
+    for relative_path in _pack_asset_paths():
+        source = os.path.join(root, relative_path)
+        surface = pygame.image.load(source)
+        fmt = "RGBA" if surface.get_bitsize() == 32 or surface.get_alpha() is not None else "RGB"
+        data = pygame.image.tobytes(surface, fmt)
+        st = os.stat(source)
+        index[relative_path] = {
+            "offset": offset,
+            "length": len(data),
+            "width": surface.get_width(),
+            "height": surface.get_height(),
+            "format": fmt,
+            "source_size": st.st_size,
+            "source_mtime": int(st.st_mtime),
+        }
+        padding = _align(len(data)) - len(data)
+        blobs.append(data + b"\0" * padding)
+        offset += len(data) + padding
+
+    index_bytes = json.dumps(index, sort_keys=True).encode("utf-8")
+    header = _HEADER.pack(PACK_MAGIC, PACK_VERSION, len(index_bytes))
+    head = header + index_bytes
+    head += b"\0" * (_align(len(head)) - len(head))
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(head)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.utils.asset_pack",
+        description="Build the pre-decoded asset pack used by bundled builds.",
+    )
+    parser.add_argument("--output", help=f"Output file (default: {PACK_FILE}).")
+    parser.add_argument("--root", default=".", help="Project root containing assets/.")
+    args = parser.parse_args(argv)
+
+    path = build_asset_pack(args.output, root=args.root)
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    print(f"  ✓ Asset pack written: {path} ({size_mb:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
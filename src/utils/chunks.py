@@ -0,0 +1,94 @@
+"""
+Chunked presentation: groups of consecutive words shown together.
+
+A `ChunkPlan` splits a complete corpus into chunks that never cross a
+sentence boundary:
+
+- ``word``: one word per chunk (the classic RSVP presentation, no plan).
+- ``words``: up to N words of the same sentence per chunk.
+- ``phrase``: one whole sentence per chunk.
+
+No chunk has more than ``MAX_CHUNK_WORDS`` words: longer sentences (a
+list with no punctuation is a single sentence) are split into chunks of
+that size, which still have to fit a few lines of the window.
+
+The plan is one 32-bit entry per chunk (the index of its first word);
+the chunk of a word is found by bisection. Chunk text and mask are joined
+from the corpus words and masks, so they match what the word mode shows.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from typing import Optional
+
+CHUNK_MODES = ("word", "words", "phrase")
+
+# Longest chunk, in words
+MAX_CHUNK_WORDS = 64
+
+# Value of src.logging.session_logger.StimulusType logged for each mode
+CHUNK_STIMULUS_TYPES = {"word": "word", "words": "phrase", "phrase": "sentence"}
+
+
+class ChunkPlan:
+    """Start word of every chunk of a complete corpus."""
+
+    def __init__(self, corpus, mode: str, size: int = 3):
+        if mode not in CHUNK_MODES or mode == "word":
+            raise ValueError(f"Unknown chunk mode: {mode!r} (expected one of {', '.join(CHUNK_MODES[1:])})")
+        self.corpus = corpus
+        self.mode = mode
+        self.size = min(max(1, size), MAX_CHUNK_WORDS) if mode == "words" else 0
+        self.stimulus_type = CHUNK_STIMULUS_TYPES[mode]
+
+        first_words = corpus.phrase_first_words
+        word_count = corpus.word_count
+        starts = array("I")
+        for phrase in range(len(first_words) - 1):
+            start = first_words[phrase]
+            end = first_words[phrase + 1] if phrase + 2 < len(first_words) else word_count
+            if start >= end:
+                continue
+            starts.extend(range(start, end, self.size or MAX_CHUNK_WORDS))
+        if not starts and word_count:
+            starts.append(0)
+        self.starts = starts
+
+    @property
+    def count(self) -> int:
+        return len(self.starts)
+
+    def chunk_of(self, index: int) -> int:
+        """Chunk containing word `index`."""
+        return max(0, bisect_right(self.starts, index) - 1)
+
+    def word_range(self, chunk: int) -> tuple[int, int]:
+        """Word indices [start, end) of `chunk`."""
+        starts = self.starts
+        end = starts[chunk + 1] if chunk + 1 < len(starts) else self.corpus.word_count
+        return starts[chunk], end
+
+    def words(self, chunk: int) -> list[str]:
+        start, end = self.word_range(chunk)
+        return self.corpus.words[start:end]
+
+    def text(self, chunk: int) -> str:
+        return " ".join(self.words(chunk))
+
+    def masks(self, chunk: int) -> list[str]:
+        start, end = self.word_range(chunk)
+        mask = self.corpus.mask
+        return [mask(i) for i in range(start, end)]
+
+    def snapshot(self) -> dict:
+        """Settings to record with the session."""
+        return {"chunk_mode": self.mode, "chunk_words": self.size or None}
+
+
+def make_chunk_plan(corpus, mode: str, size: int = 3) -> Optional[ChunkPlan]:
+    """Plan for `mode` (None for ``word``); raises ValueError for an unknown mode."""
+    if mode == "word":
+        return None
+    return ChunkPlan(corpus, mode, size)
@@ -0,0 +1,434 @@
+"""
+Compiled corpus files.
+
+A compiled corpus (``.tscorpus``) holds a tokenized stimulus ready to be
+memory-mapped: loading one parses a fixed-size header and wraps the rest of
+the file in memoryviews, so neither the text nor the offset arrays are
+copied or decoded up front. Word, phrase and mask strings are decoded from
+the mapping when they are indexed.
+
+Layout (little-endian)::
+
+    header
+    text       UTF-8 document text
+    padding    to a 4-byte boundary
+    word_starts, word_lengths        uint32[words]   character spans in `text`
+    word_to_phrase_map               uint32[words]
+    phrase_starts, phrase_ends       uint32[phrases] character spans in `text`
+    byte word starts, lengths        uint32[words]   byte spans in `text`
+    byte phrase starts, ends         uint32[phrases] byte spans in `text`
+    mask_starts                      uint32[words + 1] spans in `masks`
+    masks      ASCII masks of every word (default style), back to back
+
+The header records the tokenizer version and the SHA-256/size of the
+source file, so session logs keep referring to the original stimulus.
+
+Compile a folder of stimuli (.txt, .docx, .odt, .epub) with::
+
+    python -m src.utils.compiled_corpus STIMULI_DIR [--output OUT_DIR]
+
+Sources whose content hash is unchanged since the last run are skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.utils.corpus import Corpus, CorpusPhrases, CorpusWords
+from src.loaders.documents import extract_document_text, is_document
+from src.utils.text import DEFAULT_MASK_STYLE, TOKENIZER_VERSION, MaskStyle, decode_text
+
+COMPILED_MAGIC = b"TSCC"
+COMPILED_VERSION = 2
+COMPILED_EXTENSION = ".tscorpus"
+MANIFEST_FILE = "manifest.json"
+SOURCE_EXTENSIONS = (".txt", ".docx", ".odt", ".epub")
+
+# magic, version, tokenizer version, source sha256, source size,
+# words, phrase spans, phrases_total, text bytes, mask bytes
+_HEADER = struct.Struct("<4sII32sQIIIQQ")
+
+
+class _ByteSpans:
+    """Words/phrases of a CompiledCorpus, sliced by their byte spans."""
+
+    __slots__ = ()
+
+    def _slice_text(self, start: int, end: int) -> str:
+        return str(self._corpus._text[start:end], "utf-8")
+
+
+class _CompiledWords(_ByteSpans, CorpusWords):
+    __slots__ = ()
+
+    def _span(self, index: int) -> tuple[int, int]:
+        start = self._corpus._byte_word_starts[index]
+        return start, start + self._corpus._byte_word_lengths[index]
+
+
+class _CompiledPhrases(_ByteSpans, CorpusPhrases):
+    __slots__ = ()
+
+    def _span(self, index: int) -> tuple[int, int]:
+        return self._corpus._byte_phrase_starts[index], self._corpus._byte_phrase_ends[index]
+
+
+class CompiledCorpus(Corpus):
+    """Read-only corpus backed by a memory-mapped compiled file.
+
+    The public spans are character offsets, as in Corpus. The file also
+    stores them as byte offsets into the UTF-8 text, so words and phrases
+    decode just their own bytes.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        with open(path, "rb") as file:
+            try:
+                self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty file
+                raise ValueError(f"Not a compiled corpus: {path}") from None
+        view = memoryview(self._mm)
+        try:
+            header = self._check_layout(view)
+        except ValueError:
+            # Nothing else refers to the mapping yet: unmap the rejected file
+            view.release()
+            self._mm.close()
+            raise
+        (_, _, _, source_sha256, source_size, words, phrases, phrases_total, text_len, masks_len) = header
+
+        pos = _HEADER.size
+        self._text = view[pos:pos + text_len]
+        pos = _align4(pos + text_len)
+
+        def take(count: int):
+            nonlocal pos
+            section = view[pos:pos + count * 4]
+            pos += count * 4
+            if sys.byteorder == "little":
+                return section.cast("I")
+            # Big-endian hosts pay for one copy
+            arr = array("I", bytes(section))
+            arr.byteswap()
+            return arr
+
+        self.word_starts = take(words)
+        self.word_lengths = take(words)
+        self.word_to_phrase_map = take(words)
+        self.phrase_starts = take(phrases)
+        self.phrase_ends = take(phrases)
+        self._byte_word_starts = take(words)
+        self._byte_word_lengths = take(words)
+        self._byte_phrase_starts = take(phrases)
+        self._byte_phrase_ends = take(phrases)
+        self._mask_starts = take(words + 1)
+        self._masks = view[pos:pos + masks_len]
+        # Masks of another style, computed by set_mask_style
+        self._style_masks: Optional[str] = None
+        self._style_mask_starts: Optional[array] = None
+
+        self.phrases_total = phrases_total
+        self.source_sha256 = source_sha256.hex()
+        self.source_size = source_size
+        self.is_complete = True
+        self.words = _CompiledWords(self)
+        self.phrases = _CompiledPhrases(self)
+
+    def _check_layout(self, view: memoryview) -> tuple:
+        """Unpack the header, checking that the sections it describes fill the file exactly."""
+        if len(view) < _HEADER.size:
+            raise ValueError(f"Not a compiled corpus: {self.path}")
+        header = _HEADER.unpack_from(view, 0)
+        magic, version, tokenizer_version = header[:3]
+        words, phrases, _, text_len, masks_len = header[5:]
+        if magic != COMPILED_MAGIC or version != COMPILED_VERSION:
+            raise ValueError(f"Not a compiled corpus: {self.path}")
+        if tokenizer_version != TOKENIZER_VERSION:
+            raise ValueError(f"Compiled with another tokenizer version, recompile: {self.path}")
+        # 6 arrays per word (mask_starts has one more entry), 4 per phrase
+        arrays_len = 4 * (6 * words + 1 + 4 * phrases)
+        if _align4(_HEADER.size + text_len) + arrays_len + masks_len != len(view):
+            raise ValueError(f"Not a compiled corpus (truncated or corrupted): {self.path}")
+        return header
+
+    @property
+    def text(self) -> str:
+        return str(self._text, "utf-8")
+
+    def _byte_offset(self, offset: int) -> int:
+        """UTF-8 offset of character `offset`, counted from the nearest word start before it."""
+        word = bisect_right(self.word_starts, offset) - 1
+        if word < 0:
+            char_base = byte_base = 0
+        else:
+            char_base, byte_base = self.word_starts[word], self._byte_word_starts[word]
+        skip = offset - char_base
+        # At most 4 bytes per character; a character cut at the end is dropped
+        head = str(self._text[byte_base:byte_base + 4 * skip], "utf-8", "ignore")[:skip]
+        return byte_base + len(head.encode("utf-8"))
+
+    def text_slice(self, start: int, end: int) -> str:
+        return str(self._text[self._byte_offset(start):self._byte_offset(end)], "utf-8")
+
+    def iter_words(self) -> Iterator[str]:
+        text = self._text
+        for start, length in zip(self._byte_word_starts, self._byte_word_lengths):
+            yield str(text[start:start + length], "utf-8")
+
+    def mask(self, index: int) -> str:
+        if index < 0:
+            index += self.word_count
+        if self._style_masks is not None:
+            starts = self._style_mask_starts
+            return self._style_masks[starts[index]:starts[index + 1]]
+        return str(self._masks[self._mask_starts[index]:self._mask_starts[index + 1]], "ascii")
+
+    def set_mask_style(self, style: MaskStyle) -> None:
+        if style == self.mask_style:
+            return
+        self.mask_style = style
+        if style == DEFAULT_MASK_STYLE:
+            self._style_masks = self._style_mask_starts = None
+            return
+        # The stored masks use the default style: mask all words in one call
+        words = list(self.words)
+        starts = array("I", [0])
+        offset = 0
+        for word in words:
+            offset += len(word)
+            starts.append(offset)
+        self._style_masks = style.apply("".join(words))
+        self._style_mask_starts = starts
+
+    def append_chunk(self, chunk) -> None:
+        raise TypeError("Compiled corpora are read-only")
+
+    def to_bytes(self) -> bytes:
+        raise TypeError("Compiled corpora are not serialized with to_bytes")
+
+
+def _align4(n: int) -> int:
+    return (n + 3) & ~3
+
+
+# ----------------------------------------------------------------------------
+# Writer
+# ----------------------------------------------------------------------------
+
+_NON_ASCII_RE = re.compile(r"[^\x00-\x7f]")
+
+
+def _byte_offset_converter(text: str):
+    """Return a function mapping str offsets of `text` to UTF-8 byte offsets."""
+    positions: List[int] = []
+    extra: List[int] = []  # cumulative extra bytes after each non-ASCII char
+    total = 0
+    for match in _NON_ASCII_RE.finditer(text):
+        code = ord(match.group())
+        total += 1 if code < 0x800 else 2 if code < 0x10000 else 3
+        positions.append(match.start())
+        extra.append(total)
+
+    if not positions:
+        return lambda offset: offset
+
+    def convert(offset: int) -> int:
+        i = bisect_right(positions, offset - 1)
+        return offset + (extra[i - 1] if i else 0)
+
+    return convert
+
+
+def compile_corpus(corpus: Corpus, source_sha256: str, source_size: int) -> bytes:
+    """Serialize a complete corpus into the compiled format."""
+    text = corpus.text
+    text_bytes = text.encode("utf-8")
+    to_bytes = _byte_offset_converter(text)
+
+    byte_word_starts = array("I")
+    byte_word_lengths = array("I")
+    for start, length in zip(corpus.word_starts, corpus.word_lengths):
+        byte_start = to_bytes(start)
+        byte_word_starts.append(byte_start)
+        byte_word_lengths.append(to_bytes(start + length) - byte_start)
+    byte_phrase_starts = array("I", map(to_bytes, corpus.phrase_starts))
+    byte_phrase_ends = array("I", map(to_bytes, corpus.phrase_ends))
+
+    masked_text = DEFAULT_MASK_STYLE.apply(text)
+    masks = [masked_text[start:start + length] for start, length in zip(corpus.word_starts, corpus.word_lengths)]
+    mask_starts = array("I", [0])
+    offset = 0
+    for masked in masks:
+        offset += len(masked)
+        mask_starts.append(offset)
+    masks_bytes = "".join(masks).encode("ascii")
+
+    header = _HEADER.pack(
+        COMPILED_MAGIC,
+        COMPILED_VERSION,
+        TOKENIZER_VERSION,
+        bytes.fromhex(source_sha256),
+        source_size,
+        corpus.word_count,
+        corpus.phrase_count,
+        corpus.phrases_total,
+        len(text_bytes),
+        len(masks_bytes),
+    )
+    padding = b"\0" * (_align4(len(header) + len(text_bytes)) - len(header) - len(text_bytes))
+    arrays = (
+        corpus.word_starts, corpus.word_lengths, corpus.word_to_phrase_map, corpus.phrase_starts, corpus.phrase_ends,
+        byte_word_starts, byte_word_lengths, byte_phrase_starts, byte_phrase_ends, mask_starts,
+    )
+    return b"".join([header, text_bytes, padding, *(_le_bytes(arr) for arr in arrays), masks_bytes])
+
+
+def _le_bytes(arr) -> bytes:
+    arr = array("I", arr)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def extract_source_text(path: str, data: bytes) -> str:
+    """Return the text of a stimulus source from its bytes."""
+    if is_document(path):
+        return extract_document_text(path, data)
+    return decode_text(data)
+
+
+# ----------------------------------------------------------------------------
+# Compiler CLI
+# ----------------------------------------------------------------------------
+
+def _compile_file(source: str, output: str, sha256: str) -> Tuple[str, int]:
+    """Worker: compile one source file. Returns (output path, word count)."""
+    with open(source, "rb") as file:
+        data = file.read()
+    corpus = Corpus.from_text(extract_source_text(source, data))
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    tmp = output + ".tmp"
+    with open(tmp, "wb") as file:
+        file.write(compile_corpus(corpus, sha256, len(data)))
+    os.replace(tmp, output)
+    return output, corpus.word_count
+
+
+def _hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _iter_sources(root: str) -> Iterable[str]:
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for name in sorted(filenames):
+            if name.lower().endswith(SOURCE_EXTENSIONS) and not name.startswith("~$"):
+                yield os.path.join(dirpath, name)
+
+
+def compile_folder(source_dir: str, output_dir: Optional[str] = None,
+                   jobs: Optional[int] = None, force: bool = False) -> Dict[str, str]:
+    """Compile every stimulus under `source_dir`, skipping unchanged ones.
+
+    Returns a map of relative source path -> status ("compiled",
+    "unchanged", "removed" or an error message).
+    """
+    output_dir = output_dir or os.path.join(source_dir, "compiled")
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    try:
+        with open(manifest_path, encoding="utf-8") as file:
+            manifest: Dict[str, Dict[str, object]] = json.load(file)
+    except (OSError, ValueError):
+        manifest = {}
+
+    status: Dict[str, str] = {}
+    pending: Dict[str, Tuple[str, str, str]] = {}
+    abs_output = os.path.abspath(output_dir)
+    for source in _iter_sources(source_dir):
+        if os.path.abspath(source).startswith(abs_output + os.sep):
+            continue
+        rel = os.path.relpath(source, source_dir)
+        output = os.path.join(output_dir, rel + COMPILED_EXTENSION)
+        sha256 = _hash_file(source)
+        entry = manifest.get(rel)
+        if (not force and entry and entry.get("sha256") == sha256
+                and entry.get("tokenizer") == TOKENIZER_VERSION and entry.get("format") == COMPILED_VERSION
+                and os.path.exists(output)):
+            status[rel] = "unchanged"
+        else:
+            pending[rel] = (source, output, sha256)
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                rel: pool.submit(_compile_file, source, output, sha256)
+                for rel, (source, output, sha256) in pending.items()
+            }
+            for rel, future in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    status[rel] = f"error: {e}"
+                    manifest.pop(rel, None)
+                    continue
+                status[rel] = "compiled"
+                manifest[rel] = {"sha256": pending[rel][2], "tokenizer": TOKENIZER_VERSION, "format": COMPILED_VERSION}
+
+    # Sources that disappeared
+    for rel in [rel for rel in manifest if rel not in status]:
+        try:
+            os.remove(os.path.join(output_dir, rel + COMPILED_EXTENSION))
+        except OSError:
+            pass
+        del manifest[rel]
+        status[rel] = "removed"
+
+    os.makedirs(output_dir, exist_ok=True)
+    with open(manifest_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    return status
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.utils.compiled_corpus",
+        description="Compile a folder of stimuli (.txt, .docx, .odt, .epub) into memory-mappable corpora.",
+    )
+    parser.add_argument("source_dir", help="Folder with the stimulus files (searched recursively).")
+    parser.add_argument("--output", help="Output folder (default: SOURCE_DIR/compiled).")
+    parser.add_argument("--jobs", type=int, help="Worker processes (default: CPU count).")
+    parser.add_argument("--force", action="store_true", help="Recompile unchanged sources too.")
+    args = parser.parse_args(argv)
+
+    status = compile_folder(args.source_dir, args.output, jobs=args.jobs, force=args.force)
+    failed = 0
+    for rel, state in sorted(status.items()):
+        mark = "⚠" if state.startswith("error") else "✓"
+        failed += state.startswith("error")
+        print(f"  {mark} {rel}: {state}")
+    counts = {s: sum(1 for v in status.values() if v == s) for s in ("compiled", "unchanged", "removed")}
+    print(f"  {counts['compiled']} compiled, {counts['unchanged']} unchanged, "
+          f"{counts['removed']} removed, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
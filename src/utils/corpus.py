@@ -0,0 +1,584 @@
+"""
+Compact, array-backed text corpus.
+
+A `Corpus` keeps the document text once and describes words and sentences
+as spans into it:
+
+* ``word_starts`` / ``word_lengths`` - ``array('I')`` offsets of each word
+* ``word_to_phrase_map`` - ``array('I')`` phrase index of each word
+* ``phrase_starts`` / ``phrase_ends`` - ``array('I')`` sentence spans
+
+The word-to-phrase map is monotonic, so the first word of phrase ``k`` is
+``bisect_left(word_to_phrase_map, k)``; complete corpora keep these
+boundaries in a small array for O(1) phrase-to-word ranges.
+
+Word and phrase strings are only materialized when indexed, so a novel
+costs a few bytes per word instead of one Python object per word and a
+second copy of the text for the sentences. ``words`` and ``phrases`` are
+read-only sequence views with the same ``len()`` / indexing / iteration
+behaviour as the lists they replace.
+
+While a file is streamed the text is held as the list of chunk segments
+received so far; `finish` joins them into a single buffer.
+
+Masks are computed in bulk: every segment is masked with one
+``str.translate`` call as it arrives, giving a masked copy of the text in
+which each word's mask sits at the word's own span. Navigating never masks
+a word again, it only slices the masked buffer.
+
+A complete corpus serializes to a compact binary form (`to_bytes` /
+`from_bytes`)::
+
+    header | word_starts | word_lengths | word_to_phrase_map
+           | phrase_starts | phrase_ends | text (UTF-8)
+
+Arrays are little-endian uint32; the header records the tokenizer version
+so stale serializations are rejected.
+
+When the source text is edited, `splice` re-tokenizes only the changed
+region, widened to sentence boundaries where the tokenizer can be
+restarted, and shifts the spans after it.
+"""
+
+from __future__ import annotations
+
+from abc import abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from dataclasses import dataclass
+import struct
+import sys
+from typing import Callable, Iterable, Iterator, List, Optional, Union, overload
+
+from src.utils.text import (
+    DEFAULT_MASK_STYLE,
+    TOKENIZER_VERSION,
+    IncrementalTokenizer,
+    MaskStyle,
+    TextChunk,
+    sentence_boundary,
+    tokenize_text,
+)
+
+CORPUS_MAGIC = b"TSCP"
+CORPUS_FORMAT_VERSION = 1
+
+# magic, format version, tokenizer version, words, phrase spans, phrases_total, text bytes
+_HEADER = struct.Struct("<4sIIIIIQ")
+
+
+class _SpanView(Sequence):
+    """Read-only sequence of strings materialized from (start, end) spans."""
+
+    __slots__ = ("_corpus",)
+
+    def __init__(self, corpus: "Corpus"):
+        self._corpus = corpus
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    @abstractmethod
+    def _span(self, index: int) -> tuple[int, int]: ...
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        # Array indexing handles negative indices and raises IndexError
+        start, end = self._span(index)
+        return self._slice_text(start, end)
+
+    def _slice_text(self, start: int, end: int) -> str:
+        return self._corpus.text_slice(start, end)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, tuple, Sequence)) and not isinstance(other, str):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} of {len(self)}>"
+
+
+class CorpusWords(_SpanView):
+    """The words of a corpus, as a sequence of str."""
+
+    __slots__ = ()
+
+    def __len__(self) -> int:
+        return len(self._corpus.word_starts)
+
+    def _span(self, index: int) -> tuple[int, int]:
+        start = self._corpus.word_starts[index]
+        return start, start + self._corpus.word_lengths[index]
+
+    def __iter__(self):
+        return self._corpus.iter_words()
+
+
+class CorpusPhrases(_SpanView):
+    """The sentences of a corpus, as a sequence of str."""
+
+    __slots__ = ()
+
+    def __len__(self) -> int:
+        return len(self._corpus.phrase_starts)
+
+    def _span(self, index: int) -> tuple[int, int]:
+        return self._corpus.phrase_starts[index], self._corpus.phrase_ends[index]
+
+
+@dataclass
+class CorpusSplice:
+    """How the words of a corpus moved after `Corpus.splice`.
+
+    Words [first_word, old_end) were re-tokenized into [first_word, new_end);
+    the words after them only shifted.
+    """
+    first_word: int
+    old_end: int
+    new_end: int
+    # Characters of the new text that went through the tokenizer
+    retokenized_chars: int = 0
+
+    def remap(self, index: int) -> int:
+        """Index in the new corpus of old word `index` (same place, or nearest in the edited region)."""
+        if index < self.first_word:
+            return index
+        if index >= self.old_end:
+            return index - self.old_end + self.new_end
+        return min(index, max(self.first_word, self.new_end - 1))
+
+
+class Corpus:
+    """Words and sentences of a document stored as spans over its text."""
+
+    def __init__(self, mask_style: MaskStyle = DEFAULT_MASK_STYLE) -> None:
+        self._segments: List[str] = []
+        self._segment_bases: List[int] = []
+        # Masked copy of each segment (same offsets)
+        self._masked_segments: List[str] = []
+        self.mask_style = mask_style
+
+        self.word_starts = array("I")
+        self.word_lengths = array("I")
+        self.word_to_phrase_map = array("I")
+        self.phrase_starts = array("I")
+        self.phrase_ends = array("I")
+        self.phrases_total = 0
+        self.is_complete = False
+        # First word of each phrase (+ word_count), built on first use
+        self._phrase_first_words: Optional[array] = None
+        # (first word, its phrase index and those after it) before finish()
+        # clamped them; None until known (see _unclamped_tail)
+        self._raw_tail: Optional[tuple[int, array]] = None
+
+        self.words = CorpusWords(self)
+        self.phrases = CorpusPhrases(self)
+
+    @classmethod
+    def from_text(cls, text: str, progress: Optional[Callable[[float], None]] = None) -> "Corpus":
+        """Tokenize a whole document in one pass (`progress` as in tokenize_text)."""
+        corpus = cls()
+        corpus.append_chunk(tokenize_text(text, progress=progress))
+        return corpus
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[TextChunk]) -> "Corpus":
+        """Build a corpus from every chunk of `iter_text_chunks`."""
+        corpus = cls()
+        for chunk in chunks:
+            corpus.append_chunk(chunk)
+        return corpus
+
+    @property
+    def text(self) -> str:
+        """The whole document text (complete corpora only)."""
+        if not self.is_complete:
+            raise ValueError("Corpus is still streaming")
+        return self._segments[0] if self._segments else ""
+
+    @property
+    def word_count(self) -> int:
+        return len(self.word_starts)
+
+    @property
+    def phrase_count(self) -> int:
+        return len(self.phrase_starts)
+
+    def phrase_first_word(self, phrase: int) -> int:
+        """Index of the first word of `phrase` (word_count past the last one)."""
+        if phrase <= 0:
+            return 0
+        if not self.is_complete:
+            # Streaming: the map is still growing
+            return bisect_left(self.word_to_phrase_map, phrase)
+        first_words = self.phrase_first_words
+        return first_words[min(phrase, len(first_words) - 1)]
+
+    @property
+    def phrase_first_words(self) -> array:
+        """First word of every phrase, plus word_count (complete corpora only)."""
+        if not self.is_complete:
+            raise ValueError("Corpus is still streaming")
+        first_words = self._phrase_first_words
+        if first_words is None:
+            mapping = self.word_to_phrase_map
+            first_words = array("I", (bisect_left(mapping, p) for p in range(self.phrases_total + 1)))
+            self._phrase_first_words = first_words
+        return first_words
+
+    def phrase_word_range(self, phrase: int) -> tuple[int, int]:
+        """Word indices [start, end) of `phrase`."""
+        return self.phrase_first_word(phrase), self.phrase_first_word(phrase + 1)
+
+    def mask(self, index: int) -> str:
+        """Masked form of a word (a slice of the precomputed masks)."""
+        start = self.word_starts[index]
+        return _slice(self._masked_segments, self._segment_bases, start, start + self.word_lengths[index])
+
+    def set_mask_style(self, style: MaskStyle) -> None:
+        """Switch mask style, re-masking the whole text once."""
+        if style == self.mask_style:
+            return
+        self.mask_style = style
+        self._masked_segments = [style.apply(segment) for segment in self._segments]
+
+    def append_chunk(self, chunk: TextChunk) -> None:
+        """Append the spans of a tokenized chunk (in document order)."""
+        if chunk.text:
+            self._segments.append(chunk.text)
+            self._segment_bases.append(chunk.base)
+            self._masked_segments.append(self.mask_style.apply(chunk.text))
+        if not self.word_starts and not self.phrase_starts:
+            # First chunk: adopt its arrays instead of copying them
+            self.word_starts = chunk.word_starts
+            self.word_lengths = chunk.word_lengths
+            self.word_to_phrase_map = chunk.word_to_phrase_map
+            self.phrase_starts = chunk.phrase_starts
+            self.phrase_ends = chunk.phrase_ends
+        else:
+            self.word_starts.extend(chunk.word_starts)
+            self.word_lengths.extend(chunk.word_lengths)
+            self.word_to_phrase_map.extend(chunk.word_to_phrase_map)
+            self.phrase_starts.extend(chunk.phrase_starts)
+            self.phrase_ends.extend(chunk.phrase_ends)
+        self.phrases_total = chunk.phrases_total
+        self._phrase_first_words = None
+        if chunk.is_last:
+            self.finish()
+
+    def finish(self) -> None:
+        """Clamp the phrase map and compact the text into a single buffer."""
+        mapping = self.word_to_phrase_map
+        # The map is monotonic: only clamp if the last index overflows
+        if self.phrases_total > 0 and mapping and mapping[-1] >= self.phrases_total:
+            last = self.phrases_total - 1
+            first = bisect_left(mapping, self.phrases_total)
+            # splice() carries on from the tokenizer's own indices
+            self._raw_tail = (first, mapping[first:])
+            self.word_to_phrase_map = array("I", (min(idx, last) for idx in mapping))
+        else:
+            self._raw_tail = (len(mapping), array("I"))
+
+        if len(self._segments) > 1:
+            base = self._segment_bases[0]
+            self._segments = ["".join(self._segments)]
+            self._masked_segments = ["".join(self._masked_segments)]
+            self._segment_bases = [base]
+        self.is_complete = True
+
+    def text_slice(self, start: int, end: int) -> str:
+        """Return the document text between two offsets."""
+        return _slice(self._segments, self._segment_bases, start, end)
+
+    def iter_words(self) -> Iterator[str]:
+        """Iterate over the words (slicing the text directly when it is one buffer)."""
+        if len(self._segments) == 1:
+            text, base = self._segments[0], self._segment_bases[0]
+            for start, length in zip(self.word_starts, self.word_lengths):
+                start -= base
+                yield text[start:start + length]
+        else:
+            for start, length in zip(self.word_starts, self.word_lengths):
+                yield self.text_slice(start, start + length)
+
+    # ------------------------------------------------------------------
+    # Incremental re-tokenization
+    # ------------------------------------------------------------------
+
+    def splice(self, new_text: str) -> tuple["Corpus", CorpusSplice]:
+        """Corpus of an edited version of the text, re-tokenizing only what changed.
+
+        The differing region (common prefix and suffix removed) is widened
+        back and forward to line starts where the tokenizer state is known
+        (see `sentence_boundary`); only that stretch is tokenized again and
+        the spans after it are shifted. The result is identical to
+        `Corpus.from_text(new_text)`. This corpus is not modified.
+        """
+        old_text = self.text
+        old_len, new_len = len(old_text), len(new_text)
+        delta = new_len - old_len
+        first_diff = _common_prefix(old_text, new_text)
+        # Start of the identical tail of the new text
+        tail = new_len - _common_suffix(old_text, new_text, min(old_len, new_len) - first_diff)
+
+        # Restart the tokenizer at the last clean line start before the change
+        start, open_start = _restart_point(old_text, first_diff)
+        first_word = bisect_left(self.word_starts, start)
+        first_phrase = bisect_right(self.phrase_ends, open_start)
+        tokenizer = IncrementalTokenizer.resume(
+            self._phrase_after(first_word), first_phrase, new_text[open_start:start], open_start,
+        )
+
+        # Tokenize up to the first clean line start whose sentence end is in the identical tail
+        chunk = TextChunk(base=start)
+        pos = start
+        resync = -1
+        while pos < new_len:
+            if pos >= tail:
+                boundary = sentence_boundary(new_text, pos)
+                if boundary > tail:
+                    resync = pos
+                    break
+                end = new_text.find("\n", pos)
+            else:
+                end = new_text.find("\n", max(pos, min(pos + _SPLICE_BLOCK, tail) - 1))
+            end = new_len if end < 0 else end + 1
+            tokenizer.feed(new_text[pos:end], pos, chunk)
+            pos = end
+
+        corpus = type(self).__new__(Corpus)
+        Corpus.__init__(corpus, self.mask_style)
+        new_end = first_word + len(chunk.word_starts)
+        if resync < 0:
+            phrases_total = tokenizer.finish(chunk)
+            old_end, old_phrase_end, resync = self.word_count, self.phrase_count, new_len
+            shift_phrase = 0
+        else:
+            old_resync = resync - delta
+            old_end = bisect_left(self.word_starts, old_resync)
+            old_phrase_end = bisect_right(self.phrase_ends, boundary - delta)
+            shift_phrase = tokenizer.phrase_idx - self._phrase_after(old_end)
+            phrases_total = self.phrases_total - old_phrase_end + tokenizer.phrases_emitted
+
+        corpus.word_starts = (self.word_starts[:first_word] + chunk.word_starts
+                              + _shifted(self.word_starts[old_end:], delta))
+        corpus.word_lengths = self.word_lengths[:first_word] + chunk.word_lengths + self.word_lengths[old_end:]
+        # Unclamped indices: the new phrase total may clamp other words, or none
+        corpus.word_to_phrase_map = (self._raw_phrases(0, first_word) + chunk.word_to_phrase_map
+                                     + _shifted(self._raw_phrases(old_end, self.word_count), shift_phrase))
+        corpus.phrase_starts = (self.phrase_starts[:first_phrase] + chunk.phrase_starts
+                                + _shifted(self.phrase_starts[old_phrase_end:], delta))
+        corpus.phrase_ends = (self.phrase_ends[:first_phrase] + chunk.phrase_ends
+                              + _shifted(self.phrase_ends[old_phrase_end:], delta))
+        corpus.phrases_total = phrases_total
+
+        corpus._segments = [new_text]
+        corpus._segment_bases = [0]
+        if len(self._masked_segments) == 1 and self._segment_bases == [0]:
+            # Masks are per character: only the re-tokenized stretch changes
+            masked = self._masked_segments[0]
+            corpus._masked_segments = [
+                masked[:start] + self.mask_style.apply(new_text[start:resync]) + masked[resync - delta:]
+            ]
+        else:
+            corpus._masked_segments = [self.mask_style.apply(new_text)]
+        corpus.finish()
+        return corpus, CorpusSplice(first_word, old_end, new_end, resync - start)
+
+    def _phrase_after(self, word: int) -> int:
+        """Word-level sentence index of the tokenizer at a boundary before `word`."""
+        return self._raw_phrases(word - 1, word)[0] + 1 if word else 0
+
+    def _raw_phrases(self, start: int, end: int) -> array:
+        """Phrase indices of words [start, end) as the tokenizer gave them (before clamping)."""
+        first, raw = self._unclamped_tail()
+        mapping = self.word_to_phrase_map
+        if end <= first:
+            return mapping[start:end]
+        if start >= first:
+            return raw[start - first:end - first]
+        return mapping[start:first] + raw[:end - first]
+
+    def _unclamped_tail(self) -> tuple[int, array]:
+        """First word whose phrase index was clamped by finish(), and the unclamped indices from it on.
+
+        Corpora read back from their binary form only have the clamped map:
+        the words that may have been clamped (those of the last phrase) are
+        tokenized again, from the line start before them where the
+        tokenizer can be restarted.
+        """
+        if self._raw_tail is not None:
+            return self._raw_tail
+        mapping = self.word_to_phrase_map
+        last = self.phrases_total - 1
+        if not mapping or last < 0 or mapping[-1] < last:
+            self._raw_tail = (len(mapping), array("I"))
+            return self._raw_tail
+
+        # Words before `first` are below the last phrase, so never clamped
+        first = bisect_left(mapping, last)
+        text = self.text
+        start, open_start = _restart_point(text, self.word_starts[first])
+        restart_word = bisect_left(self.word_starts, start)
+        tokenizer = IncrementalTokenizer.resume(
+            mapping[restart_word - 1] + 1 if restart_word else 0,
+            bisect_right(self.phrase_ends, open_start),
+            text[open_start:start],
+            open_start,
+        )
+        chunk = TextChunk(base=start)
+        tokenizer.feed(text[start:], start, chunk)
+        raw = chunk.word_to_phrase_map[first - restart_word:]
+        # Keep only the indices that differ from the map
+        clamped = bisect_left(raw, last + 1)
+        self._raw_tail = (first + clamped, raw[clamped:])
+        return self._raw_tail
+
+    # ------------------------------------------------------------------
+    # Binary form
+    # ------------------------------------------------------------------
+
+    def to_bytes(self) -> bytes:
+        """Serialize a complete corpus."""
+        text_bytes = self.text.encode("utf-8")
+        header = _HEADER.pack(
+            CORPUS_MAGIC,
+            CORPUS_FORMAT_VERSION,
+            TOKENIZER_VERSION,
+            self.word_count,
+            self.phrase_count,
+            self.phrases_total,
+            len(text_bytes),
+        )
+        arrays = (
+            self.word_starts,
+            self.word_lengths,
+            self.word_to_phrase_map,
+            self.phrase_starts,
+            self.phrase_ends,
+        )
+        return b"".join([header, *(_le_bytes(arr) for arr in arrays), text_bytes])
+
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, memoryview]) -> "Corpus":
+        """Rebuild a corpus serialized by `to_bytes`.
+
+        Raises ValueError if the data is truncated or was written by another
+        format or tokenizer version.
+        """
+        view = memoryview(data)
+        if len(view) < _HEADER.size:
+            raise ValueError("Truncated corpus data")
+        magic, version, tokenizer_version, words, phrases, phrases_total, text_len = _HEADER.unpack_from(view, 0)
+        if magic != CORPUS_MAGIC or version != CORPUS_FORMAT_VERSION:
+            raise ValueError("Unsupported corpus format")
+        if tokenizer_version != TOKENIZER_VERSION:
+            raise ValueError("Corpus built by another tokenizer version")
+        if len(view) != _HEADER.size + (3 * words + 2 * phrases) * 4 + text_len:
+            raise ValueError("Truncated corpus data")
+
+        pos = _HEADER.size
+
+        def take(count: int) -> array:
+            nonlocal pos
+            arr = array("I")
+            arr.frombytes(view[pos:pos + count * 4])
+            if sys.byteorder == "big":
+                arr.byteswap()
+            pos += count * 4
+            return arr
+
+        corpus = cls()
+        corpus.word_starts = take(words)
+        corpus.word_lengths = take(words)
+        corpus.word_to_phrase_map = take(words)
+        corpus.phrase_starts = take(phrases)
+        corpus.phrase_ends = take(phrases)
+        corpus.phrases_total = phrases_total
+        corpus._segments = [str(view[pos:pos + text_len], "utf-8")]
+        corpus._masked_segments = [corpus.mask_style.apply(corpus._segments[0])]
+        corpus._segment_bases = [0]
+        corpus.is_complete = True
+        return corpus
+
+
+def _restart_point(text: str, offset: int) -> tuple[int, int]:
+    """Last line start at or before `offset` where the tokenizer can be restarted,
+    and the start of the sentence open there (see `sentence_boundary`)."""
+    start = text.rfind("\n", 0, offset) + 1
+    open_start = sentence_boundary(text, start)
+    while open_start < 0:
+        start = text.rfind("\n", 0, start - 1) + 1
+        open_start = sentence_boundary(text, start)
+    return start, open_start
+
+
+def _slice(segments: List[str], bases: List[int], start: int, end: int) -> str:
+    """Text between two document offsets of a segmented buffer."""
+    if len(segments) == 1:
+        base = bases[0]
+        return segments[0][start - base:end - base]
+
+    # Streaming: spans may cross segment boundaries (sentences)
+    pos = bisect_right(bases, start) - 1
+    parts: List[str] = []
+    while pos < len(segments) and start < end:
+        base = bases[pos]
+        segment = segments[pos]
+        parts.append(segment[start - base:end - base])
+        start = base + len(segment)
+        pos += 1
+    return "".join(parts)
+
+
+# Characters fed to the tokenizer at a time when splicing
+_SPLICE_BLOCK = 1 << 16
+
+
+def _common_prefix(a: str, b: str) -> int:
+    """Length of the common prefix of two strings (compared block by block)."""
+    limit = min(len(a), len(b))
+    pos, step = 0, _SPLICE_BLOCK
+    while step:
+        while pos + step <= limit and a[pos:pos + step] == b[pos:pos + step]:
+            pos += step
+        step //= 2
+    return pos
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    """Length of the common suffix of two strings, at most `limit`."""
+    pos, step = 0, _SPLICE_BLOCK
+    len_a, len_b = len(a), len(b)
+    while step:
+        while pos + step <= limit and a[len_a - pos - step:len_a - pos] == b[len_b - pos - step:len_b - pos]:
+            pos += step
+        step //= 2
+    return pos
+
+
+def _shifted(values: array, delta: int) -> array:
+    """`values` with `delta` added to each (the same array when delta is 0)."""
+    if not delta:
+        return values
+    return array(values.typecode, map(delta.__add__, values))
+
+
+def _le_bytes(arr: array) -> bytes:
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
@@ -8,12 +8,20 @@ from typing import Optional, List
 
 import pygame
 
+from src.utils.asset_pack import load_packed_surface
 from src.utils.paths import resource_path
 
 
 def load_image_asset(relative_path: str) -> pygame.Surface:
-    """Load an image from assets using a PyInstaller-friendly path."""
-    return pygame.image.load(resource_path(relative_path)).convert_alpha()
+    """Load an image from assets using a PyInstaller-friendly path.
+
+    Pre-decoded pixels from the asset pack are used when available; the loose
+    file is decoded otherwise.
+    """
+    surface = load_packed_surface(relative_path)
+    if surface is None:
+        surface = pygame.image.load(resource_path(relative_path))
+    return surface.convert_alpha()
 
 
 def scale_image_cover(image: pygame.Surface, target_width: int, target_height: int) -> pygame.Surface:
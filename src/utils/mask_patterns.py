@@ -0,0 +1,55 @@
+"""
+Pattern masks: what is shown in place of a stimulus after it disappears.
+
+- ``text``: the masked text itself (``####``, see ``src.utils.text.MaskStyle``).
+- ``letters``: random consonants over the stimulus box.
+- ``checkerboard``: a checkerboard of square cells.
+- ``noise``: random pixels.
+
+The pixel patterns are palette indices, one byte per pixel, row by row,
+so that they can be turned into a surface in one call (8-bit palettized
+``pygame.image.frombytes``) without touching single pixels; the colours
+come from the palette. A mask only has to cover its stimulus, so masks
+are made for widths rounded up to a step (``width_bucket``) and reused by
+every word of about the same width.
+"""
+
+from __future__ import annotations
+
+import random
+
+MASK_KINDS = ("text", "letters", "checkerboard", "noise")
+
+MASK_LETTERS = "BCDFGHJKLMNPQRSTVWXZ"
+
+
+def width_bucket(width: int, step: int) -> int:
+    """Width of the masks used for a stimulus `width` pixels wide (rounded up to `step`)."""
+    step = max(1, step)
+    return max(step, -(-width // step) * step)
+
+
+def random_letters(count: int, rng: random.Random) -> str:
+    """`count` random consonants."""
+    return "".join(rng.choices(MASK_LETTERS, k=max(1, count)))
+
+
+def noise_pixels(width: int, height: int, levels: int, rng: random.Random) -> bytes:
+    """Random palette indices in [0, levels), row by row."""
+    levels = max(1, min(256, levels))
+    table = bytes(i % levels for i in range(256))
+    return rng.randbytes(width * height).translate(table)
+
+
+def checkerboard_pixels(width: int, height: int, cell: int, phase: tuple[int, int] = (0, 0)) -> bytes:
+    """Checkerboard of `cell`-pixel squares (palette indices 0 and 1), row by row.
+
+    `phase` shifts the pattern by (x, y) pixels, so masks of the same
+    size can differ. Only two distinct rows exist: they are built once
+    and repeated.
+    """
+    cell = max(1, cell)
+    phase_x, phase_y = phase
+    row = bytes(((x + phase_x) // cell) & 1 for x in range(width))
+    rows = (row, row.translate(bytes((1, 0)) + bytes(254)))
+    return b"".join(rows[((y + phase_y) // cell) & 1] for y in range(height))
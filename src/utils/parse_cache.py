@@ -0,0 +1,147 @@
+"""
+Persistent, content-addressed parse cache for stimulus files.
+
+Parsed corpora are stored under ``~/.tachistostory/parse_cache`` as one
+file per content hash and tokenizer version::
+
+    <sha256>.v<TOKENIZER_VERSION>.corpus
+
+An index maps each source path to the ``(size, mtime_ns)`` it had when it
+was hashed, so a repeat load stats the file, finds its hash in the index
+and reads the cached corpus: the source is not read, unzipped or
+re-tokenized. If size or mtime changed the caller re-hashes the source;
+identical content under another path or name still hits the same entry.
+
+The cache is best effort: any error reading or writing it is reported
+and the caller falls back to parsing the source.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from src.utils.corpus import Corpus
+from src.utils.text import TOKENIZER_VERSION
+
+DEFAULT_CACHE_DIR = Path.home() / ".tachistostory" / "parse_cache"
+INDEX_FILE = "index.json"
+
+
+class ParseCache:
+    """Corpus cache keyed by source content hash."""
+
+    def __init__(self, root: Path = DEFAULT_CACHE_DIR):
+        self.root = root
+        self._index: Optional[Dict[str, Tuple[int, int, str]]] = None
+        # Files are ingested on a worker thread while the main thread may
+        # cache a finished stream
+        self._lock = threading.RLock()
+
+    def entry_path(self, sha256: str) -> Path:
+        return self.root / f"{sha256}.v{TOKENIZER_VERSION}.corpus"
+
+    def known_hash(self, path: str, st: Optional[os.stat_result] = None) -> Optional[str]:
+        """Return the hash recorded for `path` if its size and mtime are unchanged."""
+        key = _index_key(path)
+        with self._lock:
+            entry = self._load_index().get(key)
+        if entry is None:
+            return None
+        try:
+            st = st or os.stat(path)
+        except OSError:
+            return None
+        size, mtime_ns, sha256 = entry
+        if st.st_size != size or st.st_mtime_ns != mtime_ns:
+            return None
+        return sha256
+
+    def load(self, sha256: str) -> Optional[Corpus]:
+        """Return the cached corpus for a content hash, or None on a miss."""
+        path = self.entry_path(sha256)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"  ⚠ Parse cache unreadable: {e}")
+            return None
+        try:
+            return Corpus.from_bytes(data)
+        except ValueError as e:
+            print(f"  ⚠ Parse cache entry discarded: {e}")
+            return None
+
+    def lookup(self, path: str) -> Optional[Tuple[str, Corpus]]:
+        """Return (hash, corpus) for `path` without reading it, or None."""
+        sha256 = self.known_hash(path)
+        if sha256 is None:
+            return None
+        corpus = self.load(sha256)
+        if corpus is None:
+            return None
+        return sha256, corpus
+
+    def remember(self, path: str, sha256: str, size: int, mtime_ns: int) -> None:
+        """Record the hash of `path` as read when it had this size and mtime."""
+        entry = (size, mtime_ns, sha256)
+        key = _index_key(path)
+        with self._lock:
+            index = self._load_index()
+            if index.get(key) == entry:
+                return
+            index[key] = entry
+            self._save_index()
+
+    def store(self, path: str, sha256: str, size: int, mtime_ns: int, corpus: Corpus) -> None:
+        """Cache a parsed corpus and record the hash of its source."""
+        try:
+            entry = self.entry_path(sha256)
+            if not entry.exists():
+                self.root.mkdir(parents=True, exist_ok=True)
+                tmp = entry.with_suffix(f".{threading.get_ident()}.tmp")
+                tmp.write_bytes(corpus.to_bytes())
+                os.replace(tmp, entry)
+            self.remember(path, sha256, size, mtime_ns)
+        except OSError as e:
+            print(f"  ⚠ Parse cache not written: {e}")
+
+    def _load_index(self) -> Dict[str, Tuple[int, int, str]]:
+        if self._index is None:
+            self._index = {}
+            try:
+                raw = json.loads((self.root / INDEX_FILE).read_text(encoding="utf-8"))
+                self._index = {str(k): (int(v[0]), int(v[1]), str(v[2])) for k, v in raw.items()}
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, TypeError, IndexError) as e:
+                print(f"  ⚠ Parse cache index reset: {e}")
+        return self._index
+
+    def _save_index(self) -> None:
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = self.root / (INDEX_FILE + ".tmp")
+            tmp.write_text(json.dumps(self._index, sort_keys=True), encoding="utf-8")
+            os.replace(tmp, self.root / INDEX_FILE)
+        except OSError as e:
+            print(f"  ⚠ Parse cache index not written: {e}")
+
+
+def _index_key(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+_cache: Optional[ParseCache] = None
+
+
+def get_parse_cache() -> ParseCache:
+    """Return the shared parse cache."""
+    global _cache
+    if _cache is None:
+        _cache = ParseCache()
+    return _cache
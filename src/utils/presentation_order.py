@@ -0,0 +1,245 @@
+"""
+Presentation orders: the sequence in which the words of a corpus are shown.
+
+An order maps a presentation position (0, 1, 2...) to a word index of the
+corpus and back. Words, masks and the word -> phrase map are never copied
+or re-derived: the presenter keeps reading them from the corpus arrays,
+only the index it reads changes.
+
+- ``sequential``: text order (the identity; also works while streaming).
+- ``reverse``: last word first.
+- ``shuffled_words``: a seeded pseudo-random permutation of all words. It is
+  computed on the fly by a small Feistel network, so it takes no memory and
+  no setup time however large the corpus is.
+- ``shuffled_phrases``: sentences in seeded random order, the words of each
+  sentence in text order. Stores one 32-bit entry per sentence.
+
+Any of them can be restricted to a selection of words (``FilteredOrder``,
+see ``src.utils.word_features``): the selected words keep the relative
+order the base order gives them.
+
+The same name, seed and corpus always give the same order, so a session can
+be replayed from the seed recorded in its settings snapshot.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Optional
+import random
+import secrets
+
+ORDER_NAMES = ("sequential", "shuffled_words", "shuffled_phrases", "reverse")
+
+_FEISTEL_ROUNDS = 4
+
+
+class PresentationOrder:
+    """Sequential order; base class of the other orders."""
+
+    name = "sequential"
+    # Orders that need the whole text before the first word is shown
+    needs_full_text = False
+    # Orders that show the words of each sentence together and in text order
+    # (chunked presentation, see src.utils.chunks)
+    keeps_phrases = True
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = seed
+
+    def index_at(self, position: int) -> int:
+        """Word index shown at `position`."""
+        return position
+
+    def position_of(self, index: int) -> int:
+        """Position at which word `index` is shown."""
+        return index
+
+    def size(self, word_count: int) -> int:
+        """Number of positions (all the words, unless filtered)."""
+        return word_count
+
+    def snapshot(self) -> dict:
+        """Settings to record with the session (enough to rebuild the order)."""
+        return {"presentation_order": self.name, "order_seed": self.seed}
+
+
+class ReverseOrder(PresentationOrder):
+    """Last word first."""
+
+    name = "reverse"
+    needs_full_text = True
+    keeps_phrases = False
+
+    def __init__(self, word_count: int):
+        super().__init__()
+        self.word_count = word_count
+
+    def index_at(self, position: int) -> int:
+        return self.word_count - 1 - position
+
+    def position_of(self, index: int) -> int:
+        return self.word_count - 1 - index
+
+
+class ShuffledWordsOrder(PresentationOrder):
+    """Seeded random permutation of the words, computed lazily.
+
+    A balanced Feistel network keyed by the seed is a bijection on
+    [0, 2**bits); values that fall outside [0, word_count) are fed back
+    in (cycle walking) until they land inside, which keeps it a
+    permutation of the words. Both directions cost a few integer
+    operations per lookup.
+    """
+
+    name = "shuffled_words"
+    needs_full_text = True
+    keeps_phrases = False
+
+    def __init__(self, word_count: int, seed: int):
+        super().__init__(seed)
+        self.word_count = word_count
+        half_bits = max(1, ((word_count - 1).bit_length() + 1) // 2)
+        self._half_bits = half_bits
+        self._half_mask = (1 << half_bits) - 1
+        rng = random.Random(seed)
+        self._keys = [rng.getrandbits(32) for _ in range(_FEISTEL_ROUNDS)]
+
+    def _round(self, value: int, key: int) -> int:
+        h = ((value ^ key) * 0x85EBCA6B) & 0xFFFFFFFF
+        h ^= h >> 13
+        h = (h * 0xC2B2AE35) & 0xFFFFFFFF
+        h ^= h >> 16
+        return h & self._half_mask
+
+    def _encrypt(self, value: int) -> int:
+        left, right = value >> self._half_bits, value & self._half_mask
+        for key in self._keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << self._half_bits) | right
+
+    def _decrypt(self, value: int) -> int:
+        left, right = value >> self._half_bits, value & self._half_mask
+        for key in reversed(self._keys):
+            left, right = right ^ self._round(left, key), left
+        return (left << self._half_bits) | right
+
+    def index_at(self, position: int) -> int:
+        value = self._encrypt(position)
+        while value >= self.word_count:
+            value = self._encrypt(value)
+        return value
+
+    def position_of(self, index: int) -> int:
+        value = self._decrypt(index)
+        while value >= self.word_count:
+            value = self._decrypt(value)
+        return value
+
+
+class ShuffledPhrasesOrder(PresentationOrder):
+    """Sentences in seeded random order, words of each sentence in text order.
+
+    Keeps the shuffled sentence numbers and, for each, the position of its
+    first word in the presentation (one array entry per sentence).
+    """
+
+    name = "shuffled_phrases"
+    needs_full_text = True
+
+    def __init__(self, corpus, seed: int):
+        super().__init__(seed)
+        self._corpus = corpus
+        phrases = array("I", range(max(1, corpus.phrases_total)))
+        random.Random(seed).shuffle(phrases)
+        self._phrases = phrases
+        offsets = array("I", bytes(4 * len(phrases)))
+        position = 0
+        for i, phrase in enumerate(phrases):
+            offsets[i] = position
+            start, end = self._phrase_range(phrase)
+            position += end - start
+        self._offsets = offsets
+        self._slots: Optional[array] = None  # phrase -> slot, built on first use
+
+    def _phrase_range(self, phrase: int) -> tuple[int, int]:
+        start, end = self._corpus.phrase_word_range(phrase)
+        if phrase == len(self._phrases) - 1:
+            end = self._corpus.word_count  # the last sentence takes any trailing words
+        return start, end
+
+    def index_at(self, position: int) -> int:
+        slot = bisect_right(self._offsets, position) - 1
+        start, _ = self._phrase_range(self._phrases[slot])
+        return start + position - self._offsets[slot]
+
+    def position_of(self, index: int) -> int:
+        slots = self._slots
+        if slots is None:
+            slots = array("I", bytes(4 * len(self._phrases)))
+            for slot, phrase in enumerate(self._phrases):
+                slots[phrase] = slot
+            self._slots = slots
+        phrase = min(self._corpus.word_to_phrase_map[index], len(slots) - 1)
+        start, _ = self._phrase_range(phrase)
+        return self._offsets[slots[phrase]] + index - start
+
+
+class FilteredOrder(PresentationOrder):
+    """Another order restricted to a selection of words.
+
+    Keeps the sorted positions, in the base order, of the selected words
+    (one 32-bit entry per selected word): position p shows the p-th
+    selected word met by the base order. Words that are not selected are
+    mapped to the next selected one.
+    """
+
+    needs_full_text = True
+    keeps_phrases = False
+
+    def __init__(self, base: PresentationOrder, indices, filter_name: str):
+        super().__init__(base.seed)
+        self.base = base
+        self.name = base.name
+        self.filter_name = filter_name
+        self._positions = array("I", sorted(map(base.position_of, indices)))
+
+    def index_at(self, position: int) -> int:
+        return self.base.index_at(self._positions[position])
+
+    def position_of(self, index: int) -> int:
+        position = bisect_left(self._positions, self.base.position_of(index))
+        return min(position, max(0, len(self._positions) - 1))
+
+    def size(self, word_count: int) -> int:
+        return len(self._positions)
+
+    def snapshot(self) -> dict:
+        settings = self.base.snapshot()
+        settings.update(word_filter=self.filter_name, filtered_word_count=len(self._positions))
+        return settings
+
+
+def new_seed() -> int:
+    """Fresh random seed (recorded with the session so the order can be replayed)."""
+    return secrets.randbits(32)
+
+
+def make_order(name: str, corpus, seed: Optional[int] = None) -> PresentationOrder:
+    """Build the order `name` over a fully loaded corpus.
+
+    Shuffled orders draw a new seed when `seed` is None. Raises ValueError
+    for an unknown name.
+    """
+    if name == "sequential":
+        return PresentationOrder()
+    if name == "reverse":
+        return ReverseOrder(corpus.word_count)
+    if name not in ORDER_NAMES:
+        raise ValueError(f"Unknown presentation order: {name!r} (expected one of {', '.join(ORDER_NAMES)})")
+    if seed is None:
+        seed = new_seed()
+    if name == "shuffled_words":
+        return ShuffledWordsOrder(corpus.word_count, seed)
+    return ShuffledPhrasesOrder(corpus, seed)
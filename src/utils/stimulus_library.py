@@ -0,0 +1,215 @@
+"""
+Local stimulus library.
+
+A folder of stimulus files (.txt, .docx, .odt, .epub, .tscorpus) indexed in a SQLite
+database with the hash, word count, phrase count and format of each file,
+so texts can be listed and picked without loading them first.
+
+A rescan only stats the folder: files whose ``(size, mtime_ns)`` match the
+index are skipped, new or changed ones are hashed and parsed on a thread
+pool and files that disappeared are dropped. Parsed corpora are stored in
+the parse cache, so picking an indexed text later skips tokenization.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import hashlib
+import os
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.utils.compiled_corpus import COMPILED_EXTENSION, SOURCE_EXTENSIONS, CompiledCorpus, extract_source_text
+from src.utils.corpus import Corpus
+from src.utils.parse_cache import ParseCache, get_parse_cache
+from src.utils.text import TOKENIZER_VERSION
+
+DEFAULT_DB_PATH = Path.home() / ".tachistostory" / "library.sqlite3"
+LIBRARY_EXTENSIONS = SOURCE_EXTENSIONS + (COMPILED_EXTENSION,)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stimuli (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    name TEXT NOT NULL,
+    format TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    tokenizer INTEGER NOT NULL,
+    sha256 TEXT,
+    word_count INTEGER NOT NULL DEFAULT 0,
+    phrase_count INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS stimuli_root ON stimuli (root);
+"""
+
+_COLUMNS = "path, root, name, format, size_bytes, mtime_ns, tokenizer, sha256, word_count, phrase_count, error"
+
+
+@dataclass
+class LibraryEntry:
+    """An indexed stimulus file."""
+    path: str
+    name: str
+    format: str
+    size_bytes: int
+    mtime_ns: int
+    sha256: str
+    word_count: int
+    phrase_count: int
+
+
+@dataclass
+class ScanResult:
+    """What a rescan changed in the index."""
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    errors: Dict[str, str] = field(default_factory=dict)
+    cancelled: bool = False
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+
+def _file_format(path: str) -> str:
+    return os.path.splitext(path)[1].lower().lstrip(".")
+
+
+class StimulusLibrary:
+    """SQLite index of the stimulus files under a folder."""
+
+    def __init__(self, root: str, db_path: Path = DEFAULT_DB_PATH,
+                 cache: Optional[ParseCache] = None):
+        self.root = os.path.abspath(root)
+        self.db_path = db_path
+        self._cache = cache
+
+    @property
+    def cache(self) -> ParseCache:
+        return self._cache or get_parse_cache()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open the index for one transaction (rescans run on a worker thread)."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.db_path)
+        try:
+            db.executescript(_SCHEMA)
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def entries(self) -> List[LibraryEntry]:
+        """Indexed texts of this folder, by name (files that failed excluded)."""
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT path, name, format, size_bytes, mtime_ns, sha256, word_count, phrase_count "
+                "FROM stimuli WHERE root = ? AND error IS NULL ORDER BY name COLLATE NOCASE, path",
+                (self.root,),
+            ).fetchall()
+        return [LibraryEntry(*row) for row in rows]
+
+    def rescan(self, jobs: Optional[int] = None, cancel: Optional[threading.Event] = None) -> ScanResult:
+        """Bring the index up to date with the folder.
+
+        Setting ``cancel`` makes the scan stop at the next file: files already
+        indexed are stored, the rest (and removals) wait for the next rescan.
+        """
+        cancel = cancel or threading.Event()
+        result = ScanResult()
+        found: Dict[str, os.stat_result] = {}
+        for path in self._iter_files():
+            if cancel.is_set():
+                break
+            try:
+                found[path] = os.stat(path)
+            except OSError:
+                continue  # removed while walking
+
+        with self._connect() as db:
+            known: Dict[str, Tuple[int, int, int]] = {
+                path: (size, mtime_ns, tokenizer)
+                for path, size, mtime_ns, tokenizer in db.execute(
+                    "SELECT path, size_bytes, mtime_ns, tokenizer FROM stimuli WHERE root = ?", (self.root,))
+            }
+
+        pending = []
+        for path, st in found.items():
+            if known.get(path) == (st.st_size, st.st_mtime_ns, TOKENIZER_VERSION):
+                result.unchanged += 1
+            else:
+                pending.append((path, st))
+
+        def index(item: tuple) -> Optional[tuple]:
+            return None if cancel.is_set() else self._index_file(*item)
+
+        rows = []
+        if pending and not cancel.is_set():
+            with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="library-scan") as pool:
+                for (path, st), row in zip(pending, pool.map(index, pending)):
+                    if row is None:
+                        continue  # skipped after a cancel
+                    rows.append(row)
+                    if row[-1] is not None:
+                        result.errors[path] = row[-1]
+                    if path in known:
+                        result.updated += 1
+                    else:
+                        result.added += 1
+
+        result.cancelled = cancel.is_set()
+        # A cancelled walk may not have seen every file
+        removed = [] if result.cancelled else [path for path in known if path not in found]
+        result.removed = len(removed)
+        if rows or removed:
+            with self._connect() as db:
+                db.executemany(
+                    f"INSERT OR REPLACE INTO stimuli ({_COLUMNS}) VALUES ({', '.join('?' * 11)})", rows)
+                db.executemany("DELETE FROM stimuli WHERE path = ?", [(path,) for path in removed])
+        return result
+
+    def _iter_files(self) -> Iterator[str]:
+        if not os.path.isdir(self.root):
+            return
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+            for name in sorted(filenames):
+                if name.lower().endswith(LIBRARY_EXTENSIONS) and not name.startswith(("~$", ".")):
+                    yield os.path.join(dirpath, name)
+
+    def _index_file(self, path: str, st: os.stat_result) -> tuple:
+        """Worker: hash and parse one file. Returns its database row."""
+        sha256 = None
+        words = phrases = 0
+        error = None
+        try:
+            if path.lower().endswith(COMPILED_EXTENSION):
+                compiled = CompiledCorpus(path)
+                sha256, words, phrases = compiled.source_sha256, compiled.word_count, compiled.phrases_total
+            else:
+                with open(path, "rb") as file:
+                    data = file.read()
+                sha256 = hashlib.sha256(data).hexdigest()
+                cache = self.cache
+                corpus = cache.load(sha256)
+                if corpus is None:
+                    corpus = Corpus.from_text(extract_source_text(path, data))
+                    cache.store(path, sha256, st.st_size, st.st_mtime_ns, corpus)
+                else:
+                    cache.remember(path, sha256, st.st_size, st.st_mtime_ns)
+                words, phrases = corpus.word_count, corpus.phrases_total
+            if not words:
+                error = "empty"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        return (path, self.root, os.path.basename(path), _file_format(path), st.st_size,
+                st.st_mtime_ns, TOKENIZER_VERSION, sha256, words, phrases, error)
@@ -4,14 +4,69 @@ Text utilities for masking and parsing.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List
+from array import array
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
 import re
 
+# Bump when the tokenization or text extraction rules change
+# (invalidates cached/compiled corpora)
+TOKENIZER_VERSION = 2
+
 PUNCTUATION_CHARS = ',.:;?!-_"\''
 KEPT_PUNCTUATION = ':.,;,!?'
 
 
+class _MaskTable(dict):
+    """str.translate table mapping every character to the mask symbol,
+    except the kept ones. Entries are added as characters are first met."""
+
+    def __init__(self, symbol: str, kept: str):
+        super().__init__((ord(char), char) for char in kept)
+        self.symbol = symbol
+
+    def __missing__(self, code: int) -> str:
+        self[code] = self.symbol
+        return self.symbol
+
+
+@dataclass(frozen=True)
+class MaskStyle:
+    """How words are masked: characters in `kept` stay, the rest become `symbol`."""
+    symbol: str = "#"
+    kept: str = KEPT_PUNCTUATION + " "
+
+    @property
+    def table(self) -> _MaskTable:
+        return _mask_table(self)
+
+    def apply(self, text: str) -> str:
+        """Mask `text` character by character (same length and offsets)."""
+        return text.translate(_mask_table(self))
+
+
+MASK_STYLES: Dict[str, MaskStyle] = {
+    "hash": MaskStyle(),
+    "hash_no_punctuation": MaskStyle(kept=" "),
+    "x": MaskStyle(symbol="X"),
+}
+DEFAULT_MASK_STYLE = MASK_STYLES["hash"]
+
+_mask_tables: Dict[MaskStyle, _MaskTable] = {}
+
+
+def _mask_table(style: MaskStyle) -> _MaskTable:
+    table = _mask_tables.get(style)
+    if table is None:
+        table = _mask_tables[style] = _MaskTable(style.symbol, style.kept)
+    return table
+
+
+def get_mask_style(name: str) -> MaskStyle:
+    """Return a mask style by name (the default one if unknown)."""
+    return MASK_STYLES.get(name, DEFAULT_MASK_STYLE)
+
+
 @dataclass
 class TextParseResult:
     words: List[str]
@@ -20,17 +75,14 @@ class TextParseResult:
     word_to_phrase_map: List[int]
 
 
-def mask_word(word: str) -> str:
+def decode_text(data: bytes) -> str:
+    """Decode UTF-8 bytes like open(path, encoding="utf-8") does (universal newlines)."""
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def mask_word(word: str, style: MaskStyle = DEFAULT_MASK_STYLE) -> str:
     """Mask a word by replacing letters and digits with '#'."""
-    masked_chars: List[str] = []
-    for char in word:
-        if char in KEPT_PUNCTUATION or char == " ":
-            masked_chars.append(char)
-        elif char.isalnum():
-            masked_chars.append("#")
-        else:
-            masked_chars.append("#")
-    return "".join(masked_chars)
+    return style.apply(word)
 
 
 def split_sentences(full_text: str) -> List[str]:
@@ -41,41 +93,229 @@ def split_sentences(full_text: str) -> List[str]:
 def build_words_and_phrase_map(full_text: str) -> TextParseResult:
     """
     Build word list and word-to-phrase mapping aligned with punctuation.
-    """
-    words: List[str] = []
-    mapping: List[int] = []
-    phrase_idx = 0
-    had_word_in_phrase = False
-    trailing_wrappers = '"\'”’)]}»'
-
-    for raw_line in full_text.splitlines():
-        line = raw_line.strip()
-        if not line:
-            continue
-
-        for raw_token in line.split():
-            cleaned = raw_token.strip(PUNCTUATION_CHARS + '1234567890')
-            if cleaned:
-                words.append(cleaned)
-                mapping.append(phrase_idx)
-                had_word_in_phrase = True
 
-            token_tail = raw_token.rstrip(trailing_wrappers)
-            if re.search(r"[.!?]+$", token_tail) and had_word_in_phrase:
-                phrase_idx += 1
-                had_word_in_phrase = False
-
-    computed_total = phrase_idx + (1 if had_word_in_phrase else 0)
-
-    phrases_list = split_sentences(full_text)
-    phrases_total = len(phrases_list) if phrases_list else computed_total
+    Words, the word-to-phrase map and the sentences (as `split_sentences`
+    would return them) are produced in a single scan of the text.
+    """
+    chunk = tokenize_text(full_text)
+    phrases_total = chunk.phrases_total
 
-    if phrases_total > 0:
+    mapping = chunk.word_to_phrase_map.tolist()
+    # The map is monotonic: only clamp if the last index overflows
+    if phrases_total > 0 and mapping and mapping[-1] >= phrases_total:
         mapping = [min(idx, phrases_total - 1) for idx in mapping]
 
     return TextParseResult(
-        words=words,
-        phrases_list=phrases_list,
+        words=chunk.words,
+        phrases_list=[full_text[start:end] for start, end in zip(chunk.phrase_starts, chunk.phrase_ends)],
         phrases_total=phrases_total,
         word_to_phrase_map=mapping,
     )
+
+
+# -----------------------------
+# Streaming tokenizer
+# -----------------------------
+
+_SENTENCE_END_RE = re.compile(r"[.!?]+")
+_TOKEN_STRIP_CHARS = PUNCTUATION_CHARS + '1234567890'
+_TRAILING_WRAPPERS = '"\'”’)]}»'
+_SENTENCE_END_CHARS = ('.', '!', '?')
+
+
+def _offsets() -> array:
+    return array("I")
+
+
+@dataclass
+class TextChunk:
+    """A line-aligned slice of tokenized text produced by `iter_text_chunks`.
+
+    Words and sentences are stored as spans (offsets into the whole
+    document); `text` is the slice of the document starting at `base`.
+    Words always lie inside `text`, while a sentence closed in this chunk
+    may start in an earlier one. `phrases_total` is the running total
+    (final on the last chunk).
+    """
+    text: str = ""
+    base: int = 0
+    word_starts: array = field(default_factory=_offsets)
+    word_lengths: array = field(default_factory=_offsets)
+    word_to_phrase_map: array = field(default_factory=_offsets)
+    phrase_starts: array = field(default_factory=_offsets)
+    phrase_ends: array = field(default_factory=_offsets)
+    phrases_total: int = 0
+    is_last: bool = False
+
+    @property
+    def words(self) -> List[str]:
+        """Materialize the words of this chunk."""
+        text, base = self.text, self.base
+        return [
+            text[start - base:start - base + length]
+            for start, length in zip(self.word_starts, self.word_lengths)
+        ]
+
+
+class IncrementalTokenizer:
+    """Span tokenizer with the same output as `build_words_and_phrase_map`.
+
+    Text is fed in document order; only the text of the sentence currently
+    open is kept between calls, so memory does not grow with the input.
+    """
+
+    def __init__(self) -> None:
+        self.phrase_idx = 0
+        self.had_word_in_phrase = False
+        self.phrases_emitted = 0
+        self._open_phrase: List[str] = []
+        self._open_start = 0
+
+    @classmethod
+    def resume(cls, phrase_idx: int, phrases_emitted: int, open_text: str, open_start: int) -> "IncrementalTokenizer":
+        """Tokenizer continuing a document from a `sentence_boundary`.
+
+        `phrase_idx` and `phrases_emitted` are the word-level and span-level
+        sentence counts before the boundary; `open_text` is the text of the
+        new sentence up to the boundary (closing wrappers and whitespace),
+        starting at offset `open_start`.
+        """
+        tokenizer = cls()
+        tokenizer.phrase_idx = phrase_idx
+        tokenizer.phrases_emitted = phrases_emitted
+        tokenizer._open_phrase = [open_text]
+        tokenizer._open_start = open_start
+        return tokenizer
+
+    def feed(self, text: str, base: int, chunk: TextChunk) -> None:
+        """Tokenize `text`, found at offset `base` of the document, into `chunk`.
+
+        Calls must split the document at line boundaries (newline included).
+        """
+        # Sentences, with the same boundaries as split_sentences()
+        pos = 0
+        for match in _SENTENCE_END_RE.finditer(text):
+            self._open_phrase.append(text[pos:match.start()])
+            self._close_phrase(chunk)
+            pos = match.end()
+            self._open_start = base + pos
+        if pos < len(text):
+            self._open_phrase.append(text[pos:])
+
+        # Words are substrings of the text: everything before a cleaned token
+        # is whitespace or stripped punctuation, so find() lands on it.
+        # (locals keep the hot loop tight)
+        find = text.find
+        add_start = chunk.word_starts.append
+        add_length = chunk.word_lengths.append
+        add_phrase_idx = chunk.word_to_phrase_map.append
+        phrase_idx = self.phrase_idx
+        had_word = self.had_word_in_phrase
+        cursor = 0
+        for raw_token in text.split():
+            cleaned = raw_token.strip(_TOKEN_STRIP_CHARS)
+            if cleaned:
+                cursor = find(cleaned, cursor)
+                add_start(base + cursor)
+                length = len(cleaned)
+                cursor += length
+                add_length(length)
+                add_phrase_idx(phrase_idx)
+                had_word = True
+
+            if had_word and raw_token.rstrip(_TRAILING_WRAPPERS).endswith(_SENTENCE_END_CHARS):
+                phrase_idx += 1
+                had_word = False
+        self.phrase_idx = phrase_idx
+        self.had_word_in_phrase = had_word
+
+    def finish(self, chunk: TextChunk) -> int:
+        """Flush the last sentence into `chunk` and return the phrase total."""
+        self._close_phrase(chunk)
+        computed_total = self.phrase_idx + (1 if self.had_word_in_phrase else 0)
+        return self.phrases_emitted if self.phrases_emitted else computed_total
+
+    def _close_phrase(self, chunk: TextChunk) -> None:
+        sentence = "".join(self._open_phrase)
+        self._open_phrase.clear()
+        stripped = sentence.lstrip()
+        if stripped:
+            start = self._open_start + len(sentence) - len(stripped)
+            chunk.phrase_starts.append(start)
+            chunk.phrase_ends.append(start + len(stripped.rstrip()))
+            self.phrases_emitted += 1
+
+
+def sentence_boundary(text: str, offset: int) -> int:
+    """Check whether the tokenizer can be restarted at line start `offset`.
+
+    That is the case when the last token before `offset` ends a sentence
+    (or only whitespace precedes it): no word of an open sentence is
+    pending, so the state only depends on counts read from the spans
+    already tokenized. Returns the end of that token's sentence
+    terminator (0 at the start of the text), or -1 when a sentence is
+    still open at `offset`.
+    """
+    pos = offset
+    while pos > 0 and text[pos - 1].isspace():
+        pos -= 1
+    if pos == 0:
+        return 0
+    while pos > 0 and text[pos - 1] in _TRAILING_WRAPPERS:
+        pos -= 1
+    if pos > 0 and text[pos - 1] in _SENTENCE_END_CHARS:
+        return pos
+    return -1
+
+
+def tokenize_text(text: str, block_size: int = 1 << 16,
+                  progress: Optional[Callable[[float], None]] = None) -> TextChunk:
+    """Tokenize a whole document into a single (last) chunk.
+
+    The text is fed in line-aligned blocks of ~`block_size` characters so the
+    temporary token strings never cover the whole document at once.
+    `progress`, if given, is called with the fraction done after each block.
+    """
+    tokenizer = IncrementalTokenizer()
+    chunk = TextChunk(text=text)
+    pos = 0
+    while pos < len(text):
+        end = text.find("\n", pos + block_size)
+        end = len(text) if end < 0 else end + 1
+        tokenizer.feed(text[pos:end], pos, chunk)
+        pos = end
+        if progress is not None:
+            progress(pos / len(text))
+    chunk.phrases_total = tokenizer.finish(chunk)
+    chunk.is_last = True
+    return chunk
+
+
+def iter_text_chunks(lines: Iterable[str], chunk_size: int = 2048) -> Iterator[TextChunk]:
+    """Tokenize `lines` lazily, yielding a chunk every ~`chunk_size` words.
+
+    Lines must keep their line endings (file iteration or
+    ``str.splitlines(keepends=True)``). Word phrase indices are final except
+    in the degenerate case where they exceed the final `phrases_total`;
+    consumers clamp them against the total of the last chunk, as
+    `build_words_and_phrase_map` does.
+    """
+    tokenizer = IncrementalTokenizer()
+    chunk = TextChunk()
+    pending: List[str] = []
+    offset = 0
+    for line in lines:
+        tokenizer.feed(line, offset, chunk)
+        pending.append(line)
+        offset += len(line)
+        if len(chunk.word_starts) >= chunk_size:
+            chunk.text = "".join(pending)
+            chunk.phrases_total = tokenizer.phrases_emitted
+            yield chunk
+            chunk = TextChunk(base=offset)
+            pending = []
+
+    chunk.text = "".join(pending)
+    chunk.phrases_total = tokenizer.finish(chunk)
+    chunk.is_last = True
+    yield chunk
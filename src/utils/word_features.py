@@ -0,0 +1,158 @@
+"""
+Per-word features of a corpus and sorted indexes to select words by them.
+
+`WordFeatures` computes, once per complete corpus, one compact array per
+feature (one entry per word, in text order):
+
+* ``length`` - characters of the word (the corpus ``word_lengths`` array)
+* ``syllables`` - estimate: groups of consecutive vowels (Italian spelling)
+* ``frequency_rank`` - rank of the word form (lowercase) by number of
+  occurrences in the corpus: 0 is the most frequent, ties keep the order
+  of first appearance
+* ``phrase_position`` - position of the word in its sentence (0 = first)
+
+Forms are analysed once per distinct form, not once per word. For each
+feature a sorted index (word indices ordered by value, then by position)
+is built on first use, together with the offset where every value starts.
+After that a range query ("6+ letters") or a top-k query ("the 200 rarest
+words") is a slice of the index: its cost is proportional to the result.
+
+`WordFilter` describes such a selection; `WORD_FILTERS` holds the named
+presets offered on the instruction screen.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from operator import sub
+from typing import Dict, Optional
+import re
+
+FEATURES = ("length", "syllables", "frequency_rank", "phrase_position")
+
+_VOWEL_GROUP_RE = re.compile(r"[aeiouyàáèéìíòóùú]+")
+
+
+def estimate_syllables(form: str) -> int:
+    """Rough syllable count of a lowercase word (at least 1)."""
+    return max(1, len(_VOWEL_GROUP_RE.findall(form)))
+
+
+class _SortedIndex:
+    """Word indices ordered by a feature value, with the start of each value."""
+
+    __slots__ = ("order", "starts")
+
+    def __init__(self, values):
+        order = array("I", sorted(range(len(values)), key=values.__getitem__))
+        top = max(values) if len(values) else 0
+        counts = Counter(values)
+        starts = array("I", bytes(4 * (top + 2)))
+        total = 0
+        for value in range(top + 1):
+            starts[value] = total
+            total += counts.get(value, 0)
+        starts[top + 1] = total
+        self.order = order
+        self.starts = starts
+
+    def between(self, minimum: int, maximum: int) -> array:
+        """Words whose value is in [minimum, maximum]."""
+        last = len(self.starts) - 1
+        lo = self.starts[max(0, min(minimum, last))]
+        hi = self.starts[max(0, min(maximum + 1, last))]
+        return self.order[lo:hi] if lo < hi else array("I")
+
+
+class WordFeatures:
+    """Feature arrays of a complete corpus, with lazily built sorted indexes."""
+
+    def __init__(self, corpus):
+        self.corpus = corpus
+        form_ids: Dict[str, int] = {}
+        type_ids = array("I", (form_ids.setdefault(word.lower(), len(form_ids)) for word in corpus.words))
+        forms = list(form_ids)
+
+        # Dense rank by occurrences, ties in order of first appearance
+        counts = Counter(type_ids)
+        by_frequency = sorted(range(len(forms)), key=lambda t: -counts[t])
+        type_rank = array("I", bytes(4 * len(forms)))
+        for rank, type_id in enumerate(by_frequency):
+            type_rank[type_id] = rank
+        type_syllables = array("B", (min(255, estimate_syllables(form)) for form in forms))
+
+        self.length = corpus.word_lengths
+        self.syllables = array("B", map(type_syllables.__getitem__, type_ids))
+        self.frequency_rank = array("I", map(type_rank.__getitem__, type_ids))
+        first_words = corpus.phrase_first_words
+        self.phrase_position = array(
+            "I", map(sub, range(len(type_ids)), map(first_words.__getitem__, corpus.word_to_phrase_map))
+        )
+        self.type_count = len(forms)
+        self._indexes: Dict[str, _SortedIndex] = {}
+
+    def values(self, feature: str):
+        """The per-word array of `feature` (ValueError if unknown)."""
+        if feature not in FEATURES:
+            raise ValueError(f"Unknown word feature: {feature!r} (expected one of {', '.join(FEATURES)})")
+        return getattr(self, feature)
+
+    def index(self, feature: str) -> _SortedIndex:
+        index = self._indexes.get(feature)
+        if index is None:
+            index = self._indexes[feature] = _SortedIndex(self.values(feature))
+        return index
+
+    def select(self, feature: str, minimum: Optional[int] = None, maximum: Optional[int] = None) -> array:
+        """Indices of the words with `feature` between `minimum` and `maximum` (inclusive).
+
+        Ordered by feature value, then by position in the text.
+        """
+        index = self.index(feature)
+        top = len(index.starts) - 2
+        return index.between(0 if minimum is None else minimum, top if maximum is None else maximum)
+
+    def top(self, feature: str, count: int, highest: bool = True) -> array:
+        """Indices of the `count` words with the highest (or lowest) `feature`."""
+        order = self.index(feature).order
+        count = max(0, min(count, len(order)))
+        if not count:
+            return array("I")
+        return order[len(order) - count:] if highest else order[:count]
+
+
+@dataclass(frozen=True)
+class WordFilter:
+    """A selection of words by one feature: a value range, or the `top` highest values."""
+    feature: str
+    minimum: Optional[int] = None
+    maximum: Optional[int] = None
+    top: Optional[int] = None
+    label: str = ""
+
+    def apply(self, features: WordFeatures) -> array:
+        """Indices of the selected words (ordered by feature value)."""
+        if self.top is not None:
+            return features.top(self.feature, self.top)
+        return features.select(self.feature, self.minimum, self.maximum)
+
+
+WORD_FILTERS: Dict[str, WordFilter] = {
+    "long_words": WordFilter("length", minimum=6, label="words of 6+ letters"),
+    "short_words": WordFilter("length", maximum=4, label="words of up to 4 letters"),
+    "polysyllables": WordFilter("syllables", minimum=4, label="words of 4+ syllables"),
+    "rarest_200": WordFilter("frequency_rank", top=200, label="the 200 rarest words"),
+    "sentence_openers": WordFilter("phrase_position", maximum=0, label="first word of each sentence"),
+}
+
+
+def get_word_filter(name: str) -> Optional[WordFilter]:
+    """Named filter (None for "" = all words); raises ValueError if unknown."""
+    if not name:
+        return None
+    try:
+        return WORD_FILTERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown word filter: {name!r} (expected one of {', '.join(WORD_FILTERS)})") from None
@@ -0,0 +1,61 @@
+import os
+from pathlib import Path
+
+import pygame
+import pytest
+
+from src.utils import asset_pack
+from src.utils.asset_pack import AssetPack, build_asset_pack, load_packed_surface
+
+
+ASSETS = ["assets/a.png", "assets/b.png"]
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Project root with two small images, set as the resource folder."""
+    (tmp_path / "assets").mkdir()
+    for i, relative_path in enumerate(ASSETS):
+        surface = pygame.Surface((3 + i, 2), pygame.SRCALPHA)
+        surface.fill((10 * i, 20, 30, 255))
+        surface.set_at((0, 0), (255, 0, 0, 128))
+        pygame.image.save(surface, str(tmp_path / relative_path))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(asset_pack, "_pack_asset_paths", lambda: list(ASSETS))
+    monkeypatch.setattr(asset_pack, "_pack", None)
+    monkeypatch.setattr(asset_pack, "_pack_checked", False)
+    return tmp_path
+
+
+def test_pack_round_trip_and_loose_file_fallback(project: Path) -> None:
+    build_asset_pack(root=str(project))
+
+    surface = load_packed_surface("assets/b.png")
+    loose = pygame.image.load(str(project / "assets/b.png"))
+    assert surface is not None and surface.get_size() == (4, 2)
+    assert pygame.image.tobytes(surface, "RGBA") == pygame.image.tobytes(loose, "RGBA")
+    assert surface.get_at((0, 0)) == (255, 0, 0, 128)
+
+    # Not in the pack, or edited after packing: use the loose file
+    assert load_packed_surface("assets/other.png") is None
+    pygame.image.save(pygame.Surface((9, 9)), str(project / "assets/a.png"))
+    os.utime(project / "assets/a.png", (1, 1))
+    assert load_packed_surface("assets/a.png") is None
+    assert load_packed_surface("assets/b.png") is not None
+
+
+def test_corrupt_or_truncated_pack_is_ignored(project: Path) -> None:
+    path = Path(build_asset_pack(root=str(project)))
+    data = path.read_bytes()
+
+    path.write_bytes(data[:-8])
+    with pytest.raises(ValueError):
+        AssetPack(str(path))
+    assert load_packed_surface("assets/a.png") is None
+
+    path.write_bytes(data[:12] + b"{not json" + data[21:])
+    with pytest.raises(ValueError):
+        AssetPack(str(path))
+    path.write_bytes(b"XXXX" + data[4:])
+    with pytest.raises(ValueError):
+        AssetPack(str(path))
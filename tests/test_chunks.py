@@ -0,0 +1,51 @@
+import pytest
+
+from src.utils.chunks import MAX_CHUNK_WORDS, ChunkPlan, make_chunk_plan
+from src.utils.corpus import Corpus
+
+
+TEXT = "Il gatto dorme sul divano. Il cane abbaia forte! Piove? Domani esce il sole, forse. Fine"
+
+
+def test_word_groups_stay_inside_sentences() -> None:
+    corpus = Corpus.from_text(TEXT)
+    plan = ChunkPlan(corpus, "words", 3)
+    mapping = corpus.word_to_phrase_map
+
+    ranges = [plan.word_range(c) for c in range(plan.count)]
+
+    assert ranges[0] == (0, 3) and ranges[1] == (3, 5)
+    assert [i for start, end in ranges for i in range(start, end)] == list(range(corpus.word_count))
+    for start, end in ranges:
+        assert 1 <= end - start <= 3
+        assert mapping[start] == mapping[end - 1]
+    assert all(plan.chunk_of(i) == c for c, (start, end) in enumerate(ranges) for i in range(start, end))
+    assert plan.text(0) == "Il gatto dorme"
+    assert plan.masks(0) == [corpus.mask(0), corpus.mask(1), corpus.mask(2)]
+    assert plan.stimulus_type == "phrase"
+
+
+def test_sentence_chunks() -> None:
+    corpus = Corpus.from_text(TEXT)
+    plan = make_chunk_plan(corpus, "phrase")
+
+    assert plan.count == corpus.phrases_total
+    assert plan.text(2) == "Piove"
+    assert plan.word_range(plan.count - 1)[1] == corpus.word_count
+    assert plan.stimulus_type == "sentence"
+    assert plan.snapshot() == {"chunk_mode": "phrase", "chunk_words": None}
+    assert make_chunk_plan(corpus, "word") is None
+    with pytest.raises(ValueError):
+        make_chunk_plan(corpus, "lines")
+
+
+def test_long_sentences_are_split() -> None:
+    # A word list without punctuation is one sentence
+    corpus = Corpus.from_text(" ".join(f"parola{i}" for i in range(70_000)) + ". Fine")
+    plan = make_chunk_plan(corpus, "phrase")
+
+    ranges = [plan.word_range(c) for c in range(plan.count)]
+    assert all(1 <= end - start <= MAX_CHUNK_WORDS for start, end in ranges)
+    assert ranges[-1] == (70_000, 70_001) and ranges[-2][1] == 70_000
+    assert plan.count == -(-70_000 // MAX_CHUNK_WORDS) + 1
+    assert ChunkPlan(corpus, "words", 1000).size == MAX_CHUNK_WORDS
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from src.utils.compiled_corpus import CompiledCorpus, compile_corpus
+from src.utils.corpus import Corpus
+from src.utils.text import MASK_STYLES, mask_word
+
+
+TEXT = "Perché è già così? «Città» d'inverno, 3 volte!\nCapitolo 2\n"
+
+
+def test_compiled_corpus_round_trip(tmp_path: Path) -> None:
+    corpus = Corpus.from_text(TEXT)
+    path = tmp_path / "testo.txt.tscorpus"
+    path.write_bytes(compile_corpus(corpus, "ab" * 32, 123))
+
+    compiled = CompiledCorpus(str(path))
+
+    assert list(compiled.words) == list(corpus.words)
+    assert list(compiled.phrases) == list(corpus.phrases)
+    assert list(compiled.word_to_phrase_map) == list(corpus.word_to_phrase_map)
+    assert list(compiled.iter_words()) == list(corpus.iter_words())
+    # Public spans are character offsets, as in Corpus
+    for name in ("word_starts", "word_lengths", "phrase_starts", "phrase_ends"):
+        assert list(getattr(compiled, name)) == list(getattr(corpus, name)), name
+    for start, end in [(0, 6), (7, 8), (19, 27), (3, len(TEXT))]:
+        assert compiled.text_slice(start, end) == TEXT[start:end]
+    assert [compiled.mask(i) for i in range(compiled.word_count)] == [mask_word(w) for w in corpus.words]
+    assert compiled.source_sha256 == "ab" * 32
+    assert compiled.source_size == 123
+
+
+def test_compiled_corpus_other_mask_style(tmp_path: Path) -> None:
+    corpus = Corpus.from_text(TEXT)
+    path = tmp_path / "testo.txt.tscorpus"
+    path.write_bytes(compile_corpus(corpus, "ab" * 32, 123))
+    style = MASK_STYLES["hash_no_punctuation"]
+
+    compiled = CompiledCorpus(str(path))
+    compiled.set_mask_style(style)
+
+    assert [compiled.mask(i) for i in range(compiled.word_count)] == [mask_word(w, style) for w in corpus.words]
+
+
+def test_compiled_corpus_rejects_truncated_files(tmp_path: Path) -> None:
+    data = compile_corpus(Corpus.from_text(TEXT), "ab" * 32, 123)
+    path = tmp_path / "testo.txt.tscorpus"
+
+    for size in [0, *range(1, len(data)), len(data) + 1]:
+        path.write_bytes((data + b"\0")[:size])
+        try:
+            CompiledCorpus(str(path))
+        except ValueError as e:
+            assert "Not a compiled corpus" in str(e), size
+        else:
+            raise AssertionError(f"accepted a {size}-byte file")
@@ -0,0 +1,65 @@
+from array import array
+
+import pygame
+
+from src.core.cue_manager import CueManager
+
+
+class _Channel:
+    def __init__(self):
+        self.played = []
+
+    def play(self, sound):
+        self.played.append(sound)
+
+
+def test_tone_samples_ramp_in_and_out() -> None:
+    samples = CueManager()._tone_samples(8000, 1000, 10)
+
+    assert len(samples) == 80
+    # 2 ms ramps (16 samples) at both ends, full scale in between
+    assert samples[0] == 0
+    assert max(abs(s) for s in samples[:4]) < 32767 * 4 / 16
+    assert max(abs(s) for s in samples[-4:]) < 32767 * 4 / 16
+    assert max(abs(s) for s in samples[16:-16]) > 32000
+
+
+def test_make_sound_interleaves_mono_on_every_channel(monkeypatch) -> None:
+    buffers = []
+    monkeypatch.setattr(pygame.mixer, "Sound", lambda buffer: buffers.append(buffer) or buffer)
+    mono = array("h", [1, -2, 3])
+
+    CueManager()._make_sound(mono, 2)
+    CueManager()._make_sound(mono, 1)
+
+    assert array("h", buffers[0]).tolist() == [1, 1, -2, -2, 3, 3]
+    assert array("h", buffers[1]).tolist() == [1, -2, 3]
+
+
+def test_play_returns_none_when_disabled_or_not_loaded() -> None:
+    cues = CueManager()
+    cues.enabled = True
+    assert cues.play("tone") is None  # load() never ran
+
+    cues._channel = _Channel()
+    cues._sounds = {"tone": object()}
+    cues.enabled = False
+    assert cues.play("tone") is None
+    assert cues._channel.played == []
+
+    cues.enabled = True
+    assert cues.play("mask") is None
+    assert cues.play("") is None
+
+
+def test_play_estimates_latency_from_the_mixer_buffer() -> None:
+    cues = CueManager()
+    cues.enabled = True
+    cues._channel = _Channel()
+    cues._sounds = {"tone": "tone sound"}
+    cues._buffer_latency_ms = 5.8
+
+    latency = cues.play("tone")
+
+    assert cues._channel.played == ["tone sound"]
+    assert 5.8 <= latency < 50
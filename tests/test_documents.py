@@ -0,0 +1,119 @@
+import io
+import zipfile
+
+import pytest
+
+from src.loaders.documents import document_lines, extract_document_text
+from src.loaders.epub_text import epub_lines, read_spine
+from src.loaders.odt_text import extract_odt_text
+from src.utils.corpus import Corpus
+from src.utils.text import iter_text_chunks
+
+
+TEXT_NS = "urn:oasis:names:tc:opendocument:xmlns:text:1.0"
+OFFICE_NS = "urn:oasis:names:tc:opendocument:xmlns:office:1.0"
+
+
+def _make_odt(body: str) -> bytes:
+    content = (
+        f'<?xml version="1.0" encoding="UTF-8"?>'
+        f'<office:document-content xmlns:office="{OFFICE_NS}" xmlns:text="{TEXT_NS}">'
+        f'<office:body><office:text>{body}</office:text></office:body></office:document-content>'
+    )
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("mimetype", "application/vnd.oasis.opendocument.text")
+        archive.writestr("content.xml", content)
+        archive.writestr("Pictures/image1.png", b"\x89PNG" + bytes(4096))
+    return out.getvalue()
+
+
+def _make_epub(chapters: dict, spine: list) -> bytes:
+    manifest = "".join(
+        f'<item id="{name}" href="{name}.xhtml" media-type="application/xhtml+xml"/>' for name in chapters
+    )
+    itemrefs = "".join(f'<itemref idref="{name}"/>' for name in spine)
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("mimetype", "application/epub+zip")
+        archive.writestr(
+            "META-INF/container.xml",
+            '<container xmlns="urn:oasis:names:tc:opendocument:xmlns:container"><rootfiles>'
+            '<rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>'
+            '</rootfiles></container>',
+        )
+        archive.writestr(
+            "OEBPS/content.opf",
+            f'<package xmlns="http://www.idpf.org/2007/opf"><manifest>{manifest}'
+            f'<item id="css" href="style.css" media-type="text/css"/></manifest>'
+            f'<spine>{itemrefs}</spine></package>',
+        )
+        for name, body in chapters.items():
+            archive.writestr(
+                f"OEBPS/{name}.xhtml",
+                f'<?xml version="1.0" encoding="utf-8"?><html xmlns="http://www.w3.org/1999/xhtml">'
+                f'<head><title>{name}</title><style>p {{ }}</style></head><body>{body}</body></html>',
+            )
+    return out.getvalue()
+
+
+def test_odt_paragraphs_and_inline_elements() -> None:
+    data = _make_odt(
+        '<text:h>Capitolo 1</text:h>'
+        '<text:p>C\'era <text:span>una</text:span><text:s text:c="2"/>volta'
+        '<text:note><text:note-body><text:p>Nota.</text:p></text:note-body></text:note> un re.</text:p>'
+        '<text:p>Nome<text:tab/>Cognome<text:line-break/>Anzi no!</text:p>'
+        '<text:list><text:list-item><text:p>Voce</text:p></text:list-item></text:list>'
+    )
+
+    assert extract_odt_text(data) == "Capitolo 1\nC'era una  volta un re.\nNome\tCognome\nAnzi no!\nVoce\n"
+
+
+def test_epub_follows_spine_and_skips_markup() -> None:
+    data = _make_epub(
+        {
+            "c1": "<h1>Uno</h1><p>Prima   frase\n del libro.</p><script>x = 1;</script>",
+            "c2": "<p>Seconda &amp; ultima<br/>riga.</p>",
+            "note": "<p>Non nello spine.</p>",
+        },
+        spine=["c2", "c1"],
+    )
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert [c.path for c in read_spine(archive)] == ["OEBPS/c2.xhtml", "OEBPS/c1.xhtml"]
+    assert extract_document_text("libro.epub", data) == "Seconda & ultima\nriga.\nUno\nPrima frase del libro.\n"
+
+
+def test_epub_chapters_are_read_on_demand(monkeypatch) -> None:
+    data = _make_epub({f"c{i}": f"<p>Capitolo {i}.</p>" for i in range(50)}, spine=[f"c{i}" for i in range(50)])
+    reads = []
+    original_read = zipfile.ZipFile.read
+
+    def read(self, name, *args):
+        reads.append(name)
+        return original_read(self, name, *args)
+
+    monkeypatch.setattr(zipfile.ZipFile, "read", read)
+    lines = epub_lines(data)
+    assert next(lines) == "Capitolo 0.\n"
+    assert [name for name in reads if name.endswith(".xhtml")] == ["OEBPS/c0.xhtml"]
+    lines.close()
+
+
+def test_document_stream_matches_full_parse() -> None:
+    data = _make_epub({f"c{i}": "<p>Una frase. E un'altra!</p>" * 20 for i in range(5)}, spine=[f"c{i}" for i in range(5)])
+    expected = Corpus.from_text(extract_document_text("libro.epub", data))
+
+    corpus = Corpus.from_chunks(iter_text_chunks(document_lines("libro.epub", data), chunk_size=7))
+
+    assert list(corpus.words) == list(expected.words)
+    assert corpus.word_to_phrase_map == expected.word_to_phrase_map
+
+
+def test_documents_reject_other_files() -> None:
+    assert document_lines("testo.txt", b"testo") is None
+    for name in ("libro.epub", "testo.odt"):
+        with pytest.raises(ValueError):
+            document_lines(name, b"non un archivio")
+    with pytest.raises(ValueError):
+        document_lines("libro.epub", _make_odt("<text:p>x</text:p>"))
@@ -0,0 +1,64 @@
+import io
+import zipfile
+
+import pytest
+
+from src.loaders.docx_text import DOCUMENT_PART, docx_lines, extract_docx_text
+from src.utils.corpus import Corpus
+from src.utils.text import iter_text_chunks
+
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+BODY = (
+    "<w:p><w:r><w:t>C'era una volta</w:t></w:r><w:r><w:t xml:space=\"preserve\"> un re.</w:t></w:r></w:p>"
+    "<w:p><w:r><w:t>Nome</w:t><w:tab/><w:t>Cognome</w:t><w:br/><w:t>Anzi no!</w:t></w:r></w:p>"
+    "<w:tbl><w:tr><w:tc><w:p><w:r><w:t>Cella</w:t></w:r></w:p></w:tc></w:tr></w:tbl>"
+    "<w:p/>"
+    "<w:p><w:r><w:t>Fine</w:t></w:r></w:p>"
+)
+
+
+def _make_docx(body: str = BODY) -> bytes:
+    document = f'<?xml version="1.0" encoding="UTF-8"?><w:document xmlns:w="{W_NS}"><w:body>{body}</w:body></w:document>'
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(DOCUMENT_PART, document)
+        archive.writestr("word/header1.xml", f'<w:hdr xmlns:w="{W_NS}"><w:p><w:r><w:t>Intestazione</w:t></w:r></w:p></w:hdr>')
+        archive.writestr("word/media/image1.png", b"\x89PNG" + bytes(4096))
+    return out.getvalue()
+
+
+def test_extract_docx_text_follows_docx2txt_rules() -> None:
+    text = extract_docx_text(_make_docx())
+
+    assert text == "\n\nC'era una volta un re.\n\nNome\tCognome\nAnzi no!\n\nCella\n\n\n\nFine"
+
+
+def test_docx_lines_keep_line_endings() -> None:
+    lines = list(docx_lines(_make_docx()))
+
+    assert "".join(lines) == extract_docx_text(_make_docx())
+    assert all(line.endswith("\n") for line in lines[:-1])
+
+
+def test_docx_stream_matches_full_parse() -> None:
+    data = _make_docx(BODY * 50)
+    expected = Corpus.from_text(extract_docx_text(data))
+
+    corpus = Corpus.from_chunks(iter_text_chunks(docx_lines(data), chunk_size=7))
+
+    assert list(corpus.words) == list(expected.words)
+    assert list(corpus.phrases) == list(expected.phrases)
+    assert corpus.word_to_phrase_map == expected.word_to_phrase_map
+
+
+def test_docx_lines_rejects_other_files() -> None:
+    with pytest.raises(ValueError):
+        docx_lines(b"testo semplice")
+
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w") as archive:
+        archive.writestr("content.xml", "<x/>")
+    with pytest.raises(ValueError):
+        docx_lines(out.getvalue())
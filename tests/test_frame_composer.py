@@ -0,0 +1,50 @@
+import pygame
+
+from src.core.frame_composer import FrameComposer
+
+
+def _painter(color, calls: list):
+    def draw(frame: pygame.Surface) -> None:
+        calls.append(color)
+        frame.fill(color)
+    return draw
+
+
+def test_present_counts_hits_and_misses() -> None:
+    composer = FrameComposer(slots=2)
+    screen = pygame.Surface((40, 30))
+    calls: list = []
+
+    assert not composer.present(screen, "word", _painter((255, 0, 0), calls))
+    # Same frame again: no new frame presented, nothing counted or drawn
+    assert composer.present(screen, "word", _painter((255, 0, 0), calls))
+    composer.prepare("mask", (40, 30), _painter((0, 0, 255), calls))
+    assert composer.present(screen, "mask", _painter((0, 0, 255), calls))
+
+    assert (composer.hits, composer.misses) == (1, 1)
+    assert calls == [(255, 0, 0), (0, 0, 255)]
+    assert screen.get_at((5, 5)) == (0, 0, 255, 255) and composer.shown == "mask"
+
+
+def test_slots_are_reused_and_resized() -> None:
+    composer = FrameComposer(slots=2)
+    calls: list = []
+    first = composer.prepare("a", (40, 30), _painter((1, 1, 1), calls))
+    composer.prepare("b", (40, 30), _painter((2, 2, 2), calls))
+    composer.prepare("c", (40, 30), _painter((3, 3, 3), calls))
+    assert not composer.has("a") and composer.has("b") and composer.has("c")
+
+    # The surface of the evicted frame is used for the next one
+    assert composer.prepare("d", (40, 30), _painter((4, 4, 4), calls)) is first
+
+    # After a window resize the frame is composed again at the new size
+    resized = composer.prepare("d", (60, 50), _painter((5, 5, 5), calls))
+    assert resized.get_size() == (60, 50) and resized.get_at((0, 0)) == (5, 5, 5, 255)
+    other = composer.prepare("e", (60, 50), _painter((6, 6, 6), calls))
+    assert other.get_size() == (60, 50) and other is not resized
+    assert calls == [(1, 1, 1), (2, 2, 2), (3, 3, 3), (4, 4, 4), (5, 5, 5), (6, 6, 6)]
+
+    composer.clear()
+    assert composer.shown is None and not composer.has("e")
+    # Cleared surfaces are used for the next frames
+    assert composer.prepare("f", (60, 50), _painter((7, 7, 7), calls)) in (resized, other)
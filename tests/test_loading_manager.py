@@ -0,0 +1,105 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.core.loading_manager import LoadCancelled, LoadingManager
+from src.loaders import file_loader
+from src.utils import parse_cache
+from src.utils.corpus import Corpus
+from src.utils.parse_cache import ParseCache
+
+
+TEXT = "Il gatto dorme sul divano. Il cane abbaia!\nPoi tutti a nanna.\n"
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> ParseCache:
+    """Keep the shared parse cache out of the home directory."""
+    cache = ParseCache(tmp_path / "cache")
+    monkeypatch.setattr(parse_cache, "_cache", cache)
+    return cache
+
+
+def _write(tmp_path: Path, name: str, text: str) -> str:
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_loading_manager_ingests_a_file(tmp_path: Path, cache: ParseCache) -> None:
+    path = _write(tmp_path, "testo.txt", TEXT)
+    manager = LoadingManager()
+
+    job = manager.start(path, stream=False)
+    assert manager.is_loading and manager.wait() is job
+
+    assert job.error is None and job.progress == 1.0
+    assert list(job.result.loaded.corpus.words) == list(Corpus.from_text(TEXT).words)
+    assert job.result.metadata.name == "testo.txt"
+    assert cache.lookup(path)[0] == job.result.metadata.sha256
+    assert not manager.is_loading
+    manager.shutdown()
+
+
+def test_loading_manager_streams_a_file_missing_from_the_cache(tmp_path: Path) -> None:
+    manager = LoadingManager()
+
+    job = manager.start(_write(tmp_path, "testo.txt", TEXT))
+    manager.wait()
+
+    assert job.result.loaded is None and job.result.stream is not None
+    assert [chunk for chunk in job.result.stream]
+    job.result.stream.close()
+    manager.shutdown()
+
+
+def test_loading_manager_reports_errors(tmp_path: Path) -> None:
+    manager = LoadingManager()
+
+    missing = manager.start(str(tmp_path / "manca.txt"))
+    assert manager.wait() is missing
+    empty = manager.start(_write(tmp_path, "vuoto.txt", ""), stream=False)
+    assert manager.wait() is empty
+
+    assert isinstance(missing.error, FileNotFoundError) and missing.result is None
+    assert isinstance(empty.error, ValueError) and empty.result is None
+    manager.shutdown()
+
+
+def test_loading_manager_cancel_stops_the_hash(tmp_path: Path, cache: ParseCache,
+                                               monkeypatch: pytest.MonkeyPatch) -> None:
+    """The worker raises LoadCancelled at the next progress step and the job is dropped."""
+    monkeypatch.setattr(file_loader, "_HASH_STEP", 16)
+    hashing, cancelled = threading.Event(), threading.Event()
+    steps, raised = [], []
+    hash_buffer = file_loader._hash_buffer
+
+    def gated_hash(buffer, progress, share):
+        def step(done: float) -> None:
+            steps.append(done)
+            hashing.set()
+            cancelled.wait(5)
+            try:
+                progress(done)
+            except LoadCancelled:
+                raised.append(done)
+                raise
+        return hash_buffer(buffer, step, share)
+
+    monkeypatch.setattr(file_loader, "_hash_buffer", gated_hash)
+    path = _write(tmp_path, "lungo.txt", TEXT * 4)
+    manager = LoadingManager()
+
+    job = manager.start(path, stream=False)
+    assert hashing.wait(5)
+    manager.cancel()
+    cancelled.set()
+    # The worker runs one job at a time: the next one (hashed in one step) is collected after it
+    other = manager.start(_write(tmp_path, "altro.txt", "Una frase."), stream=False)
+    assert manager.wait() is other
+
+    assert job.cancelled and raised == steps and len(steps) == 1
+    assert job.result is None and job.error is None
+    assert cache.lookup(path) is None
+    manager.shutdown()
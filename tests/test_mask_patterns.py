@@ -0,0 +1,36 @@
+import random
+
+from src.utils.mask_patterns import (
+    MASK_LETTERS,
+    checkerboard_pixels,
+    noise_pixels,
+    random_letters,
+    width_bucket,
+)
+
+
+def test_width_buckets_cover_the_stimulus() -> None:
+    assert width_bucket(1, 24) == 24
+    assert width_bucket(24, 24) == 24
+    assert width_bucket(25, 24) == 48
+    assert width_bucket(0, 24) == 24
+
+
+def test_checkerboard_cells() -> None:
+    pixels = checkerboard_pixels(8, 4, 2)
+    rows = [pixels[y * 8:(y + 1) * 8] for y in range(4)]
+
+    assert len(pixels) == 32
+    assert rows[0] == bytes([0, 0, 1, 1, 0, 0, 1, 1]) == rows[1]
+    assert rows[2] == bytes([1, 1, 0, 0, 1, 1, 0, 0]) == rows[3]
+    assert checkerboard_pixels(8, 4, 2, (2, 0)) == b"".join((rows[2], rows[2], rows[0], rows[0]))
+
+
+def test_noise_and_letters_are_seeded() -> None:
+    pixels = noise_pixels(50, 20, 4, random.Random(7))
+
+    assert len(pixels) == 1000
+    assert set(pixels) == {0, 1, 2, 3}
+    assert pixels == noise_pixels(50, 20, 4, random.Random(7))
+    letters = random_letters(6, random.Random(7))
+    assert len(letters) == 6 and set(letters) <= set(MASK_LETTERS)
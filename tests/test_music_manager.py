@@ -0,0 +1,167 @@
+from concurrent.futures import wait
+from types import SimpleNamespace
+
+import pygame
+import pytest
+
+from src.core.config import config
+from src.core.music_manager import MusicManager
+
+
+class _Sound:
+    def __init__(self, track: str, length_s: float = 10.0):
+        self.track = track
+        self.length_s = length_s
+
+    def get_length(self) -> float:
+        return self.length_s
+
+
+class _Channel:
+    def __init__(self, log: list, index: int):
+        self.log = log
+        self.index = index
+        self.volume = 1.0
+        self.sound = None
+        self.queued = None
+
+    def play(self, sound):
+        self.log.append((self.index, sound.track))
+        self.sound = sound
+
+    def queue(self, sound):
+        self.queued = sound
+
+    def get_queue(self):
+        return self.queued
+
+    def get_sound(self):
+        return self.sound
+
+    def set_volume(self, volume):
+        self.volume = volume
+
+    def stop(self):
+        self.sound = None
+
+    def get_busy(self):
+        return self.sound is not None
+
+
+@pytest.fixture
+def mixer(monkeypatch):
+    """Fake mixer: channels record what they play, get_ticks reads `now`."""
+    state = SimpleNamespace(now=0, played=[], decoded=[], channels={})
+
+    def channel(index):
+        return state.channels.setdefault(index, _Channel(state.played, index))
+
+    def decode(track):
+        state.decoded.append(track)
+        if track == "broken":
+            raise pygame.error("unreadable")
+        return _Sound(track)
+
+    monkeypatch.setattr(pygame.mixer, "get_init", lambda: (44100, -16, 2))
+    monkeypatch.setattr(pygame.mixer, "get_num_channels", lambda: 8)
+    monkeypatch.setattr(pygame.mixer, "set_reserved", lambda count: count)
+    monkeypatch.setattr(pygame.mixer, "Channel", channel)
+    monkeypatch.setattr(pygame.mixer.music, "stop", lambda: None)
+    monkeypatch.setattr(pygame.time, "get_ticks", lambda: state.now)
+    monkeypatch.setattr(MusicManager, "_decode", staticmethod(decode))
+    monkeypatch.setattr(config.music, "loop", True)
+    return state
+
+
+def _start(mixer, tracks, crossfade_ms: int) -> MusicManager:
+    config.music.playlists["test"] = tracks
+    music = MusicManager()
+    music.crossfade_ms = crossfade_ms
+    music.volume = 0.8
+    assert music.play_playlist("test")
+    return music
+
+
+def _update_at(music: MusicManager, mixer, now: int) -> None:
+    """Let the decoder finish, then run one frame at `now`."""
+    if music._next is not None:
+        wait([music._next[1]], timeout=5)
+    mixer.now = now
+    music.update()
+
+
+@pytest.fixture(autouse=True)
+def _restore_playlists():
+    playlists = dict(config.music.playlists)
+    yield
+    config.music.playlists.clear()
+    config.music.playlists.update(playlists)
+
+
+def test_playlist_crossfades_into_the_next_track(mixer) -> None:
+    music = _start(mixer, ("a", "b", "c"), crossfade_ms=1000)
+    ch0, ch1 = music._channels
+
+    _update_at(music, mixer, 0)
+    assert mixer.played == [(ch0.index, "a")] and ch0.volume == 0.8
+    assert music._next[0] == "b"  # prefetched as soon as "a" started
+
+    _update_at(music, mixer, 8999)
+    assert len(mixer.played) == 1  # more than crossfade_ms left
+
+    _update_at(music, mixer, 9000)
+    assert mixer.played[-1] == (ch1.index, "b") and ch1.volume == 0.0
+    assert music.current_track == "b" and music._next[0] == "c"
+
+    _update_at(music, mixer, 9500)
+    assert (ch1.volume, ch0.volume) == pytest.approx((0.4, 0.4))
+
+    _update_at(music, mixer, 10000)
+    assert ch1.volume == pytest.approx(0.8) and ch0.sound is None
+    assert music._xfade_started_ms is None
+
+
+def test_playlist_advances_in_order_and_loops(mixer) -> None:
+    music = _start(mixer, ("a", "b", "c"), crossfade_ms=1000)
+    now = 0
+    for _ in range(4):
+        _update_at(music, mixer, now)
+        _update_at(music, mixer, now + 1000)  # end of the crossfade
+        now += 9000
+
+    assert [track for _, track in mixer.played] == ["a", "b", "c", "a"]
+    assert mixer.decoded == ["a", "b", "c", "a", "b"]
+
+
+def test_playlist_queues_gapless_without_crossfade(mixer) -> None:
+    music = _start(mixer, ("a", "b"), crossfade_ms=0)
+    ch0, _ = music._channels
+
+    _update_at(music, mixer, 0)
+    _update_at(music, mixer, 100)
+    assert ch0.queued.track == "b" and music.current_track == "a"
+
+    # The mixer starts the queued sound on the same channel
+    ch0.sound, ch0.queued = ch0.queued, None
+    _update_at(music, mixer, 10000)
+    assert music.current_track == "b" and music._current_started_ms == 10000
+    assert music._next[0] == "a"
+
+
+def test_single_track_playlist_reuses_the_decoded_sound(mixer) -> None:
+    music = _start(mixer, ("a",), crossfade_ms=1000)
+
+    _update_at(music, mixer, 0)
+
+    assert mixer.decoded == ["a"]
+    assert music._next[1].result() is music._current_sound
+
+
+def test_unreadable_track_is_dropped_from_the_playlist(mixer) -> None:
+    music = _start(mixer, ("broken", "a"), crossfade_ms=1000)
+
+    _update_at(music, mixer, 0)  # collects the error and prefetches "a"
+    _update_at(music, mixer, 10)
+
+    assert music._playlist == ["a"]
+    assert mixer.played[-1][1] == "a"
@@ -0,0 +1,38 @@
+import os
+from pathlib import Path
+
+from src.utils.corpus import Corpus
+from src.utils.parse_cache import ParseCache
+
+
+TEXT = "C'era una volta un re. Anzi no!\n«Chi era?» chiese il bambino\n"
+
+
+def test_corpus_bytes_round_trip() -> None:
+    corpus = Corpus.from_text(TEXT)
+    restored = Corpus.from_bytes(corpus.to_bytes())
+
+    assert list(restored.words) == list(corpus.words)
+    assert list(restored.phrases) == list(corpus.phrases)
+    assert restored.word_to_phrase_map == corpus.word_to_phrase_map
+    assert restored.phrases_total == corpus.phrases_total
+
+
+def test_parse_cache_hit_by_path_and_by_content(tmp_path: Path) -> None:
+    source = tmp_path / "testo.txt"
+    source.write_text(TEXT, encoding="utf-8")
+    cache = ParseCache(tmp_path / "cache")
+    st = os.stat(source)
+
+    assert cache.lookup(str(source)) is None
+    cache.store(str(source), "abc123", st.st_size, st.st_mtime_ns, Corpus.from_text(TEXT))
+
+    sha256, corpus = ParseCache(tmp_path / "cache").lookup(str(source))
+    assert sha256 == "abc123"
+    assert corpus.words[0] == "C'era"
+
+    # A modified source is no longer trusted through the index...
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert cache.lookup(str(source)) is None
+    # ...but its content hash still resolves to the cached corpus
+    assert cache.load("abc123") is not None
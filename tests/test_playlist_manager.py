@@ -0,0 +1,92 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src.core import loading_manager
+from src.core.playlist_manager import PlaylistManager
+
+
+@pytest.fixture
+def gates(monkeypatch: pytest.MonkeyPatch) -> dict:
+    """FileLoader.ingest replaced by a stub that returns once its path's gate is set."""
+    events: dict = {}
+
+    def ingest(path, stream_chunk_size=None, progress=None):
+        events.setdefault(path, threading.Event()).wait(5)
+        if path.endswith("rotto.txt"):
+            raise ValueError("Il file è vuoto")
+        return f"ingested {path}"
+
+    monkeypatch.setattr(loading_manager.FileLoader, "ingest", staticmethod(ingest))
+    return events
+
+
+def _open(gates: dict, path: str) -> None:
+    gates.setdefault(path, threading.Event()).set()
+
+
+def _wait_ready(playlist: PlaylistManager) -> None:
+    deadline = time.monotonic() + 5
+    while not playlist.next_ready and time.monotonic() < deadline:
+        playlist.poll()
+        time.sleep(0.005)
+
+
+def test_add_folder_queues_texts_in_order(tmp_path: Path) -> None:
+    for name in ("b.txt", "a.docx", ".nascosto.txt", "note.md", "c.TXT"):
+        (tmp_path / name).write_text("testo", encoding="utf-8")
+    playlist = PlaylistManager()
+
+    assert playlist.add_folder(str(tmp_path)) == 3
+    assert [Path(p).name for p in playlist.paths] == ["a.docx", "b.txt", "c.TXT"]
+    assert not playlist.is_active and playlist.next_path is None
+
+    assert playlist.start() == playlist.paths[0]
+    assert playlist.is_active and playlist.next_path == playlist.paths[1]
+    playlist.shutdown()
+
+
+def test_take_next_does_not_wait_for_the_prefetch(gates: dict) -> None:
+    playlist = PlaylistManager()
+    for path in ("uno.txt", "due.txt", "tre.txt"):
+        playlist.add(path)
+    playlist.start()
+    playlist.prefetch_next()
+
+    # Still loading: the playlist stays on the current file
+    assert playlist.take_next() is None
+    assert playlist.position == 0 and playlist.has_next
+
+    _open(gates, "due.txt")
+    _wait_ready(playlist)
+    job = playlist.take_next()
+    assert job is not None and job.path == "due.txt" and job.result == "ingested due.txt"
+    assert playlist.position == 1
+
+    # Not prefetched yet: take_next starts the prefetch itself
+    assert playlist.take_next() is None
+    _open(gates, "tre.txt")
+    _wait_ready(playlist)
+    assert playlist.take_next().path == "tre.txt"
+    assert not playlist.has_next and playlist.take_next() is None
+    playlist.shutdown()
+
+
+def test_failed_prefetch_is_handed_over(gates: dict) -> None:
+    playlist = PlaylistManager()
+    playlist.add("uno.txt")
+    playlist.add("rotto.txt")
+    playlist.start()
+    _open(gates, "rotto.txt")
+    playlist.prefetch_next()
+    _wait_ready(playlist)
+
+    job = playlist.take_next()
+    assert isinstance(job.error, ValueError) and job.result is None
+    assert playlist.position == 1 and not playlist.has_next
+
+    playlist.clear()
+    assert playlist.paths == [] and not playlist.is_active
+    playlist.shutdown()
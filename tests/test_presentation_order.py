@@ -0,0 +1,54 @@
+import pytest
+
+from src.utils.corpus import Corpus
+from src.utils.presentation_order import ShuffledWordsOrder, make_order
+
+
+TEXT = "Il gatto dorme. Il cane abbaia forte! Piove? Domani esce il sole, forse. Fine"
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 7, 64, 1000, 4099])
+def test_shuffled_words_is_a_seeded_permutation(count) -> None:
+    order = ShuffledWordsOrder(count, seed=42)
+
+    indices = [order.index_at(p) for p in range(count)]
+
+    assert sorted(indices) == list(range(count))
+    assert [order.position_of(i) for i in indices] == list(range(count))
+    assert indices == [ShuffledWordsOrder(count, seed=42).index_at(p) for p in range(count)]
+    if count >= 64:
+        assert indices != list(range(count))
+        assert indices != [ShuffledWordsOrder(count, seed=43).index_at(p) for p in range(count)]
+
+
+def test_shuffled_phrases_keep_words_in_order() -> None:
+    corpus = Corpus.from_text(TEXT)
+    order = make_order("shuffled_phrases", corpus, seed=7)
+    mapping = corpus.word_to_phrase_map
+
+    indices = [order.index_at(p) for p in range(corpus.word_count)]
+
+    assert sorted(indices) == list(range(corpus.word_count))
+    assert [order.position_of(i) for i in indices] == list(range(corpus.word_count))
+    # Each sentence is one contiguous run of its words, in text order
+    runs = []
+    for index in indices:
+        if not runs or runs[-1][-1] + 1 != index or mapping[index] != mapping[runs[-1][-1]]:
+            runs.append([])
+        runs[-1].append(index)
+    assert len(runs) == corpus.phrases_total
+    assert sorted(mapping[r[0]] for r in runs) == list(range(corpus.phrases_total))
+
+
+def test_reverse_sequential_and_snapshot() -> None:
+    corpus = Corpus.from_text(TEXT)
+
+    reverse = make_order("reverse", corpus)
+    assert [reverse.index_at(p) for p in range(corpus.word_count)] == list(range(corpus.word_count))[::-1]
+    assert make_order("sequential", corpus).index_at(5) == 5
+
+    shuffled = make_order("shuffled_words", corpus)
+    assert shuffled.snapshot() == {"presentation_order": "shuffled_words", "order_seed": shuffled.seed}
+    assert isinstance(shuffled.seed, int)
+    with pytest.raises(ValueError):
+        make_order("random", corpus)
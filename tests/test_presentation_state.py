@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+
+import pygame
+import pytest
+
+from src.core.enums import State
+from src.core.word_manager import WordManager
+from src.loaders.file_loader import IngestedFile, LoadedText
+from src.logging.session_logger import SessionData, SessionLogger
+from src.states.presentation_state import PresentationState
+from src.utils.corpus import Corpus
+
+
+TEXT = "Primo gatto dorme. Secondo cane abbaia! Terzo sole esce."
+
+
+class _Cues:
+    def __init__(self):
+        self.onsets = 0
+
+    def play_onset(self):
+        self.onsets += 1
+        return 2.5
+
+    def play_offset(self):
+        return None
+
+
+class _App:
+    """The parts of Tachistostory the presentation loop uses for word trials."""
+
+    def __init__(self):
+        self.words = WordManager()
+        self.words.apply_ingested(IngestedFile(metadata=None, loaded=LoadedText(Corpus.from_text(TEXT))))
+        self.in_pausa = False
+        self.avanti = False
+        self.stato_presentazione = State.SHOW_WORD
+        self.durata_parola_ms = 200
+        self.nome_file = "testo.txt"
+        self.screen_width = 800
+        self.cues = _Cues()
+        self.mask_pool = SimpleNamespace(is_pattern=False)
+        self.context = SimpleNamespace(logger=SessionLogger(SessionData()))
+
+    @property
+    def indice_parola(self):
+        return self.words.current_index
+
+    @property
+    def parola_corrente(self):
+        return self.words.current_word
+
+    def set_word_index(self, index: int) -> None:
+        self.words.set_index(index)
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list:
+    now = [1000]
+    monkeypatch.setattr(pygame.time, "get_ticks", lambda: now[0])
+    return now
+
+
+def _key(key: int, unicode: str = "") -> pygame.event.Event:
+    return pygame.event.Event(pygame.KEYDOWN, key=key, unicode=unicode)
+
+
+def _state() -> PresentationState:
+    state = PresentationState(SimpleNamespace(app=_App()))
+    state.session_started = True
+    state.state_start_time = pygame.time.get_ticks()
+    return state
+
+
+@pytest.mark.parametrize("keys", [
+    [(pygame.K_DOWN, "")],
+    [(pygame.K_2, "2"), (pygame.K_g, "g")],
+])
+def test_sentence_jump_is_a_new_trial(clock: list, keys: list) -> None:
+    state = _state()
+    app = state.app
+    state.update(0.016)
+    assert state.current_logged_word == "Primo" and app.cues.onsets == 1
+
+    clock[0] = 1100
+    state.handle_events([_key(*key) for key in keys])
+    assert app.parola_corrente == "Secondo" and app.cues.onsets == 2
+
+    clock[0] = 1300
+    state.update(0.016)
+    events = app.context.logger.session.word_events
+    assert len(events) == 1
+    assert (events[0].stimulus_text, events[0].shown_at_ms, events[0].hidden_at_ms) == ("Secondo", 1100, 1300)
+    assert events[0].cue_onset_latency_est_ms == 2.5
+
+
+def test_jump_that_does_not_move_keeps_the_trial(clock: list) -> None:
+    state = _state()
+    app = state.app
+    state.update(0.016)
+
+    clock[0] = 1100
+    state.handle_events([_key(pygame.K_UP)])
+    assert app.parola_corrente == "Primo" and app.cues.onsets == 1
+
+    clock[0] = 1300
+    state.update(0.016)
+    event = app.context.logger.session.word_events[0]
+    assert (event.stimulus_text, event.shown_at_ms) == ("Primo", 1000)
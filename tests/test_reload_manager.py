@@ -0,0 +1,95 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from src.core.config import config
+from src.core.reload_manager import ReloadManager
+from src.core.word_manager import WordManager
+from src.loaders.file_loader import FileLoader
+from src.utils import parse_cache
+from src.utils.corpus import Corpus
+from src.utils.parse_cache import ParseCache
+
+
+TEXT = "Il gatto dorme. Il cane abbaia!\nPoi tutti a nanna.\n"
+EDITED = "Il gatto dorme. Il cane non abbaia più!\nPoi tutti a nanna.\n"
+
+
+@pytest.fixture(autouse=True)
+def reload_enabled(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(parse_cache, "_cache", ParseCache(tmp_path / "cache"))
+    monkeypatch.setattr(config.reload, "enabled", True)
+    monkeypatch.setattr(config.reload, "poll_interval_ms", 1000)
+
+
+def _loaded(tmp_path: Path) -> tuple[Path, WordManager]:
+    path = tmp_path / "testo.txt"
+    path.write_text(TEXT, encoding="utf-8")
+    words = WordManager()
+    words.load_txt(str(path))
+    words.file_loaded = True  # set by the app once the file is shown
+    return path, words
+
+
+def _save(path: Path, text: str) -> None:
+    """Write `text` with a later mtime, as an editor saving the file would."""
+    mtime_ns = os.stat(path).st_mtime_ns
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns + 1_000_000))
+
+
+def _collect(reloader: ReloadManager, now_ms: int, path: Path, words: WordManager):
+    deadline = time.monotonic() + 5
+    while reloader.is_reloading and not reloader._job.done() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return reloader.poll(now_ms, path, words)
+
+
+def test_reload_manager_polls_and_applies_an_edit(tmp_path: Path) -> None:
+    path, words = _loaded(tmp_path)
+    reloader = ReloadManager()
+    words.set_index(words.word_count - 1)
+
+    assert reloader.poll(0, path, words) is None and not reloader.is_reloading  # unchanged
+    _save(path, EDITED)
+    assert reloader.poll(500, path, words) is None and not reloader.is_reloading  # not due yet
+    assert reloader.poll(1000, path, words) is None and reloader.is_reloading
+
+    reloaded = _collect(reloader, 1001, path, words)
+    words.apply_reload(reloaded.corpus, reloaded.splice, reloaded.metadata)
+
+    assert list(words.words) == list(Corpus.from_text(EDITED).words)
+    assert words.current_word == "nanna"  # still on the last word
+    assert words.file_metadata.size_bytes == os.stat(path).st_size
+    # The new state is the reference for the next poll
+    assert reloader.poll(3000, path, words) is None and not reloader.is_reloading
+    reloader.shutdown()
+
+
+def test_reload_manager_ignores_touched_files_and_stale_jobs(tmp_path: Path) -> None:
+    path, words = _loaded(tmp_path)
+    reloader = ReloadManager()
+    reloader.poll(0, path, words)
+
+    _save(path, TEXT)  # same content
+    reloader.poll(1000, path, words)
+    assert _collect(reloader, 1001, path, words) is None
+
+    _save(path, EDITED)
+    reloader.poll(2000, path, words)
+    words.load_txt(str(path))  # another load replaced the corpus meanwhile
+    assert _collect(reloader, 2001, path, words) is None
+    reloader.shutdown()
+
+
+def test_reload_manager_is_off_unless_enabled(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config.reload, "enabled", False)
+    path, words = _loaded(tmp_path)
+    reloader = ReloadManager()
+    reloader.poll(0, path, words)
+
+    _save(path, EDITED)
+
+    assert reloader.poll(1000, path, words) is None and not reloader.is_reloading
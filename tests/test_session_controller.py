@@ -0,0 +1,73 @@
+import json
+import uuid
+from pathlib import Path
+
+from src.core.GameContext import GameContext
+from src.core.session_controller import SessionController
+from src.logging.session_logger import DisplayNameRegistry
+
+
+def _context(tmp_path: Path) -> GameContext:
+    context = GameContext(
+        secret_key=b"secret",
+        output_dir=tmp_path / "log",
+        registry=DisplayNameRegistry(tmp_path / "participant_display_names.json"),
+    )
+    controller = SessionController(context)
+    controller.attach_new_user("Mario")
+    controller.set_source_selected("primo.txt")
+    return context
+
+
+def _run_session(context: GameContext, words: list[str], start_ms: int) -> uuid.UUID:
+    controller = SessionController(context)
+    session_id = controller.start_session(start_ms)
+    for n, word in enumerate(words):
+        context.logger.log_word_event(stimulus_text=word, shown_at_ms=start_ms + n * 400,
+                                      hidden_at_ms=start_ms + n * 400 + 220)
+    controller.end_session(start_ms + len(words) * 400)
+    return session_id
+
+
+def test_next_session_keeps_the_participant(tmp_path: Path) -> None:
+    context = _context(tmp_path)
+    first = context.session
+    first.profile_name = "bambini"
+
+    context.next_session()
+
+    assert context.finished_sessions == [first]
+    assert context.session is not first and context.logger.session is context.session
+    assert context.session.participant_pseudonym == first.participant_pseudonym
+    assert context.session.participant_display_name == "Mario"
+    assert context.session.profile_name == "bambini"
+    assert context.selected_file_path is None and not context.session.word_events
+
+    context.new_session()
+    assert context.finished_sessions == []
+    assert (tmp_path / "participant_display_names.json").exists()
+
+
+def test_export_all_writes_every_playlist_session(tmp_path: Path) -> None:
+    context = _context(tmp_path)
+    first_id = _run_session(context, ["uno", "due"], 1000)
+    context.next_session()
+    SessionController(context).set_source_selected("secondo.txt")
+    second_id = _run_session(context, ["tre"], 5000)
+
+    results = SessionController(context).export_all()
+
+    assert set(results) == {
+        f"{prefix}{key}"
+        for prefix in ("file_1_", "")
+        for key in ("word_events_csv", "pause_events_csv", "summary_csv", "session_json")
+    }
+    assert all(path.exists() for path in results.values())
+    first = json.loads(results["file_1_session_json"].read_text(encoding="utf-8"))
+    second = json.loads(results["session_json"].read_text(encoding="utf-8"))
+    assert str(first_id) in results["file_1_session_json"].name
+    assert str(second_id) in results["session_json"].name
+    assert [event["stimulus_text"] for event in first["word_events"]] == ["uno", "due"]
+    assert [event["stimulus_text"] for event in second["word_events"]] == ["tre"]
+    assert first["session"]["participant_pseudonym"] == second["session"]["participant_pseudonym"]
+    assert (first["session"]["input_file_name"], second["session"]["input_file_name"]) == ("primo.txt", "secondo.txt")
@@ -5,10 +5,12 @@ from pathlib import Path
 
 from src.logging.session_logger import (
     DisplayNameRegistry,
+    ErrorType,
     PauseEvent,
     ReasonState,
     ResponseStatus,
     SessionData,
+    SessionLogger,
     StimulusType,
     WordEvent,
     export_pause_events_csv,
@@ -153,3 +155,41 @@ def test_export_session_summary_csv(tmp_path: Path) -> None:
     assert row["total_wrong"] == "1"
     assert row["mean_response_time_ms"] == "200.0"
     assert row["total_pause_ms"] == "200"
+
+
+def test_session_data_setter_uses_precomputed_metadata(tmp_path: Path) -> None:
+    file_path = tmp_path / "text.txt"
+    file_path.write_text("ciao", encoding="utf-8")
+
+    session = SessionData()
+    session.set_input_file(file_path, file_hash="precomputed", file_size=4)
+
+    assert session.input_file_hash == "precomputed"
+    assert session.input_file_size_bytes == 4
+
+
+def test_logged_word_events_read_back_as_word_event_views() -> None:
+    session = SessionData(session_id=uuid.uuid4())
+    logger = SessionLogger(session)
+
+    for i, text in enumerate(["il", "gatto", "il"]):
+        index = logger.log_word_event(
+            text, 100 * i, 100 * i + 80, stimulus_source="libro", duration_ms=80,
+            cue_onset_latency_est_ms=1.5 if i == 0 else None,
+        )
+        assert index == i
+    logger.log_word_event("gatto", 300, 300, is_correct=False, error_type=ErrorType.COMMISSION)
+
+    events = session.word_events
+    first, last = events[0], events[-1]
+
+    assert len(events) == 4 and [e.stimulus_text for e in events] == ["il", "gatto", "il", "gatto"]
+    assert len(events.texts) == 2 and len(events.sources) == 2
+    assert first.session_id == session.session_id and first.stimulus_type is StimulusType.WORD
+    assert first.cue_onset_latency_est_ms == 1.5 and events[1].cue_onset_latency_est_ms is None
+    assert first.actual_duration_ms == 80 and first.word_level_speed is None
+    assert first.event_id == events[0].event_id != events[1].event_id
+    assert last.trial_index == 3 and last.is_correct is False
+    assert last.error_type is ErrorType.COMMISSION and last.response_status is ResponseStatus.NULL
+    assert session.avg_actual_duration_ms() == 80.0
+    assert session.compute_accuracy() == "66.7%"
@@ -0,0 +1,120 @@
+import os
+from pathlib import Path
+import threading
+
+from src.core.config import config
+from src.core.library_manager import LibraryManager
+from src.utils.compiled_corpus import compile_corpus
+from src.utils.corpus import Corpus
+from src.utils.parse_cache import ParseCache
+from src.utils.stimulus_library import StimulusLibrary
+
+
+TEXT = "C'era una volta un re. Anzi no!\n«Chi era?» chiese il bambino\n"
+
+
+def _library(tmp_path: Path) -> StimulusLibrary:
+    return StimulusLibrary(str(tmp_path / "stimuli"), tmp_path / "library.sqlite3", ParseCache(tmp_path / "cache"))
+
+
+def test_library_indexes_texts(tmp_path: Path) -> None:
+    folder = tmp_path / "stimuli"
+    (folder / "sub").mkdir(parents=True)
+    (folder / "b.txt").write_text(TEXT, encoding="utf-8")
+    (folder / "sub" / "a.txt").write_text("Una frase.", encoding="utf-8")
+    (folder / "vuoto.txt").write_text("", encoding="utf-8")
+    (folder / "note.md").write_text(TEXT, encoding="utf-8")
+    corpus = Corpus.from_text(TEXT)
+    (folder / "c.txt.tscorpus").write_bytes(compile_corpus(corpus, "ab" * 32, 10))
+
+    result = _library(tmp_path).rescan(jobs=2)
+    entries = _library(tmp_path).entries()
+
+    assert (result.added, result.unchanged) == (4, 0)
+    assert list(result.errors) == [str(folder / "vuoto.txt")]
+    assert [e.name for e in entries] == ["a.txt", "b.txt", "c.txt.tscorpus"]
+    b = entries[1]
+    assert (b.format, b.word_count, b.phrase_count) == ("txt", corpus.word_count, corpus.phrases_total)
+    assert entries[2].sha256 == "ab" * 32
+    # The parse went to the parse cache
+    assert ParseCache(tmp_path / "cache").lookup(b.path)[0] == b.sha256
+
+
+def test_library_rescan_only_touches_changed_files(tmp_path: Path) -> None:
+    folder = tmp_path / "stimuli"
+    folder.mkdir()
+    (folder / "a.txt").write_text(TEXT, encoding="utf-8")
+    (folder / "b.txt").write_text(TEXT, encoding="utf-8")
+    library = _library(tmp_path)
+    library.rescan()
+
+    result = library.rescan()
+    assert (result.unchanged, result.changed) == (2, False)
+
+    (folder / "a.txt").write_text("Solo tre parole.", encoding="utf-8")
+    st = os.stat(folder / "a.txt")
+    os.utime(folder / "a.txt", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    (folder / "b.txt").unlink()
+    (folder / "c.txt").write_text(TEXT, encoding="utf-8")
+
+    result = library.rescan()
+
+    assert (result.added, result.updated, result.removed, result.unchanged) == (1, 1, 1, 0)
+    assert [(e.name, e.word_count) for e in library.entries()] == [("a.txt", 3), ("c.txt", Corpus.from_text(TEXT).word_count)]
+
+
+def test_library_rescan_stops_at_the_next_file_when_cancelled(tmp_path: Path) -> None:
+    folder = tmp_path / "stimuli"
+    folder.mkdir()
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (folder / name).write_text(TEXT, encoding="utf-8")
+    library = _library(tmp_path)
+    library.rescan()
+    (folder / "c.txt").unlink()
+    (folder / "d.txt").write_text(TEXT, encoding="utf-8")
+    (folder / "e.txt").write_text(TEXT, encoding="utf-8")
+    cancel = threading.Event()
+    indexed = []
+    index_file = library._index_file
+
+    def index_then_cancel(path, st):
+        indexed.append(os.path.basename(path))
+        cancel.set()
+        return index_file(path, st)
+
+    library._index_file = index_then_cancel
+    result = library.rescan(jobs=1, cancel=cancel)
+
+    assert indexed == ["d.txt"]
+    assert (result.cancelled, result.added, result.removed) == (True, 1, 0)
+    # The removal waits for a complete scan
+    assert [e.name for e in library.entries()] == ["a.txt", "b.txt", "c.txt", "d.txt"]
+
+
+def test_library_manager_shutdown_cancels_the_running_scan(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(config.library, "scan_workers", 1)
+    folder = tmp_path / "stimuli"
+    folder.mkdir()
+    for name in ("a.txt", "b.txt"):
+        (folder / name).write_text(TEXT, encoding="utf-8")
+    manager = LibraryManager(str(folder))
+    manager.library = _library(tmp_path)
+    started, release = threading.Event(), threading.Event()
+    indexed = []
+    index_file = manager.library._index_file
+
+    def slow_index(path, st):
+        indexed.append(os.path.basename(path))
+        started.set()
+        release.wait(5)
+        return index_file(path, st)
+
+    manager.library._index_file = slow_index
+    manager.start_scan()
+    scan = manager._scan
+    assert started.wait(5)
+    manager.shutdown()
+    release.set()
+
+    assert scan.result(5).cancelled
+    assert len(indexed) == 1
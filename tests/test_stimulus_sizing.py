@@ -0,0 +1,32 @@
+import pygame
+
+from src.core.stimulus_sizing import SOURCE_FORM_CACHE, StimulusSizing, TextMetrics
+from src.utils.corpus import Corpus
+
+
+class _Layout:
+    """Stand-in for LayoutManager: only the stimulus fonts are measured."""
+
+    fonts_version = 1
+
+    def __init__(self):
+        pygame.font.init()
+        self.stimulus_fonts = [pygame.font.Font(None, size) for size in (40, 30, 20)]
+
+
+def test_source_forms_are_bounded() -> None:
+    metrics = TextMetrics(_Layout())
+    sizing = StimulusSizing(metrics)
+    corpus = Corpus.from_text("Il gatto dorme. Il cane abbaia")
+    sizing.prepare(corpus, 400)
+
+    # An endless source: every stimulus is a new form
+    for i in range(3 * SOURCE_FORM_CACHE):
+        word = f"pseudo{i}"
+        size_class = sizing.form_class(word, 400)
+        assert size_class == metrics.fit_class(word, sizing.max_width(400), memo=False)
+        assert sizing.form_width(word, 400) == metrics.width(size_class, word, memo=False)
+
+    assert len(list(sizing.form_widths())) == 5 + SOURCE_FORM_CACHE
+    # Corpus forms are still taken from the corpus table
+    assert sizing.form_class("gatto", 400) == sizing.size_classes[1]
@@ -0,0 +1,68 @@
+from itertools import islice
+
+from src.loaders.stimulus_source import (
+    FileSource,
+    ListSource,
+    PseudowordSource,
+    StimulusBuffer,
+    StimulusItem,
+    StimulusSource,
+)
+
+
+def test_pseudowords_are_seeded_and_unbounded() -> None:
+    source = PseudowordSource(seed=11, words_per_phrase=4)
+
+    first = list(islice(source, 1000))
+
+    assert first == list(islice(PseudowordSource(seed=11, words_per_phrase=4), 1000))
+    assert first != list(islice(PseudowordSource(seed=12, words_per_phrase=4), 1000))
+    assert all(item.text.isalpha() and item.stimulus_type == "word" for item in first)
+    assert [item.phrase_index for item in first[:9]] == [0, 0, 0, 0, 1, 1, 1, 1, 2]
+    assert len(list(PseudowordSource(seed=1, count=25))) == 25
+    assert source.snapshot()["source_seed"] == 11
+    assert isinstance(source, StimulusSource)
+
+
+def test_buffer_window_stays_bounded() -> None:
+    buffer = StimulusBuffer(PseudowordSource(seed=3), lookahead=8, history=16)
+    expected = list(islice(PseudowordSource(seed=3), 100_000))
+
+    for index in range(0, 100_000, 7):
+        buffer.fill(index, 64)
+        assert buffer[index] == expected[index].text
+        assert len(buffer._window) <= 8 + 16 + 1
+    assert not buffer.exhausted
+
+    # Going back past the window restarts the source
+    assert buffer[5] == expected[5].text
+    assert buffer.first == 0
+
+
+def test_buffer_phrases_and_end_of_source() -> None:
+    source = ListSource([("Il", 0), ("gatto", 0), ("dorme", 0), ("Piove", 1), ("Fine", 2)],
+                        stimulus_type="phrase")
+    buffer = StimulusBuffer(source, lookahead=1, history=1)
+
+    assert buffer.phrase_first_word(1) == 3
+    assert buffer.phrase_first_word(0) == 0
+    assert buffer.phrase_first_word(7) == 5
+    assert buffer.exhausted and buffer.phrase_total == 3
+    assert not buffer.ensure(5)
+    assert buffer.item(3) == StimulusItem("Piove", 1, "phrase")
+    assert list(ListSource(["a", "b"])) == [StimulusItem("a", 0), StimulusItem("b", 1)]
+
+
+def test_file_source_yields_the_words(tmp_path) -> None:
+    import src.core  # noqa: F401  (the file loader expects the core package loaded first)
+
+    path = tmp_path / "testo.txt"
+    path.write_text("Il gatto dorme. Il cane abbaia!\n", encoding="utf-8")
+    source = FileSource(str(path))
+
+    items = list(source)
+
+    assert [item.text for item in items] == ["Il", "gatto", "dorme", "Il", "cane", "abbaia"]
+    assert [item.phrase_index for item in items] == [0, 0, 0, 1, 1, 1]
+    assert source.name == "testo"
+    assert source.snapshot()["source_sha256"] == source.metadata.sha256
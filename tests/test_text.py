@@ -0,0 +1,199 @@
+import random
+
+from benchmarks._reference_tokenizer import reference_build_words_and_phrase_map
+from src.utils.corpus import Corpus
+from src.utils.text import (
+    KEPT_PUNCTUATION,
+    MASK_STYLES,
+    TextParseResult,
+    build_words_and_phrase_map,
+    iter_text_chunks,
+    mask_word,
+    split_sentences,
+    tokenize_text,
+)
+
+
+SAMPLE_TEXT = (
+    "C'era una volta un re. Anzi no!\n"
+    "\n"
+    "«Chi era?» chiese il bambino... Un pezzo di legno,\n"
+    "di quelli che d'inverno si mettono nelle stufe.\n"
+    "Capitolo 2\n"
+    "Il 3.14 non è una frase? Forse\n"
+)
+
+
+def test_build_words_and_phrase_map_matches_reference() -> None:
+    assert build_words_and_phrase_map(SAMPLE_TEXT) == reference_build_words_and_phrase_map(SAMPLE_TEXT)
+
+
+def test_build_words_and_phrase_map_differential_fuzz() -> None:
+    rng = random.Random(1234)
+    alphabet = list("aeiouèàlrst  ...!!??\n\n\r\t\"'”’)]}»«-_,;:0123\u2028\x0b")
+    for _ in range(3000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 80)))
+        assert build_words_and_phrase_map(text) == reference_build_words_and_phrase_map(text), repr(text)
+
+
+def _as_parse_result(corpus: Corpus) -> TextParseResult:
+    return TextParseResult(
+        words=list(corpus.words),
+        phrases_list=list(corpus.phrases),
+        phrases_total=corpus.phrases_total,
+        word_to_phrase_map=corpus.word_to_phrase_map.tolist(),
+    )
+
+
+def _collect_chunks(text: str, chunk_size: int) -> TextParseResult:
+    chunks = iter_text_chunks(text.splitlines(keepends=True), chunk_size)
+    return _as_parse_result(Corpus.from_chunks(chunks))
+
+
+def test_iter_text_chunks_matches_full_parse() -> None:
+    expected = build_words_and_phrase_map(SAMPLE_TEXT)
+    for chunk_size in (1, 3, 1000):
+        assert _collect_chunks(SAMPLE_TEXT, chunk_size) == expected
+
+
+def test_iter_text_chunks_yields_bounded_chunks() -> None:
+    chunks = list(iter_text_chunks(SAMPLE_TEXT.splitlines(keepends=True), chunk_size=5))
+
+    assert chunks[-1].is_last
+    assert not any(c.is_last for c in chunks[:-1])
+    # A chunk closes at the first line boundary after chunk_size words
+    assert all(len(c.words) < 5 + 12 for c in chunks)
+
+
+def test_iter_text_chunks_empty_input() -> None:
+    chunks = list(iter_text_chunks([], chunk_size=10))
+
+    assert len(chunks) == 1
+    assert chunks[0].words == []
+    assert chunks[0].phrases_total == 0
+
+
+def test_corpus_matches_full_parse() -> None:
+    corpus = Corpus.from_text(SAMPLE_TEXT)
+
+    assert _as_parse_result(corpus) == build_words_and_phrase_map(SAMPLE_TEXT)
+    assert corpus.words[-1] == corpus.words[len(corpus.words) - 1] == "Forse"
+    assert corpus.words[:2] == ["C'era", "una"]
+
+
+def test_corpus_spans_cross_stream_segments() -> None:
+    # A sentence spanning several chunks is resolved before compaction
+    corpus = Corpus()
+    for chunk in iter_text_chunks(SAMPLE_TEXT.splitlines(keepends=True), chunk_size=1):
+        corpus.append_chunk(chunk)
+        if not chunk.is_last:
+            assert list(corpus.phrases) == split_sentences(SAMPLE_TEXT)[:corpus.phrase_count]
+
+    assert corpus.is_complete
+    assert list(corpus.phrases) == split_sentences(SAMPLE_TEXT)
+
+
+def test_mask_word_keeps_punctuation_of_style() -> None:
+    assert mask_word("perché,") == "######,"
+    assert mask_word("d'inverno!") == "#########!"
+    assert mask_word("perché,", MASK_STYLES["hash_no_punctuation"]) == "#######"
+    assert mask_word("3.14", MASK_STYLES["x"]) == "X.XX"
+
+
+def test_mask_word_matches_character_rule() -> None:
+    rng = random.Random(99)
+    alphabet = list("aeiouèàlrst .!?\t\"'”’)]}»«-_,;:0123\u2028")
+    for _ in range(2000):
+        word = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        expected = "".join(c if c in KEPT_PUNCTUATION + " " else "#" for c in word)
+        assert mask_word(word) == expected, repr(word)
+
+
+def test_corpus_masks_are_precomputed_per_style() -> None:
+    corpus = Corpus()
+    for chunk in iter_text_chunks(SAMPLE_TEXT.splitlines(keepends=True), chunk_size=2):
+        corpus.append_chunk(chunk)
+        assert [corpus.mask(i) for i in range(corpus.word_count)] == [mask_word(w) for w in corpus.words]
+
+    style = MASK_STYLES["x"]
+    corpus.set_mask_style(style)
+    assert [corpus.mask(i) for i in range(corpus.word_count)] == [mask_word(w, style) for w in corpus.words]
+    assert Corpus.from_bytes(corpus.to_bytes()).mask(-1) == mask_word("Forse")
+
+
+def test_corpus_phrase_word_ranges() -> None:
+    expected = Corpus.from_text(SAMPLE_TEXT)
+    mapping = list(expected.word_to_phrase_map)
+    ranges = [expected.phrase_word_range(p) for p in range(expected.phrases_total)]
+
+    for phrase, (start, end) in enumerate(ranges):
+        assert mapping[start:end] == [phrase] * (end - start)
+    assert ranges[0][0] == 0 and ranges[-1][1] == expected.word_count
+    assert expected.phrase_first_word(expected.phrases_total + 5) == expected.word_count
+
+    # While streaming the boundaries come from the map received so far
+    corpus = Corpus()
+    for chunk in iter_text_chunks(SAMPLE_TEXT.splitlines(keepends=True), chunk_size=2):
+        corpus.append_chunk(chunk)
+        if not corpus.is_complete:
+            last = corpus.word_to_phrase_map[-1]
+            assert [corpus.phrase_first_word(p) for p in range(last + 1)] == [r[0] for r in ranges[:last + 1]]
+
+
+def test_corpus_splice_matches_full_parse_fuzz() -> None:
+    rng = random.Random(4321)
+    alphabet = list("aeiou  ..!?\n\n\"'»«)3,")
+    for _ in range(1500):
+        text = SAMPLE_TEXT + "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+        old = Corpus.from_text(text)
+        new_text = text
+        for _ in range(rng.randint(1, 3)):
+            i = rng.randint(0, len(new_text))
+            j = min(len(new_text), i + rng.randint(0, 6))
+            new_text = new_text[:i] + "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 6))) + new_text[j:]
+
+        spliced, _ = old.splice(new_text)
+
+        expected = Corpus.from_text(new_text)
+        assert _as_parse_result(spliced) == _as_parse_result(expected), repr(new_text)
+        assert list(spliced.word_starts) == list(expected.word_starts)
+        assert [spliced.mask(i) for i in range(spliced.word_count)] == [mask_word(w) for w in expected.words]
+
+
+def test_corpus_splice_of_clamped_phrase_map() -> None:
+    assert list(Corpus.from_text(".)\n\n)").splice(")a.)\n\n)")[0].word_to_phrase_map) == [0, 1]
+
+    rng = random.Random(77)
+    alphabet = list("ab ..)!\n\n")
+    clamped = 0
+    while clamped < 300:
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 30)))
+        old = Corpus.from_text(text)
+        if list(old.word_to_phrase_map) == list(tokenize_text(text).word_to_phrase_map):
+            continue
+        clamped += 1
+        i = rng.randint(0, len(text))
+        j = min(len(text), i + rng.randint(0, 4))
+        new_text = text[:i] + "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 4))) + text[j:]
+
+        expected = _as_parse_result(Corpus.from_text(new_text))
+        # Built by the tokenizer, or read back with only the clamped map
+        for corpus in (old, Corpus.from_bytes(old.to_bytes())):
+            spliced, _ = corpus.splice(new_text)
+            assert _as_parse_result(spliced) == expected, (text, new_text)
+            assert _as_parse_result(spliced.splice(text)[0]) == _as_parse_result(old), (new_text, text)
+
+
+def test_corpus_splice_retokenizes_only_the_edit() -> None:
+    text = SAMPLE_TEXT * 50
+    old = Corpus.from_text(text)
+    edit = text.index("pezzo", len(text) // 2)
+
+    spliced, splice = old.splice(text[:edit] + "grosso " + text[edit:])
+
+    assert splice.retokenized_chars < 200
+    assert splice.new_end - splice.old_end == 1
+    # Words before the edit keep their index, words after it move by one
+    moved = old.word_count - 1
+    assert spliced.words[splice.remap(moved)] == old.words[moved]
+    assert splice.remap(3) == 3
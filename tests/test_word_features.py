@@ -0,0 +1,80 @@
+from pathlib import Path
+
+import pytest
+
+from src.utils.compiled_corpus import CompiledCorpus, compile_corpus
+from src.utils.corpus import Corpus
+from src.utils.presentation_order import FilteredOrder, make_order
+from src.utils.word_features import FEATURES, WORD_FILTERS, WordFeatures, estimate_syllables
+
+
+TEXT = "Il gatto dorme. Il cane abbaia forte! Piove? Domani esce il sole, forse. Fine"
+
+
+def test_feature_arrays() -> None:
+    corpus = Corpus.from_text(TEXT)
+    features = WordFeatures(corpus)
+    words = list(corpus.words)
+
+    assert list(features.length) == [len(w) for w in words]
+    assert list(features.syllables) == [estimate_syllables(w.lower()) for w in words]
+    assert estimate_syllables("abbaia") == 2 and estimate_syllables("xyz") == 1
+    # "il" (3 times) is the most frequent form, then forms in order of appearance
+    assert features.frequency_rank[0] == 0 and features.frequency_rank[words.index("Domani") + 2] == 0
+    assert features.frequency_rank[1] == 1
+    assert features.type_count == len({w.lower() for w in words})
+    starts = [corpus.phrase_first_word(p) for p in corpus.word_to_phrase_map]
+    assert list(features.phrase_position) == [i - s for i, s in enumerate(starts)]
+
+
+def test_compiled_corpus_has_the_same_features(tmp_path: Path) -> None:
+    text = "Perché è già così? «Città» d'inverno, più virtù! Caffè"
+    corpus = Corpus.from_text(text)
+    path = tmp_path / "testo.txt.tscorpus"
+    path.write_bytes(compile_corpus(corpus, "ab" * 32, len(text)))
+
+    plain = WordFeatures(corpus)
+    compiled = WordFeatures(CompiledCorpus(str(path)))
+
+    assert list(plain.length)[:3] == [6, 1, 3]
+    for feature in FEATURES:
+        assert list(compiled.values(feature)) == list(plain.values(feature)), feature
+        assert list(compiled.select(feature, 2, 5)) == list(plain.select(feature, 2, 5)), feature
+
+
+def test_select_and_top_match_a_scan() -> None:
+    corpus = Corpus.from_text(TEXT * 20)
+    features = WordFeatures(corpus)
+    lengths = features.length
+
+    long_words = features.select("length", minimum=6)
+    assert sorted(long_words) == [i for i, n in enumerate(lengths) if n >= 6]
+    assert [lengths[i] for i in long_words] == sorted(lengths[i] for i in long_words)
+    assert list(features.select("length", 4, 4)) == [i for i, n in enumerate(lengths) if n == 4]
+    assert not features.select("length", minimum=99)
+
+    rarest = features.top("frequency_rank", 5)
+    ranks = sorted(features.frequency_rank)
+    assert sorted(features.frequency_rank[i] for i in rarest) == ranks[-5:]
+    with pytest.raises(ValueError):
+        features.select("colour")
+
+
+def test_filtered_order_keeps_base_order() -> None:
+    corpus = Corpus.from_text(TEXT * 5)
+    features = WordFeatures(corpus)
+    selected = WORD_FILTERS["sentence_openers"].apply(features)
+    base = make_order("shuffled_words", corpus, seed=3)
+
+    order = FilteredOrder(base, selected, "sentence_openers")
+    shown = [order.index_at(p) for p in range(order.size(corpus.word_count))]
+
+    assert sorted(shown) == sorted(selected)
+    assert shown == [i for i in (base.index_at(p) for p in range(corpus.word_count)) if i in set(selected)]
+    assert [order.position_of(i) for i in shown] == list(range(len(shown)))
+    assert order.snapshot() == {
+        "presentation_order": "shuffled_words",
+        "order_seed": 3,
+        "word_filter": "sentence_openers",
+        "filtered_word_count": len(shown),
+    }
@@ -0,0 +1,58 @@
+from src.core.word_manager import WordManager
+from src.loaders.file_loader import IngestedFile, LoadedText
+from src.loaders.stimulus_source import ListSource
+from src.utils.corpus import Corpus
+from src.utils.text import iter_text_chunks
+
+
+TEXT = "Il gatto dorme sul divano. Il cane abbaia forte!\nPiove? Domani esce il sole, forse.\nFine\n"
+
+
+def _position(words: WordManager) -> tuple[int, int, int]:
+    return words.current_index, words.order_position, words.phrase_index
+
+
+def test_peek_next_while_streaming_does_not_pump() -> None:
+    words = WordManager()
+    words.apply_ingested(IngestedFile(metadata=None, stream=iter_text_chunks(TEXT.splitlines(keepends=True), 3)))
+    loaded = len(words.words)
+    words.set_index(loaded - 2)
+    before = _position(words)
+
+    with words.peek_next() as has_next:
+        assert has_next and _position(words) == (loaded - 1, loaded - 1, words.word_to_phrase_map[loaded - 1])
+    assert _position(words) == before
+
+    # The next word is not tokenized yet: nothing to peek, and the stream is left alone
+    words.go_next()
+    with words.peek_next() as has_next:
+        assert not has_next
+    assert len(words.words) == loaded and words.is_streaming
+    assert words.go_next() and len(words.words) > loaded
+
+
+def test_peek_next_in_chunk_mode_restores_phrase() -> None:
+    words = WordManager()
+    words.apply_ingested(IngestedFile(metadata=None, loaded=LoadedText(Corpus.from_text(TEXT))))
+    plan = words.set_chunking("phrase")
+    words.set_index(plan.word_range(1)[0])
+    before = _position(words)
+
+    with words.peek_next() as has_next:
+        assert has_next
+        assert words.current_chunk == 2 and words.phrase_index == 2 and words.current_word == "Piove"
+    assert _position(words) == before and words.current_chunk == 1
+
+    words.set_index(plan.word_range(plan.count - 1)[0])
+    with words.peek_next() as has_next:
+        assert not has_next
+
+
+def test_peek_next_does_not_pull_from_a_source() -> None:
+    words = WordManager()
+    words.load_source(ListSource(["uno", "due", "tre"]))
+    pulled = len(words.words)
+
+    with words.peek_next() as has_next:
+        assert has_next == (pulled > 1)
+    assert len(words.words) == pulled and _position(words) == (0, 0, 0)